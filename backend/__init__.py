@@ -1,5 +1,17 @@
 # HackBite Backend Package
+from dotenv import load_dotenv
+
+# Load .env before any backend module reads its configuration
+load_dotenv()
+
 from .database import DatabaseManager, UserManager, SkillManager, SystemManager
-from .api_server import app, initialize_app
 
-__all__ = ['DatabaseManager', 'UserManager', 'SkillManager', 'SystemManager', 'app', 'initialize_app']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'UserManager', 'SkillManager', 'SystemManager', 'app', 'create_app', 'initialize_app']
+
+
+def __getattr__(name):
+    # The Flask app is imported on first use so `import backend.<module>` stays cheap
+    if name in ('app', 'create_app', 'initialize_app'):
+        from . import api_server
+        return getattr(api_server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
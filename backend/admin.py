@@ -0,0 +1,38 @@
+"""
+Admin access for diagnostic routes and hooks.
+
+Callers prove they are operators by sending the ADMIN_SECRET value (from
+app.config, else the environment) in the X-Admin-Secret header. The secret
+is never accepted in the query string, where it would end up in access logs
+and browser history. With no ADMIN_SECRET configured every admin feature is
+off.
+"""
+
+import functools
+import hmac
+import os
+
+from flask import current_app, jsonify, request
+
+ADMIN_SECRET = os.getenv('ADMIN_SECRET', '')
+ADMIN_HEADER = 'X-Admin-Secret'
+
+
+def is_admin_request():
+    """True if the current request carries the configured admin secret."""
+    secret = current_app.config.get('ADMIN_SECRET') or ADMIN_SECRET
+    supplied = request.headers.get(ADMIN_HEADER)
+    if not secret or not supplied:
+        return False
+    return hmac.compare_digest(supplied.encode('utf-8'), secret.encode('utf-8'))
+
+
+def admin_required(view):
+    """Decorator answering 403 unless is_admin_request()."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            return jsonify({"success": False, "message": "Admin secret required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
@@ -1,361 +1,137 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, send_file
 from flask_cors import CORS
-from backend.database import DatabaseManager, UserManager, SkillManager, SystemManager, TeamManager
-from backend.rating_service import RatingService
+from backend.database import ResumeBlobManager
+from backend.pdf_extraction import decode_pdf_base64, extract_pdf_text
+from backend.uploads import UploadRequest, spool_stream
+from werkzeug.exceptions import RequestEntityTooLarge
+from backend.github_scraper import GithubScraper, HighlightGenerator, analyze_github_profile, get_github_score
+from backend.heuristic_rating import heuristic_ratings
+from backend.admin import admin_required
+from backend.compression import init_compression
+from backend.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, init_metrics, multiprocess_dir, render_metrics
+from backend.json_provider import FastJSONProvider, static_json_response
+from backend.http_cache import conditional, http_cache_stats
+from backend.outbound import OutboundError, outbound_status
+from backend.model_routing import routing_stats
+from backend.prompt_budget import prompt_stats
+from backend.request_profiler import init_profiler
+from backend.sampling_profiler import collapsed_text, sampler
+from backend.tracing import exporter as span_exporter, init_tracing, log, span, trace_summary
+from backend.rating_jobs import stream_job_events
+from backend.services import AppServices, DEFAULT_CONFIG, EXTENSION_KEY, current_services, service_proxy
+import atexit
 import json
 import base64
-import io
-from PyPDF2 import PdfReader
-import requests
-from bs4 import BeautifulSoup
-import re
 import sqlite3
 import os
 
-app = Flask(__name__)
-CORS(app)
+api = Blueprint('api', __name__)
 
-# Global managers
-db_manager = None
-user_manager = None
-skill_manager = None
-system_manager = None
-team_manager = None
-rating_service = None
+# Services of the app handling the current request (see backend/services.py)
+db_manager = service_proxy('db_manager')
+user_manager = service_proxy('user_manager')
+skill_manager = service_proxy('skill_manager')
+system_manager = service_proxy('system_manager')
+team_manager = service_proxy('team_manager')
+resume_blob_manager = service_proxy('resume_blob_manager')
+github_profile_manager = service_proxy('github_profile_manager')
+rating_service = service_proxy('rating_service')
+rating_jobs = service_proxy('rating_jobs')
 
 
-def extract_text_from_pdf_base64(base64_data):
-    """Extract text from base64 encoded PDF data"""
-    try:
-        # Remove data URL prefix if present (e.g., "data:application/pdf;base64,")
-        if ',' in base64_data:
-            base64_data = base64_data.split(',')[1]
-
-        # Decode base64 to bytes
-        pdf_bytes = base64.b64decode(base64_data)
-
-        # Create a BytesIO object from the bytes
-        pdf_file = io.BytesIO(pdf_bytes)
-
-        # Read PDF using PyPDF2
-        pdf_reader = PdfReader(pdf_file)
-
-        # Extract text from all pages
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-
-        # Clean up the text (remove excessive whitespace)
-        text = ' '.join(text.split())
-
-        return text.strip()
-
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return f"[PDF TEXT EXTRACTION FAILED: {str(e)}]"
-
-
-class GithubScraper:
-    """
-    Scrapes a GitHub profile to extract data for technical evaluation based on raw HTML.
-    This version is improved to handle asynchronously loaded content like the contribution graph.
-    """
-
-    def __init__(self, username):
-        self.username = username
-        self.base_url = f"https://github.com/{username}"
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-
-    def _get_soup(self, url):
-        """Fetches and parses HTML content from a URL."""
-        try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {url}: {e}")
-            return None
-
-    def scrape_profile(self):
-        """Main method to orchestrate the scraping process."""
-        print(f"Starting scrape for user: {self.username}...")
-        main_page_soup = self._get_soup(self.base_url)
-        if not main_page_soup:
-            return None
-
-        profile_info = self._extract_profile_info(main_page_soup)
-
-        # Asynchronously loaded contribution data
-        contribution_stats = self._extract_contribution_stats(main_page_soup)
-
-        pinned_repos_data = self._extract_pinned_repos(main_page_soup)
-
-        analyzed_repositories = []
-        if pinned_repos_data:
-            print(
-                f"Found {len(pinned_repos_data)} pinned repositories. Analyzing each...")
-            for repo in pinned_repos_data:
-                repo_details = self._scrape_repo_details(repo['url'])
-                if repo_details:
-                    repo.update(repo_details)
-                    analyzed_repositories.append(repo)
-
-        print("Scraping complete.")
-        return {
-            "profileInfo": profile_info,
-            "contributionStats": contribution_stats,
-            "analyzedRepositories": analyzed_repositories
-        }
-
-    def _extract_profile_info(self, soup):
-        """Extracts user's full name and bio using more stable selectors."""
-        name_tag = soup.find('span', itemprop='name')
-        bio_tag = soup.find('div', class_='user-profile-bio')
-        return {
-            "fullName": name_tag.get_text(strip=True) if name_tag else "N/A",
-            "bio": bio_tag.get_text(strip=True) if bio_tag else "N/A"
-        }
-
-    def _extract_contribution_stats(self, soup):
-        """
-        Finds the include-fragment for the contribution graph and scrapes it.
-        This is more reliable as the graph is loaded asynchronously.
-        """
-        # The main page has a placeholder that loads the contribution graph
-        contrib_fragment = soup.find(
-            'include-fragment', src=re.compile(r'/users/.*/contributions'))
-        if not contrib_fragment:
-            # Fallback for older page structures
-            day_rects_main = soup.find_all(
-                'rect', class_='ContributionCalendar-day')
-            if day_rects_main:
-                active_days = sum(1 for day in day_rects_main if day.get(
-                    'data-level') and int(day['data-level']) > 0)
-                return {"totalContributionDaysInLastYear": active_days}
-            return {"totalContributionDaysInLastYear": "Could not load"}
-
-        contributions_url = f"https://github.com{contrib_fragment['src']}"
-        contrib_soup = self._get_soup(contributions_url)
-        if not contrib_soup:
-            return {"totalContributionDaysInLastYear": "Could not load"}
-
-        # Extract the total from the text, e.g., "53 contributions in the last year"
-        h2_text = contrib_soup.find('h2', class_='f4').get_text(
-            strip=True) if contrib_soup.find('h2', class_='f4') else ''
-        match = re.search(r'(\d+,\d+|\d+)\s+contributions', h2_text)
-        if match:
-            total_contributions = int(match.group(1).replace(',', ''))
-            return {"totalContributionsInLastYear": total_contributions}
-
-        # Fallback to counting days if the total isn't found
-        day_rects = contrib_soup.find_all(
-            'rect', class_='ContributionCalendar-day')
-        active_days = sum(1 for day in day_rects if day.get(
-            'data-level') and int(day['data-level']) > 0)
-        return {"totalContributionDaysInLastYear": active_days}
-
-    def _extract_pinned_repos(self, soup):
-        """Extracts basic info from pinned repositories."""
-        pinned_section = soup.find(
-            'div', class_='js-pinned-items-reorder-container')
-        if not pinned_section:
-            return []
-
-        repos = []
-        # The selector for pinned items is more reliable targeting the Box element
-        pinned_items = pinned_section.find_all('div', class_='Box')
-        for item in pinned_items:
-            repo_link = item.find(
-                'a', {'data-view-component': 'true'}, href=True)
-            if not repo_link or not repo_link.find('span', class_='repo'):
-                continue
-
-            repo_url = f"https://github.com{repo_link['href']}"
-            name = repo_link.find('span', class_='repo').get_text(strip=True)
-            desc_tag = item.find('p', class_='pinned-item-desc')
-            lang_tag = item.find('span', itemprop='programmingLanguage')
-            star_tag = item.find('a', href=f"{repo_link['href']}/stargazers")
-            
-            # Parse star count, handling 'k' notation
-            stars = 0
-            if star_tag:
-                star_text = star_tag.get_text(strip=True).replace(',', '')
-                if 'k' in star_text.lower():
-                    stars = int(float(star_text.lower().replace('k', '')) * 1000)
-                elif star_text.isdigit():
-                    stars = int(star_text)
-
-            repos.append({
-                "name": name,
-                "url": repo_url,
-                "description": desc_tag.get_text(strip=True) if desc_tag else "N/A",
-                "primaryLanguage": lang_tag.get_text(strip=True) if lang_tag else "N/A",
-                "stars": stars
-            })
-        return repos
-
-    def _scrape_repo_details(self, repo_url):
-        """Scrapes detailed information from a single repository page."""
-        soup = self._get_soup(repo_url)
-        if not soup:
-            return None
-
-        readme_div = soup.find('div', id='readme')
-        readme_content = readme_div.get_text() if readme_div else None
-
-        # A more reliable way to find the license is to look for a link to a license file
-        license_link = soup.find('a', href=re.compile(
-            r'/blob/main/LICENSE', re.IGNORECASE))
-
-        return {
-            "readme": {
-                "exists": bool(readme_content),
-                "contentLength": len(readme_content) if readme_content else 0
-            },
-            "qualityFlags": {
-                "hasLicense": bool(license_link)
-            }
-        }
-
-
-class HighlightGenerator:
-    """
-    Takes raw scraped GitHub data and formats it into a human-readable
-    highlights report for evaluation.
-    """
-
-    def __init__(self, github_data):
-        self.data = github_data
-
-    def generate_report(self):
-        """Creates the full text report."""
-        profile_info = self.data.get('profileInfo', {})
-        username = profile_info.get(
-            'fullName') or self.data.get('username', 'N/A')
-        report_lines = []
-
-        report_lines.append("\n" + "="*50)
-        report_lines.append(f"      GITHUB PROFILE HIGHLIGHTS for {username}")
-        report_lines.append("="*50)
-
-        # Work Ethic & Consistency
-        contrib_stats = self.data.get('contributionStats', {})
-        contributions = contrib_stats.get('totalContributionsInLastYear') or contrib_stats.get(
-            'totalContributionDaysInLastYear', 0)
-        contrib_type = "Total Contributions" if 'totalContributionsInLastYear' in contrib_stats else "Active Days"
-        report_lines.append("\n**1. Work Ethic & Consistency:**")
-        report_lines.append(
-            f"* **Activity (Last Year):** {contributions} ({contrib_type}).")
-
-        # Project Analysis
-        repos = self.data.get('analyzedRepositories', [])
-        report_lines.append("\n**2. Project Details (Pinned Repositories):**")
-
-        if not repos:
-            report_lines.append("* No pinned repositories found.")
-        else:
-            total_stars = 0
-            documented_repos_count = 0
-            non_trivial_projects = []
-
-            for repo in repos:
-                total_stars += repo.get('stars', 0)
-                if repo.get('readme', {}).get('exists'):
-                    documented_repos_count += 1
-                if "solution" not in repo['name'].lower() and "leetcode" not in repo['name'].lower():
-                    non_trivial_projects.append(
-                        f"{repo['name']} ({repo.get('primaryLanguage', 'N/A')})")
-
-                report_lines.append(f"* **{repo.get('name', 'N/A')}:**")
-                report_lines.append(
-                    f"  - **Description:** {repo.get('description', 'N/A')}")
-                report_lines.append(f"  - **Stars:** {repo.get('stars', 0)}")
-                report_lines.append(
-                    f"  - **README:** {'Exists' if repo.get('readme', {}).get('exists') else 'MISSING'}")
-
-        # Key Takeaways for AI Prompt
-        report_lines.append("\n" + "="*50)
-        report_lines.append("      KEY DATA POINTS FOR SCORING")
-        report_lines.append("="*50)
-
-        report_lines.append(f"* **IMPACT (Community Validation):**")
-        report_lines.append(f"  - Total Stars on Pinned Repos: {total_stars}")
-
-        report_lines.append(f"\n* **COMPLEXITY (Project Types):**")
-        if non_trivial_projects:
-            report_lines.append(
-                f"  - Non-trivial projects identified: {', '.join(non_trivial_projects)}")
-        else:
-            report_lines.append(
-                "  - Projects appear to be primarily foundational or solution-based.")
-
-        report_lines.append(f"\n* **DOCUMENTATION (Professionalism):**")
-        report_lines.append(
-            f"  - README files exist for {documented_repos_count} out of {len(repos)} pinned repositories.")
-
-        report_lines.append("\n" + "="*50)
-
-        return "\n".join(report_lines)
-
-
-def get_github_score(github_username):
-    """Get GitHub profile analysis for scoring"""
-    try:
-        scraper = GithubScraper(github_username)
-        github_data = scraper.scrape_profile()
-        
-        if github_data:
-            reporter = HighlightGenerator(github_data)
-            return reporter.generate_report()
-        return "Could not analyze GitHub profile"
-    except Exception as e:
-        print(f"Error analyzing GitHub profile: {e}")
-        return f"GitHub analysis failed: {str(e)}"
-
-
-def initialize_app():
-    """Initialize the Flask app with database connections"""
-    global db_manager, user_manager, skill_manager, system_manager, team_manager, rating_service
-    try:
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            raise Exception("Failed to connect to database")
-
-        # Initialize tables
-        db_manager.initialize_tables()
-
-        # Initialize managers
-        user_manager = UserManager(db_manager)
-        skill_manager = SkillManager(db_manager)
-        system_manager = SystemManager(db_manager)
-        team_manager = TeamManager(db_manager)
-        
-        # Initialize rating service
-        try:
-            rating_service = RatingService()
-            print("✅ Rating service initialized successfully")
-        except Exception as e:
-            print(f"⚠️ Rating service initialization failed: {e}")
-            rating_service = None
-
-        print("✅ Flask app initialized successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Flask app initialization failed: {e}")
-        return False
-
-
-@app.route('/health', methods=['GET'])
+@api.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({"status": "healthy", "message": "HackBite API is running"})
 
 
-@app.route('/api/register', methods=['POST'])
+@api.route('/api/outbound-status', methods=['GET'])
+def get_outbound_status():
+    """
+    Circuit breaker state, queue depth and call counters for GitHub/Gemini, plus prompt sizes, model routing and 304 ratios
+
+    Everything here is per process: under the prefork server it covers only the
+    worker answering (`pid`, with `scope` "worker"); /metrics aggregates all workers.
+    """
+    return jsonify({"success": True, "pid": os.getpid(), "scope": "worker" if multiprocess_dir() else "process",
+                    "destinations": outbound_status(),
+                    "prompts": prompt_stats.summary(), "routing": routing_stats.summary(),
+                    "http_cache": http_cache_stats.summary()}), 200
+
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request, database and outbound call metrics in Prometheus text format"""
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+
+@api.route('/api/admin/profiles', methods=['GET'])
+@admin_required
+def list_profiles():
+    """Stored request profiles (see backend/request_profiler.py), newest first"""
+    profiler = current_app.extensions['request_profiler']
+    return jsonify({"success": True, "profiles": profiler.list_profiles(), "stats": dict(profiler.stats)}), 200
+
+
+@api.route('/api/admin/profiles/<name>', methods=['GET'])
+@admin_required
+def get_profile(name):
+    """Download a stored profile (pstats format), or ?format=text for the top of its report"""
+    profiler = current_app.extensions['request_profiler']
+    path = profiler.path_for(name)
+    if path is None:
+        return jsonify({"success": False, "message": "Profile not found"}), 404
+    if request.args.get('format') == 'text':
+        sort = request.args.get('sort', 'cumulative')
+        if sort not in ('cumulative', 'tottime', 'calls'):
+            return jsonify({"success": False, "message": "sort must be cumulative, tottime or calls"}), 400
+        limit = request.args.get('limit', 40, type=int)
+        return Response(profiler.report(path, sort, limit), mimetype='text/plain')
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True, download_name=name)
+
+
+@api.route('/api/admin/resume-blobs/collect', methods=['POST'])
+@admin_required
+def collect_resume_blobs():
+    """Delete unreferenced resume blobs older than ?min_age_seconds= (default RESUME_BLOB_GC_MIN_AGE)"""
+    removed = resume_blob_manager.garbage_collect(request.args.get('min_age_seconds', type=int))
+    if removed:
+        print(f"🧹 Removed {removed} unreferenced resume blobs")
+    return jsonify({"success": True, "removed": removed}), 200
+
+
+@api.route('/api/admin/sampler', methods=['GET'])
+@admin_required
+def get_sampler_status():
+    """Sampling profiler state: interval, samples taken, measured overhead, rotated files"""
+    return jsonify({"success": True, "sampler": sampler.status()}), 200
+
+
+@api.route('/api/admin/sampler/stacks', methods=['GET'])
+@admin_required
+def get_sampler_stacks():
+    """Collapsed stacks (flamegraph.pl / speedscope input) from all workers over the last ?minutes=5"""
+    minutes = request.args.get('minutes', 5, type=float)
+    return Response(collapsed_text(sampler.stacks(minutes * 60)), mimetype='text/plain')
+
+
+@api.route('/api/admin/traces/<trace_id>', methods=['GET'])
+@admin_required
+def get_trace(trace_id):
+    """Spans of one trace (X-Trace-Id of a request) with offsets and durations, or ?format=otlp for raw OTLP JSON"""
+    trace_id = trace_id.lower()
+    if len(trace_id) != 32 or any(c not in '0123456789abcdef' for c in trace_id):
+        return jsonify({"success": False, "message": "trace_id must be 32 hex characters"}), 400
+    span_exporter.flush()
+    spans = span_exporter.find_trace(trace_id)
+    if not spans:
+        return jsonify({"success": False, "message": "Trace not found"}), 404
+    if request.args.get('format') == 'otlp':
+        return jsonify({"resourceSpans": [{"scopeSpans": [{"scope": {"name": "backend.tracing"}, "spans": spans}]}]}), 200
+    return jsonify({"success": True, "trace_id": trace_id, "spans": trace_summary(spans)}), 200
+
+
+@api.route('/api/register', methods=['POST'])
 def register():
     """Register a new user"""
     try:
@@ -397,7 +173,7 @@ def register():
         return jsonify({"success": False, "message": f"Registration failed: {str(e)}"}), 500
 
 
-@app.route('/api/login', methods=['POST'])
+@api.route('/api/login', methods=['POST'])
 def login():
     """Authenticate user login"""
     try:
@@ -424,7 +200,7 @@ def login():
         return jsonify({"success": False, "message": f"Login failed: {str(e)}"}), 500
 
 
-@app.route('/api/users', methods=['GET'])
+@api.route('/api/users', methods=['GET'])
 def get_users():
     """Get all users"""
     try:
@@ -441,7 +217,7 @@ def get_users():
         return jsonify({"success": False, "message": f"Failed to get users: {str(e)}"}), 500
 
 
-@app.route('/api/users/<int:user_id>', methods=['GET'])
+@api.route('/api/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     """Get user by ID"""
     try:
@@ -459,7 +235,7 @@ def get_user(user_id):
         return jsonify({"success": False, "message": f"Failed to get user: {str(e)}"}), 500
 
 
-@app.route('/api/users/<int:user_id>/profile-logo', methods=['PUT'])
+@api.route('/api/users/<int:user_id>/profile-logo', methods=['PUT'])
 def update_profile_logo(user_id):
     """Update user's profile logo"""
     try:
@@ -480,21 +256,26 @@ def update_profile_logo(user_id):
         return jsonify({"success": False, "message": f"Failed to update profile logo: {str(e)}"}), 500
 
 
-@app.route('/api/profile-logos', methods=['GET'])
+@api.route('/api/profile-logos', methods=['GET'])
+@conditional('static')
 def get_profile_logos():
     """Get available profile logos"""
     try:
-        logos = user_manager.get_available_logos()
-        return jsonify({
-            "success": True,
-            "logos": logos,
-            "avatar_names": list(logos.keys())
-        }), 200
+        def build():
+            logos = user_manager.get_available_logos()
+            return {
+                "success": True,
+                "logos": logos,
+                "avatar_names": list(logos.keys())
+            }
+
+        # The logo set is fixed, so it is encoded once per app
+        return static_json_response('profile-logos', build)
     except Exception as e:
         return jsonify({"success": False, "message": f"Failed to get logos: {str(e)}"}), 500
 
 
-@app.route('/api/statistics', methods=['GET'])
+@api.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """Get user statistics"""
     try:
@@ -509,7 +290,8 @@ def get_statistics():
         return jsonify({"success": False, "message": f"Failed to get statistics: {str(e)}"}), 500
 
 
-@app.route('/api/skill-categories', methods=['GET'])
+@api.route('/api/skill-categories', methods=['GET'])
+@conditional('reference', tables=('skill_categories',))
 def get_skill_categories():
     """Get all skill categories"""
     try:
@@ -524,7 +306,7 @@ def get_skill_categories():
         return jsonify({"success": False, "message": f"Failed to get skill categories: {str(e)}"}), 500
 
 
-@app.route('/api/skill-categories/<int:category_id>/skills', methods=['GET'])
+@api.route('/api/skill-categories/<int:category_id>/skills', methods=['GET'])
 def get_skills_by_category(category_id):
     """Get skills in a specific category"""
     try:
@@ -539,7 +321,7 @@ def get_skills_by_category(category_id):
         return jsonify({"success": False, "message": f"Failed to get skills: {str(e)}"}), 500
 
 
-@app.route('/api/settings/<setting_key>', methods=['GET'])
+@api.route('/api/settings/<setting_key>', methods=['GET'])
 def get_system_setting(setting_key):
     """Get a system setting"""
     try:
@@ -554,7 +336,7 @@ def get_system_setting(setting_key):
         return jsonify({"success": False, "message": f"Failed to get setting: {str(e)}"}), 500
 
 
-@app.route('/api/settings/<setting_key>', methods=['PUT'])
+@api.route('/api/settings/<setting_key>', methods=['PUT'])
 def update_system_setting(setting_key):
     """Update a system setting"""
     try:
@@ -579,7 +361,7 @@ def update_system_setting(setting_key):
 # Team Management Endpoints
 
 
-@app.route('/api/teams', methods=['POST'])
+@api.route('/api/teams', methods=['POST'])
 def create_team():
     """Create a new team"""
     try:
@@ -644,7 +426,7 @@ def create_team():
         return jsonify({"success": False, "message": f"Team creation failed: {str(e)}"}), 500
 
 
-@app.route('/api/teams/check-existing', methods=['GET'])
+@api.route('/api/teams/check-existing', methods=['GET'])
 def check_existing_team():
     """Check if user already created a team for a specific hackathon"""
     try:
@@ -681,7 +463,7 @@ def check_existing_team():
         return jsonify({"success": False, "message": f"Failed to check existing team: {str(e)}"}), 500
 
 
-@app.route('/api/teams', methods=['GET'])
+@api.route('/api/teams', methods=['GET'])
 def get_teams():
     """Get all teams"""
     try:
@@ -701,7 +483,8 @@ def get_teams():
         return jsonify({"success": False, "message": f"Failed to get teams: {str(e)}"}), 500
 
 
-@app.route('/api/teams/<int:team_id>', methods=['GET'])
+@api.route('/api/teams/<int:team_id>', methods=['GET'])
+@conditional('live', tables=('teams', 'team_members', 'users'))
 def get_team(team_id):
     """Get team by ID"""
     try:
@@ -720,7 +503,7 @@ def get_team(team_id):
         return jsonify({"success": False, "message": f"Failed to get team: {str(e)}"}), 500
 
 
-@app.route('/api/teams/<int:team_id>/join', methods=['POST'])
+@api.route('/api/teams/<int:team_id>/join', methods=['POST'])
 def join_team(team_id):
     """Join a team"""
     try:
@@ -741,7 +524,7 @@ def join_team(team_id):
         return jsonify({"success": False, "message": f"Failed to join team: {str(e)}"}), 500
 
 
-@app.route('/api/teams/<int:team_id>/leave', methods=['POST'])
+@api.route('/api/teams/<int:team_id>/leave', methods=['POST'])
 def leave_team(team_id):
     """Leave a team"""
     try:
@@ -762,7 +545,7 @@ def leave_team(team_id):
         return jsonify({"success": False, "message": f"Failed to leave team: {str(e)}"}), 500
 
 
-@app.route('/api/teams/<int:team_id>', methods=['PUT'])
+@api.route('/api/teams/<int:team_id>', methods=['PUT'])
 def update_team(team_id):
     """Update team details"""
     try:
@@ -786,7 +569,7 @@ def update_team(team_id):
         return jsonify({"success": False, "message": f"Failed to update team: {str(e)}"}), 500
 
 
-@app.route('/api/teams/search', methods=['GET'])
+@api.route('/api/teams/search', methods=['GET'])
 def search_teams():
     """Search teams with filters"""
     try:
@@ -818,7 +601,8 @@ def search_teams():
 # Hackathon Management Endpoints
 
 
-@app.route('/api/hackathons', methods=['GET'])
+@api.route('/api/hackathons', methods=['GET'])
+@conditional('polled', tables=('hackathons',))
 def get_hackathons():
     """Get all hackathons"""
     try:
@@ -859,7 +643,8 @@ def get_hackathons():
         return jsonify({"success": False, "message": f"Failed to get hackathons: {str(e)}"}), 500
 
 
-@app.route('/api/hackathons/<int:hackathon_id>', methods=['GET'])
+@api.route('/api/hackathons/<int:hackathon_id>', methods=['GET'])
+@conditional('polled', tables=('hackathons',))
 def get_hackathon(hackathon_id):
     """Get hackathon by ID"""
     try:
@@ -891,55 +676,107 @@ def get_hackathon(hackathon_id):
 # Resume Rating Endpoints
 
 
-@app.route('/api/rate-profile', methods=['POST'])
-def rate_profile():
-    """Store user resume and GitHub data in database with AI-generated ratings"""
-    try:
-        data = request.get_json()
-
-        # Extract required fields
-        github_username = data.get('githubUsername', '').strip()
-        resume_base64 = data.get('resumeBase64', '').strip()
-        # Optional: if we want to link to specific user
-        user_id = data.get('user_id')
-
-        # Validate required fields
-        if not all([github_username, resume_base64]):
-            return jsonify({"success": False, "message": "GitHub username and resume are required"}), 400
+def resolve_resume_text(resume_hash, read_pdf):
+    """
+    Get the extracted text for a resume, reusing stored text for identical uploads.
 
-        # Extract text from PDF
-        print("Extracting text from PDF...")
-        resume_text = extract_text_from_pdf_base64(resume_base64)
-        print(f"Extracted {len(resume_text)} characters from PDF")
+    `read_pdf` is only called (and the PDF only extracted) when the hash is new.
+    Returns (resume_text, resume_hash); the hash is None if extraction failed.
+    """
+    with span('resume.resolve') as resume_span:
+        try:
+            blob = resume_blob_manager.get_or_extract(resume_hash, read_pdf, extract_pdf_text)
+            resume_text = blob['text']
+            resume_span.set_attribute('resume.reused', blob['reused'])
+            if blob['reused']:
+                log(f"Reusing extracted text for resume {resume_hash[:12]} ({len(resume_text)} characters)")
+            else:
+                log(f"Extracted {len(resume_text)} characters from PDF")
+            return resume_text, resume_hash
+        except Exception as e:
+            resume_span.record_exception(e)
+            log(f"Error extracting text from PDF: {e}")
+            return f"[PDF TEXT EXTRACTION FAILED: {str(e)}]", None
 
-        # Analyze GitHub profile for legacy compatibility
-        print(f"Analyzing GitHub profile for: {github_username}")
-        # Extract just the username for the old scraper
-        if github_username.startswith('https://github.com/'):
-            username_only = github_username.replace('https://github.com/', '').strip('/')
-        else:
-            username_only = github_username
-        github_analysis = get_github_score(username_only)
-        print(f"GitHub analysis completed: {len(github_analysis)} characters")
 
-        # Generate AI ratings using Gemini
-        ai_ratings = None
-        if rating_service:
-            try:
-                print("Generating AI ratings with Gemini...")
-                # Ensure we pass a proper GitHub URL (not double URL)
-                if github_username.startswith('https://github.com/'):
-                    github_url = github_username
-                else:
-                    github_url = f"https://github.com/{github_username}"
-                
-                ai_ratings = rating_service.generate_ratings(github_url, resume_text)
-                print(f"AI ratings generated successfully: {ai_ratings}")
-            except Exception as rating_error:
-                print(f"AI rating generation failed: {rating_error}")
-                ai_ratings = None
+def rate_and_store_profile(github_username, user_id, resume_text, resume_hash=None, progress=None):
+    """
+    Analyze GitHub, generate AI ratings and store them; returns (response_data, status_code)
+
+    `progress(stage, **data)` is called as stages complete (github_scraped,
+    provisional_scored, llm_started, then rating_received once per rating as the
+    Gemini response streams in). Streamed ratings are marked provisional: the
+    response is only validated once complete, and local heuristic ratings are
+    stored instead whenever Gemini is unavailable or fails, so the returned
+    ratings are the authoritative ones.
+    """
+    # Analyze GitHub profile for legacy compatibility
+    log(f"Analyzing GitHub profile for: {github_username}")
+    # Extract just the username for the old scraper
+    if github_username.startswith('https://github.com/'):
+        username_only = github_username.replace('https://github.com/', '').strip('/')
+    else:
+        username_only = github_username
+    scraped_github, github_analysis = analyze_github_profile(username_only)
+    log(f"GitHub analysis completed: {len(github_analysis)} characters")
+    if progress:
+        progress('github_scraped', github_analysis=github_analysis)
+    # Structured rows replace the stored text report; only failures are kept as text
+    stored_github_analysis = github_analysis
+    if scraped_github:
+        try:
+            with span('db.store_github_profile'):
+                github_profile_manager.store(username_only, scraped_github)
+            stored_github_analysis = None
+        except Exception as e:
+            log(f"Failed to store GitHub profile for {username_only}: {e}")
 
-        # Store in database with ratings
+    # Instant local score, shown while Gemini works and kept if it fails
+    provisional_ratings = None
+    try:
+        with span('rating.heuristic'):
+            provisional_ratings = heuristic_ratings(scraped_github, resume_text)
+    except Exception as heuristic_error:
+        log(f"Heuristic rating failed: {heuristic_error}")
+    if progress and provisional_ratings:
+        progress('provisional_scored', ratings=provisional_ratings)
+
+    # Generate AI ratings using Gemini
+    ai_ratings = None
+    rating_error = None
+    if rating_service:
+        try:
+            log("Generating AI ratings with Gemini...")
+            if progress:
+                progress('llm_started')
+            # Ensure we pass a proper GitHub URL (not double URL)
+            if github_username.startswith('https://github.com/'):
+                github_url = github_username
+            else:
+                github_url = f"https://github.com/{github_username}"
+
+            on_rating = None
+            if progress:
+                def on_rating(name, rating):
+                    progress('rating_received', name=name, rating=rating, provisional=True)
+            with span('rating.generate'):
+                ai_ratings = rating_service.generate_ratings(github_url, resume_text, on_rating=on_rating,
+                                                             scraped_github=scraped_github)
+            log(f"AI ratings generated successfully: {ai_ratings}")
+        except OutboundError as outbound_error:
+            log(f"AI rating service unavailable: {outbound_error}")
+            rating_error = ("AI rating service is busy or unavailable; provisional scores were stored, "
+                            "please submit again later to get your AI scores")
+        except Exception as generation_error:
+            log(f"AI rating generation failed: {generation_error}")
+            ai_ratings = None
+
+    if not ai_ratings:
+        log("Using heuristic ratings")
+        ai_ratings = provisional_ratings
+
+    # Store in database with ratings
+    with span('db.store_rating') as store_span:
         try:
             # If no user_id provided, we'll use a default value for anonymous users
             if user_id is None:
@@ -957,26 +794,29 @@ def rate_profile():
                     )
                     user_id = cursor.lastrowid
                     db_manager.connection.commit()
-                    print(f"Created anonymous user with ID: {user_id}")
+                    log(f"Created anonymous user with ID: {user_id}")
                 else:
                     user_id = anonymous_user[0]
-                    print(f"Using existing anonymous user with ID: {user_id}")
+                    log(f"Using existing anonymous user with ID: {user_id}")
 
-            print(f"Storing resume data: user_id={user_id}, github={username_only}")
+            log(f"Storing resume data: user_id={user_id}, github={username_only}")
 
             # Extract scores from AI ratings
             git_score = 0
             resume_score = 0
             overall_score = 0
-            
+
             if ai_ratings:
                 git_score = ai_ratings.get('git_rating', {}).get('score', 0)
                 resume_score = ai_ratings.get('resume_rating', {}).get('score', 0)
                 overall_score = ai_ratings.get('overall_rating', {}).get('score', 0)
 
+            # Deduplicated uploads are stored once in resume_blobs and referenced by hash
+            stored_resume_data = None if resume_hash else resume_text
+
             # Check if user already has a rating record
             cursor = db_manager.connection.execute(
-                "SELECT uid FROM user_ratings WHERE user_id = ?",
+                "SELECT uid, resume_hash FROM user_ratings WHERE user_id = ?",
                 (user_id,)
             )
             existing_record = cursor.fetchone()
@@ -985,32 +825,34 @@ def rate_profile():
                 # Update existing record with GitHub analysis and AI ratings
                 cursor = db_manager.connection.execute(
                     """UPDATE user_ratings 
-                       SET resume_data = ?, github_link = ?, github_analysis = ?, 
+                       SET resume_data = ?, resume_hash = ?, github_link = ?, github_analysis = ?, 
                            git_score = ?, resume_score = ?, overall_score = ?,
                            ai_ratings_json = ?, updated_at = datetime('now')
                        WHERE user_id = ?""",
-                    (resume_text, username_only, github_analysis, 
+                    (stored_resume_data, resume_hash, username_only, stored_github_analysis,
                      git_score, resume_score, overall_score,
                      json.dumps(ai_ratings) if ai_ratings else None, user_id)
                 )
                 db_manager.connection.commit()
                 rating_id = existing_record[0]
-                print(f"Successfully updated existing resume data with ID: {rating_id}")
+                if existing_record[1] != resume_hash:
+                    resume_blob_manager.release(existing_record[1])
+                log(f"Successfully updated existing resume data with ID: {rating_id}")
             else:
                 # Insert new record with GitHub analysis and AI ratings
                 cursor = db_manager.connection.execute(
                     """INSERT INTO user_ratings 
-                       (user_id, resume_data, github_link, github_analysis, 
+                       (user_id, resume_data, resume_hash, github_link, github_analysis, 
                         git_score, resume_score, overall_score, ai_ratings_json, 
                         created_at, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))""",
-                    (user_id, resume_text, username_only, github_analysis,
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))""",
+                    (user_id, stored_resume_data, resume_hash, username_only, stored_github_analysis,
                      git_score, resume_score, overall_score, 
                      json.dumps(ai_ratings) if ai_ratings else None)
                 )
                 db_manager.connection.commit()
                 rating_id = cursor.lastrowid
-                print(f"Successfully stored new resume data with ID: {rating_id}")
+                log(f"Successfully stored new resume data with ID: {rating_id}")
 
             # Prepare response
             response_data = {
@@ -1023,22 +865,182 @@ def rate_profile():
                     "overall_score": overall_score
                 }
             }
-            
-            # Include AI ratings details if available
-            if ai_ratings:
-                response_data["ratings"] = ai_ratings
 
-            return jsonify(response_data), 200
+            # Include AI ratings details (heuristic ones are marked with "engine")
+            response_data["ratings"] = ai_ratings
+            if rating_error:
+                response_data["rating_error"] = rating_error
+
+            return response_data, 200
 
         except Exception as db_error:
-            print(f"Database error in rate_profile: {db_error}")
-            return jsonify({"success": False, "message": f"Failed to store data: {str(db_error)}"}), 500
+            store_span.record_exception(db_error)
+            log(f"Database error in rate_profile: {db_error}")
+            return {"success": False, "message": f"Failed to store data: {str(db_error)}"}, 500
+
+
+@api.route('/api/rate-profile', methods=['POST'])
+def rate_profile():
+    """Store user resume and GitHub data in database with AI-generated ratings"""
+    try:
+        data = request.get_json()
+
+        # Extract required fields
+        github_username = data.get('githubUsername', '').strip()
+        resume_base64 = data.get('resumeBase64', '').strip()
+        # Optional: if we want to link to specific user
+        user_id = data.get('user_id')
+
+        # Validate required fields
+        if not all([github_username, resume_base64]):
+            return jsonify({"success": False, "message": "GitHub username and resume are required"}), 400
+
+        # Extract text from PDF, reusing the stored text for identical uploads
+        try:
+            pdf_bytes = decode_pdf_base64(resume_base64)
+            resume_text, resume_hash = resolve_resume_text(
+                ResumeBlobManager.hash_pdf(pdf_bytes), lambda: pdf_bytes)
+        except Exception as e:
+            log(f"Error extracting text from PDF: {e}")
+            resume_text, resume_hash = f"[PDF TEXT EXTRACTION FAILED: {str(e)}]", None
+
+        result, status_code = rate_and_store_profile(github_username, user_id, resume_text, resume_hash)
+        return jsonify(result), status_code
 
     except Exception as e:
         return jsonify({"success": False, "message": f"Failed to process request: {str(e)}"}), 500
 
 
-@app.route('/api/user-ratings/<int:user_id>', methods=['GET'])
+def read_resume_upload():
+    """
+    Read githubUsername, user_id and the resume PDF of an upload request.
+
+    Returns (github_username, user_id, spooled_pdf, None) with the PDF rewound
+    past its magic bytes check, or (None, None, None, error_response).
+    """
+    if request.mimetype == 'multipart/form-data':
+        fields = request.form
+        resume_file = request.files.get('resume')
+        spooled = resume_file.stream if resume_file else None
+    elif request.mimetype in ('application/pdf', 'application/octet-stream'):
+        fields = request.args
+        spooled = spool_stream(request.stream, content_length=request.content_length)
+    else:
+        return None, None, None, (jsonify({"success": False, "message": "Unsupported content type; send multipart/form-data or application/pdf"}), 415)
+
+    github_username = fields.get('githubUsername', '').strip()
+    user_id = fields.get('user_id', type=int)
+
+    if not github_username or spooled is None or not spooled.size:
+        return None, None, None, (jsonify({"success": False, "message": "GitHub username and resume are required"}), 400)
+
+    if not spooled.read(5).startswith(b'%PDF'):
+        spooled.close()
+        return None, None, None, (jsonify({"success": False, "message": "Resume must be a PDF file"}), 400)
+    spooled.seek(0)
+
+    return github_username, user_id, spooled, None
+
+
+def run_rating_job(job, app, github_username, user_id, resume_hash, pdf_bytes):
+    """Background body of a /api/rate-profile/jobs submission, reporting each stage to `job`."""
+    with app.app_context():
+        resume_text, resume_hash = resolve_resume_text(resume_hash, lambda: pdf_bytes)
+        job.emit('pdf_extracted', characters=len(resume_text), extracted=resume_hash is not None)
+
+        result, status_code = rate_and_store_profile(github_username, user_id, resume_text, resume_hash,
+                                                     progress=job.emit)
+    if status_code == 200 and result.get('success'):
+        job.emit('scored', result=result)
+    else:
+        job.emit('failed', message=result.get('message'), status=status_code)
+
+
+@api.route('/api/rate-profile/jobs', methods=['POST'])
+def create_rating_job():
+    """
+    Start rating a profile in the background; same input as /api/rate-profile/upload.
+
+    Returns 202 with the job id and the URL of its server-sent event stream.
+    """
+    try:
+        github_username, user_id, spooled, error_response = read_resume_upload()
+        if error_response:
+            return error_response
+
+        with spooled:
+            resume_hash = spooled.hexdigest()
+            # Known resumes need no bytes; new ones are read now since the upload is closed after the request
+            pdf_bytes = None if resume_blob_manager.get_text(resume_hash) is not None else spooled.read_all()
+
+        job = rating_jobs.submit(run_rating_job, current_app._get_current_object(), github_username, user_id, resume_hash, pdf_bytes)
+        return jsonify({
+            "success": True,
+            "message": "Rating started",
+            "job_id": job.job_id,
+            "events_url": f"/api/rate-profile/jobs/{job.job_id}/events"
+        }), 202
+
+    except RequestEntityTooLarge as e:
+        return jsonify({"success": False, "message": e.description}), 413
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Failed to process request: {str(e)}"}), 500
+
+
+@api.route('/api/rate-profile/jobs/<job_id>', methods=['GET'])
+def get_rating_job(job_id):
+    """Current stage and all events of a rating job (polling alternative to the event stream)"""
+    job = rating_jobs.get(job_id) if rating_jobs else None
+    if not job:
+        return jsonify({"success": False, "message": "Rating job not found"}), 404
+    return jsonify({"success": True, **job.snapshot()}), 200
+
+
+@api.route('/api/rate-profile/jobs/<job_id>/events', methods=['GET'])
+def stream_rating_job(job_id):
+    """Server-sent events for a rating job: queued, started, pdf_extracted, github_scraped, llm_started, scored/failed"""
+    job = rating_jobs.get(job_id) if rating_jobs else None
+    if not job:
+        return jsonify({"success": False, "message": "Rating job not found"}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id', '0'))
+    try:
+        last_event_id = int(last_event_id)
+    except ValueError:
+        last_event_id = 0
+
+    return Response(stream_job_events(job, last_event_id), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@api.route('/api/rate-profile/upload', methods=['POST'])
+def rate_profile_upload():
+    """
+    Binary variant of /api/rate-profile.
+
+    Accepts either multipart/form-data (fields githubUsername, user_id and a
+    `resume` file) or a raw application/pdf / application/octet-stream body with
+    githubUsername and user_id as query parameters. The PDF is streamed to a
+    spooled temp file and hashed on the way in; a known hash skips extraction.
+    """
+    try:
+        github_username, user_id, spooled, error_response = read_resume_upload()
+        if error_response:
+            return error_response
+
+        with spooled:
+            resume_text, resume_hash = resolve_resume_text(spooled.hexdigest(), spooled.read_all)
+
+        result, status_code = rate_and_store_profile(github_username, user_id, resume_text, resume_hash)
+        return jsonify(result), status_code
+
+    except RequestEntityTooLarge as e:
+        return jsonify({"success": False, "message": e.description}), 413
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Failed to process request: {str(e)}"}), 500
+
+
+@api.route('/api/user-ratings/<int:user_id>', methods=['GET'])
 def get_user_rating(user_id):
     """Get user's latest rating"""
     try:
@@ -1064,10 +1066,39 @@ def get_user_rating(user_id):
     except Exception as e:
         return jsonify({"success": False, "message": f"Failed to get user rating: {str(e)}"}), 500
 
+@api.route('/api/github-profiles/<username>', methods=['GET'])
+def get_github_profile(username):
+    """Get a stored GitHub profile's metrics and its highlights report (rendered on demand)"""
+    try:
+        github_data = github_profile_manager.get(username)
+        if not github_data:
+            return jsonify({"success": False, "message": "GitHub profile not found"}), 404
+
+        return jsonify({
+            "success": True,
+            "profile": github_data,
+            "report": HighlightGenerator(github_data).generate_report()
+        }), 200
+
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Failed to get GitHub profile: {str(e)}"}), 500
+
+
+@api.route('/api/github-leaderboard', methods=['GET'])
+def get_github_leaderboard():
+    """Top stored GitHub profiles by stars, optionally for one language (?language=Python&limit=10)"""
+    try:
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        profiles = github_profile_manager.top_profiles(limit, request.args.get('language'))
+        return jsonify({"success": True, "profiles": profiles}), 200
+
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Failed to get GitHub leaderboard: {str(e)}"}), 500
+
 # Team Request Endpoints
 
 
-@app.route('/api/team-requests', methods=['POST'])
+@api.route('/api/team-requests', methods=['POST'])
 def create_team_request():
     """Create a new team request"""
     try:
@@ -1116,7 +1147,7 @@ def create_team_request():
         return jsonify({"success": False, "message": f"Failed to create team request: {str(e)}"}), 500
 
 
-@app.route('/api/team-requests/check', methods=['GET'])
+@api.route('/api/team-requests/check', methods=['GET'])
 def check_team_request():
     """Check if user already submitted request for a hackathon"""
     try:
@@ -1152,7 +1183,7 @@ def check_team_request():
         return jsonify({"success": False, "message": f"Failed to check team request: {str(e)}"}), 500
 
 
-@app.route('/api/team-requests', methods=['GET'])
+@api.route('/api/team-requests', methods=['GET'])
 def get_team_requests():
     """Get team requests with optional filters"""
     try:
@@ -1201,32 +1232,31 @@ def get_team_requests():
         return jsonify({"success": False, "message": f"Failed to get team requests: {str(e)}"}), 500
 
 
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
     return jsonify({"success": False, "message": "Endpoint not found"}), 404
 
 
-@app.errorhandler(405)
+@api.app_errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 errors"""
     return jsonify({"success": False, "message": "Method not allowed"}), 405
 
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
     return jsonify({"success": False, "message": "Internal server error"}), 500
 
 
-@app.route('/api/get-ratings', methods=['GET'])
+@api.route('/api/get-ratings', methods=['GET'])
 def get_ratings():
     try:
         # Get user_id from query parameters (optional for now)
         user_id = request.args.get('user_id', None)
         
-        conn = sqlite3.connect('database/database.db')
-        cursor = conn.cursor()
+        cursor = current_services().connection().cursor()
         
         if user_id:
             # Get ratings for specific user
@@ -1247,7 +1277,6 @@ def get_ratings():
             """)
         
         result = cursor.fetchone()
-        conn.close()
         
         if result:
             return jsonify({
@@ -1265,7 +1294,7 @@ def get_ratings():
         return jsonify({'success': False, 'message': str(e)})
 
 
-@app.route('/api/team-candidates', methods=['GET'])
+@api.route('/api/team-candidates', methods=['GET'])
 def get_team_candidates():
     """Get potential team candidates with intelligent complementary skill matching"""
     try:
@@ -1308,9 +1337,7 @@ def get_team_candidates():
         }
         
         # Get database connection
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'database.db')
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = current_services().connection().cursor()
         
         # Get leader's rating and skills
         leader_query = """
@@ -1325,7 +1352,6 @@ def get_team_candidates():
         leader_data = cursor.fetchone()
         
         if not leader_data:
-            conn.close()
             return jsonify({"success": False, "message": "Leader rating not found"}), 404
         
         leader_overall = leader_data[0] or 500
@@ -1348,16 +1374,18 @@ def get_team_candidates():
                 ur.git_score,
                 ur.resume_score,
                 ur.github_link,
-                ur.resume_data,
+                COALESCE(rb.extracted_text, ur.resume_data) as resume_data,
                 GROUP_CONCAT(us.skill_name) as skills
             FROM users u
             JOIN user_ratings ur ON u.user_id = ur.user_id
+            LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
             LEFT JOIN user_skills us ON u.user_id = us.user_id
             WHERE u.user_id != ? 
             AND ur.overall_score BETWEEN ? AND ?
             AND u.is_active = 1
             GROUP BY u.user_id, u.name, u.email, u.bio, u.location, u.experience,
-                     ur.overall_score, ur.git_score, ur.resume_score, ur.github_link, ur.resume_data
+                     ur.overall_score, ur.git_score, ur.resume_score, ur.github_link,
+                     rb.extracted_text, ur.resume_data
         """
         
         cursor.execute(candidates_query, (leader_user_id, min_score, max_score))
@@ -1460,9 +1488,7 @@ def get_team_candidates():
                 for comp_skill in COMPLEMENTARY_SKILLS[leader_skill]:
                     if comp_skill not in leader_skill_set:
                         recommended_skills.add(comp_skill)
-        
-        conn.close()
-        
+
         return jsonify({
             "success": True,
             "candidates": candidates,
@@ -1477,17 +1503,18 @@ def get_team_candidates():
         return jsonify({"success": False, "message": f"Failed to get team candidates: {str(e)}"}), 500
 
 
-@app.route('/api/users/<int:user_id>/resume', methods=['GET'])
+@api.route('/api/users/<int:user_id>/resume', methods=['GET'])
 def get_user_resume(user_id):
     """Get user's resume data"""
     try:
         query = """
-            SELECT resume_data, u.name
+            SELECT COALESCE(rb.extracted_text, ur.resume_data) as resume_data, u.name
             FROM user_ratings ur
             JOIN users u ON ur.user_id = u.user_id
+            LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
             WHERE ur.user_id = ?
         """
-        cursor = db_manager.conn.cursor()
+        cursor = db_manager.connection.cursor()
         cursor.execute(query, (user_id,))
         result = cursor.fetchone()
         
@@ -1547,12 +1574,76 @@ def get_user_resume(user_id):
         print("  GET /api/hackathons - Get all hackathons")
         print("  GET /api/hackathons/<id> - Get hackathon by ID")
         print("  POST /api/rate-profile - Rate user profile with AI")
+        print("  POST /api/rate-profile/upload - Rate user profile from a streamed PDF upload")
         print("  GET /api/user-ratings/<user_id> - Get user's latest rating")
+        print("  GET /api/github-profiles/<username> - Stored GitHub metrics and report")
+        print("  GET /api/github-leaderboard - Top stored GitHub profiles by stars")
         print("  POST /api/team-requests - Create team request")
         print("  GET /api/team-requests/check - Check if user already applied")
         print("  GET /api/team-requests - Get team requests")
+        print("  GET /api/outbound-status - Outbound GitHub/Gemini call status (answering worker only)")
+        print("  POST /api/rate-profile/jobs - Rate a profile in the background")
+        print("  GET /api/rate-profile/jobs/<id>/events - Rating progress (server-sent events)")
+        print("  GET /metrics - Prometheus metrics")
+        print("  GET /api/admin/profiles - Stored request profiles (X-Admin-Secret)")
+        print("  POST /api/admin/resume-blobs/collect - Delete unreferenced resume blobs (X-Admin-Secret)")
+        print("  GET /api/admin/sampler/stacks - Sampled CPU stacks (X-Admin-Secret)")
+        print("  GET /api/admin/traces/<trace_id> - Spans of a traced request (X-Admin-Secret)")
         print("  GET /health - Health check")
         app.run(host='0.0.0.0', port=5000, debug=True)
     else:
         print("❌ Failed to initialize app. Exiting...")
         exit(1)
+
+
+def build_app(config=None):
+    """Flask app with every route and its (not yet started) services; see create_app()."""
+    flask_app = Flask(__name__)
+    flask_app.request_class = UploadRequest
+    flask_app.config.update(DEFAULT_CONFIG)
+    flask_app.config.update(config or {})
+    flask_app.json = FastJSONProvider(flask_app, encoder=flask_app.config.get('JSON_ENCODER'))
+    # Registered first so its after_request hook runs last and times CORS and compression too
+    init_metrics(flask_app)
+    init_tracing(flask_app)
+    init_profiler(flask_app)
+    CORS(flask_app)
+    init_compression(flask_app)
+    flask_app.register_blueprint(api)
+
+    services = AppServices(flask_app.config)
+    flask_app.extensions[EXTENSION_KEY] = services
+    flask_app.teardown_appcontext(services.teardown)
+    return flask_app
+
+
+def create_app(config=None):
+    """
+    Build and start an app with its own database connection, managers and job pool.
+
+    `config` overrides DEFAULT_CONFIG from backend/services.py (DATABASE_PATH,
+    ENABLE_RATING_SERVICE, RATING_JOB_WORKERS, ...). Raises RuntimeError if
+    startup fails; services shut down at interpreter exit or via
+    backend.services.shutdown_app(app).
+    """
+    flask_app = build_app(config)
+    services = flask_app.extensions[EXTENSION_KEY]
+    if not services.startup():
+        raise RuntimeError("Failed to initialize application")
+    atexit.register(services.shutdown)
+    return flask_app
+
+
+# Module-level app for scripts that import `app` and call initialize_app()
+app = build_app()
+
+
+def initialize_app():
+    """Start the services of the module-level `app`; returns False on failure"""
+    services = app.extensions[EXTENSION_KEY]
+    if services.started:
+        return True
+    if not services.startup():
+        return False
+    atexit.register(services.shutdown)
+    return True
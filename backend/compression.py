@@ -0,0 +1,177 @@
+"""
+Response compression negotiated by Accept-Encoding.
+
+init_compression(app) registers an after_request hook that compresses
+responses with the first encoding in COMPRESSION_ALGORITHMS the client
+accepts: zstd and br when the `zstandard` / `brotli` packages are installed,
+gzip always. Only COMPRESSION_MIMETYPES are compressed, and buffered bodies
+only when at least COMPRESSION_MIN_SIZE bytes (small JSON gets bigger and
+costs CPU for nothing).
+
+Streamed responses are compressed chunk by chunk with a flush after each
+chunk, so clients still see data as it is produced. Server-sent events are
+left alone by default (text/event-stream is not in the mimetype list)
+because some proxies buffer compressed event streams.
+
+Settings come from app.config when set there, otherwise from the environment:
+    COMPRESSION_ENABLED        1 / 0
+    COMPRESSION_ALGORITHMS     server preference order, e.g. "zstd,br,gzip"
+    COMPRESSION_MIN_SIZE       bytes
+    COMPRESSION_GZIP_LEVEL     1-9
+    COMPRESSION_BROTLI_QUALITY 0-11
+    COMPRESSION_ZSTD_LEVEL     1-22
+    COMPRESSION_MIMETYPES      comma-separated
+"""
+
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from flask import request
+
+DEFAULT_SETTINGS = {
+    "COMPRESSION_ENABLED": os.getenv('COMPRESSION_ENABLED', '1') != '0',
+    "COMPRESSION_ALGORITHMS": os.getenv('COMPRESSION_ALGORITHMS', 'zstd,br,gzip'),
+    "COMPRESSION_MIN_SIZE": int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+    "COMPRESSION_GZIP_LEVEL": int(os.getenv('COMPRESSION_GZIP_LEVEL', '6')),
+    "COMPRESSION_BROTLI_QUALITY": int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4')),
+    "COMPRESSION_ZSTD_LEVEL": int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3')),
+    "COMPRESSION_MIMETYPES": os.getenv(
+        'COMPRESSION_MIMETYPES',
+        'application/json,text/html,text/plain,text/css,application/javascript,image/svg+xml'),
+}
+
+
+class GzipCodec:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compress(self, data):
+        return zlib.compress(data, self.level, wbits=31)
+
+    def stream(self, chunks):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class BrotliCodec:
+    name = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class ZstdCodec:
+    name = 'zstd'
+
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def stream(self, chunks):
+        compressor = self.compressor.compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def available_codecs(settings):
+    """Codecs by Content-Encoding name, in server preference order, skipping uninstalled ones."""
+    factories = {
+        'gzip': lambda: GzipCodec(settings["COMPRESSION_GZIP_LEVEL"]),
+        'br': (lambda: BrotliCodec(settings["COMPRESSION_BROTLI_QUALITY"])) if brotli else None,
+        'zstd': (lambda: ZstdCodec(settings["COMPRESSION_ZSTD_LEVEL"])) if zstandard else None,
+    }
+    codecs = {}
+    for name in settings["COMPRESSION_ALGORITHMS"].split(','):
+        name = name.strip()
+        if factories.get(name):
+            codecs[name] = factories[name]()
+    return codecs
+
+
+class ResponseCompressor:
+    """after_request hook compressing eligible responses for one app."""
+
+    def __init__(self, settings):
+        self.min_size = settings["COMPRESSION_MIN_SIZE"]
+        self.mimetypes = {mimetype.strip() for mimetype in settings["COMPRESSION_MIMETYPES"].split(',')}
+        self.codecs = available_codecs(settings)
+
+    def negotiate(self):
+        """The preferred codec the client accepts, or None."""
+        accepted = request.accept_encodings
+        for name, codec in self.codecs.items():
+            if accepted[name] > 0:
+                return codec
+        return None
+
+    def __call__(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.mimetype not in self.mimetypes
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+
+        streamed = response.is_streamed
+        if not streamed:
+            if response.direct_passthrough or response.calculate_content_length() < self.min_size:
+                return response
+        response.vary.add('Accept-Encoding')
+
+        codec = self.negotiate()
+        if codec is None:
+            return response
+
+        if streamed:
+            response.response = codec.stream(response.iter_encoded())
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(codec.compress(response.get_data()))
+        response.headers['Content-Encoding'] = codec.name
+
+        # Weak ETags already mean "same content in any encoding"; strong ones must differ per encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f"{etag}-{codec.name}")
+        return response
+
+
+def init_compression(app):
+    """Register response compression on `app` unless COMPRESSION_ENABLED is off."""
+    settings = {key: app.config.get(key, default) for key, default in DEFAULT_SETTINGS.items()}
+    if not settings["COMPRESSION_ENABLED"]:
+        return None
+    compressor = ResponseCompressor(settings)
+    app.after_request(compressor)
+    return compressor
@@ -4,16 +4,22 @@ import json
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timezone
 import os
+import threading
 from pathlib import Path
 
+from backend.metrics import connection_factory
+
+# Unreferenced resume blobs younger than this are kept by garbage_collect()
+RESUME_BLOB_GC_MIN_AGE = int(os.getenv('RESUME_BLOB_GC_MIN_AGE', '3600'))
+
 class DatabaseManager:
     """Enhanced database manager with extensible architecture for future features"""
     
     def __init__(self, db_path: str = None):
         if db_path is None:
-            # Use relative path from the project root
+            # DATABASE_PATH, or the relative path from the project root
             project_root = Path(__file__).parent.parent
-            self.db_path = str(project_root / "database" / "database.db")
+            self.db_path = os.getenv('DATABASE_PATH', str(project_root / "database" / "database.db"))
         else:
             self.db_path = db_path
         self.connection = None
@@ -24,7 +30,8 @@ class DatabaseManager:
             # Ensure database directory exists
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False,
+                                              factory=connection_factory())
             self.connection.row_factory = sqlite3.Row  # Enable dict-like access
             self.connection.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
             return True
@@ -50,12 +57,36 @@ class DatabaseManager:
             # Execute the entire schema
             self.connection.executescript(schema_sql)
             self.connection.commit()
+            self.apply_migrations()
             print("✅ Database tables initialized successfully")
             return True
         except Exception as e:
             print(f"❌ Error initializing tables: {e}")
             return False
 
+    # Columns added to existing tables after they were first created:
+    # (table, column, migration file in sql/)
+    MIGRATIONS = [
+        ("user_ratings", "resume_hash", "add_resume_hash.sql"),
+    ]
+
+    def _table_columns(self, table: str) -> List[str]:
+        """Get the column names of a table (empty if the table does not exist)"""
+        cursor = self.connection.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+
+    def apply_migrations(self):
+        """Apply pending column migrations; each runs once, when its column is missing"""
+        sql_dir = Path(__file__).parent.parent / "sql"
+        for table, column, migration_file in self.MIGRATIONS:
+            columns = self._table_columns(table)
+            if not columns or column in columns:
+                continue
+            with open(sql_dir / migration_file, "r") as f:
+                self.connection.executescript(f.read())
+            self.connection.commit()
+            print(f"✅ Applied migration {migration_file}")
+
 class UserManager:
     """Enhanced user management with future extensibility"""
     
@@ -423,6 +454,201 @@ class SkillManager:
         except Exception as e:
             return {"success": False, "message": f"Failed to get skills: {str(e)}"}
 
+class ResumeBlobManager:
+    """Store extracted resume text once per distinct PDF, keyed by SHA-256 of its bytes"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+
+    @staticmethod
+    def hash_pdf(pdf_bytes: bytes) -> str:
+        """Content hash used as the resume_blobs key"""
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def get_text(self, resume_hash: str) -> Optional[str]:
+        """Get previously extracted text for a resume hash, if stored"""
+        cursor = self.db.connection.execute(
+            "SELECT extracted_text FROM resume_blobs WHERE resume_hash = ?",
+            (resume_hash,)
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def store(self, resume_hash: str, extracted_text: str, byte_size: Optional[int] = None):
+        """Store extracted text for a resume hash (no-op if it already exists)"""
+        self.db.connection.execute(
+            """INSERT OR IGNORE INTO resume_blobs (resume_hash, extracted_text, byte_size)
+               VALUES (?, ?, ?)""",
+            (resume_hash, extracted_text, byte_size)
+        )
+        self.db.connection.commit()
+
+    def get_or_extract(self, resume_hash: str, read_pdf, extract) -> Dict[str, Any]:
+        """
+        Return the text for a resume hash, reading and extracting the PDF only on a miss.
+
+        `read_pdf()` returns the PDF bytes; `extract(pdf_bytes)` should raise on
+        failure so that failed extractions are never stored.
+        """
+        text = self.get_text(resume_hash)
+        if text is not None:
+            return {"resume_hash": resume_hash, "text": text, "reused": True}
+
+        pdf_bytes = read_pdf()
+        text = extract(pdf_bytes)
+        self.store(resume_hash, text, len(pdf_bytes))
+        return {"resume_hash": resume_hash, "text": text, "reused": False}
+
+    def release(self, resume_hash: Optional[str]) -> bool:
+        """Delete a blob once no user_ratings row references it"""
+        if not resume_hash:
+            return False
+        cursor = self.db.connection.execute(
+            """DELETE FROM resume_blobs
+               WHERE resume_hash = ?
+               AND NOT EXISTS (SELECT 1 FROM user_ratings WHERE resume_hash = ?)""",
+            (resume_hash, resume_hash)
+        )
+        self.db.connection.commit()
+        return cursor.rowcount > 0
+
+    def garbage_collect(self, min_age_seconds: Optional[int] = None) -> int:
+        """
+        Remove blobs that are no longer referenced; returns the number deleted.
+
+        get_or_extract() stores a blob before the rating that references it is
+        written, so blobs younger than `min_age_seconds` (default
+        RESUME_BLOB_GC_MIN_AGE) are kept: they may belong to a rating in progress.
+        """
+        min_age_seconds = RESUME_BLOB_GC_MIN_AGE if min_age_seconds is None else min_age_seconds
+        try:
+            cursor = self.db.connection.execute(
+                """DELETE FROM resume_blobs
+                   WHERE created_at < datetime('now', ?)
+                   AND resume_hash NOT IN (
+                       SELECT resume_hash FROM user_ratings WHERE resume_hash IS NOT NULL
+                   )""",
+                (f"-{int(min_age_seconds)} seconds",)
+            )
+            self.db.connection.commit()
+            return cursor.rowcount
+        except Exception as e:
+            print(f"Failed to garbage collect resume blobs: {e}")
+            return 0
+
+
+class GithubProfileManager:
+    """Store scraped GitHub profiles as rows so metrics can be queried without re-scraping"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        # Callers scrape in worker threads that share one connection; keep each replace atomic
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_username(username: str) -> str:
+        """Lowercased username from a username or profile URL"""
+        username = username.strip().rstrip('/')
+        for prefix in ('https://github.com/', 'http://github.com/', 'github.com/'):
+            if username.startswith(prefix):
+                username = username[len(prefix):]
+        return username.lower()
+
+    def store(self, username: str, github_data: Dict[str, Any]):
+        """Replace the stored profile and pinned repositories with a fresh scrape (GithubScraper format)"""
+        username = self.normalize_username(username)
+        profile_info = github_data.get('profileInfo') or {}
+        contrib_stats = github_data.get('contributionStats') or {}
+        if 'totalContributionsInLastYear' in contrib_stats:
+            contributions, contribution_type = contrib_stats['totalContributionsInLastYear'], 'contributions'
+        else:
+            contributions, contribution_type = contrib_stats.get('totalContributionDaysInLastYear', 0), 'active_days'
+        # The scraper reports "Could not load" when the contribution calendar is missing
+        try:
+            contributions = int(contributions or 0)
+        except (TypeError, ValueError):
+            contributions = 0
+        repos = github_data.get('analyzedRepositories') or []
+
+        with self._lock, self.db.connection:
+            self.db.connection.execute(
+                """INSERT INTO github_profiles
+                   (username, full_name, bio, contributions, contribution_type, total_stars, scraped_at)
+                   VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+                   ON CONFLICT(username) DO UPDATE SET
+                       full_name = excluded.full_name, bio = excluded.bio,
+                       contributions = excluded.contributions, contribution_type = excluded.contribution_type,
+                       total_stars = excluded.total_stars, scraped_at = excluded.scraped_at""",
+                (username, profile_info.get('fullName'), profile_info.get('bio'), contributions,
+                 contribution_type, sum(repo.get('stars', 0) for repo in repos))
+            )
+            self.db.connection.execute("DELETE FROM github_repos WHERE username = ?", (username,))
+            self.db.connection.executemany(
+                """INSERT OR IGNORE INTO github_repos
+                   (username, position, name, url, description, primary_language, stars,
+                    readme_exists, readme_length, has_license)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(username, position, repo.get('name'), repo.get('url'), repo.get('description'),
+                  repo.get('primaryLanguage'), repo.get('stars', 0),
+                  bool((repo.get('readme') or {}).get('exists')), (repo.get('readme') or {}).get('contentLength', 0),
+                  bool((repo.get('qualityFlags') or {}).get('hasLicense')))
+                 for position, repo in enumerate(repos)]
+            )
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Stored profile in GithubScraper format (plus username and scrapedAt), or None"""
+        username = self.normalize_username(username)
+        profile = self.db.connection.execute(
+            "SELECT * FROM github_profiles WHERE username = ?", (username,)
+        ).fetchone()
+        if not profile:
+            return None
+        repos = self.db.connection.execute(
+            "SELECT * FROM github_repos WHERE username = ? ORDER BY position", (username,)
+        ).fetchall()
+        contribution_key = ('totalContributionsInLastYear' if profile['contribution_type'] == 'contributions'
+                            else 'totalContributionDaysInLastYear')
+        return {
+            "username": username,
+            "scrapedAt": profile['scraped_at'],
+            "profileInfo": {"fullName": profile['full_name'], "bio": profile['bio']},
+            "contributionStats": {contribution_key: profile['contributions']},
+            "analyzedRepositories": [{
+                "name": repo['name'],
+                "url": repo['url'],
+                "description": repo['description'],
+                "primaryLanguage": repo['primary_language'],
+                "stars": repo['stars'],
+                "readme": {"exists": bool(repo['readme_exists']), "contentLength": repo['readme_length']},
+                "qualityFlags": {"hasLicense": bool(repo['has_license'])}
+            } for repo in repos]
+        }
+
+    def top_profiles(self, limit: int = 10, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Profiles ranked by stars (optionally only those with a pinned repo in `language`)"""
+        if language:
+            cursor = self.db.connection.execute(
+                """SELECT p.username, p.full_name, p.contributions, p.total_stars,
+                          SUM(r.stars) AS language_stars
+                   FROM github_repos r
+                   JOIN github_profiles p ON p.username = r.username
+                   WHERE r.primary_language = ?
+                   GROUP BY p.username
+                   ORDER BY language_stars DESC, p.contributions DESC
+                   LIMIT ?""",
+                (language, limit)
+            )
+        else:
+            cursor = self.db.connection.execute(
+                """SELECT username, full_name, contributions, total_stars
+                   FROM github_profiles
+                   ORDER BY total_stars DESC, contributions DESC
+                   LIMIT ?""",
+                (limit,)
+            )
+        return [dict(row) for row in cursor.fetchall()]
+
+
 class TeamManager:
     """Manage teams and team operations"""
     
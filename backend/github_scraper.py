@@ -0,0 +1,441 @@
+"""
+GitHub profile scraping and highlight reports for the rating pipeline.
+
+All page fetches go through the shared "github" outbound destination
+(rate limit, concurrency cap, retries and circuit breaker).
+"""
+
+import functools
+import os
+import re
+
+from backend.outbound import OutboundError, http_get, http_request
+from backend.tracing import traced
+
+GITHUB_BASE_URL = os.getenv('GITHUB_BASE_URL', 'https://github.com').rstrip('/')
+GITHUB_RAW_BASE_URL = os.getenv('GITHUB_RAW_BASE_URL', 'https://raw.githubusercontent.com').rstrip('/')
+
+# Candidate file names probed on the repository's default branch, most common first;
+# repositories using other names are resolved from the repo page
+README_FILENAMES = ('README.md', 'README', 'README.rst', 'readme.md', 'README.txt')
+LICENSE_FILENAMES = ('LICENSE', 'LICENSE.md', 'LICENSE.txt', 'COPYING')
+
+
+def parse_github_number(text):
+    """Convert GitHub count notation like '1,204', '16.7k' or '1.2m' to an integer"""
+    try:
+        text = text.strip().replace(',', '').lower()
+        if text.endswith('k'):
+            return int(float(text[:-1]) * 1000)
+        if text.endswith('m'):
+            return int(float(text[:-1]) * 1000000)
+        return int(text)
+    except ValueError:
+        return 0
+
+
+def _has_class(attrs, class_name):
+    return class_name in (attrs.get('class') or '').split()
+
+
+def _profile_page_elements(name, attrs):
+    """Top-level elements the profile extractors read: pinned container, name/bio, contribution markers."""
+    return (
+        (name == 'div' and (_has_class(attrs, 'js-pinned-items-reorder-container') or _has_class(attrs, 'user-profile-bio')))
+        or (name == 'span' and attrs.get('itemprop') == 'name')
+        or (name == 'include-fragment' and '/contributions' in (attrs.get('src') or ''))
+        or (name == 'rect' and _has_class(attrs, 'ContributionCalendar-day'))
+    )
+
+
+def _contributions_page_elements(name, attrs):
+    """Contribution header and calendar cells."""
+    return (name == 'h2' and _has_class(attrs, 'f4')) or (name == 'rect' and _has_class(attrs, 'ContributionCalendar-day'))
+
+
+# Links to the top-level README and license files on a repository page (any spelling or extension)
+README_LINK_RE = re.compile(r'/blob/[^/]+/(readme[^/]*)$', re.IGNORECASE)
+LICENSE_LINK_RE = re.compile(r'/blob/[^/]+/(LICENSE|LICENCE|COPYING)', re.IGNORECASE)
+
+
+def _repo_page_elements(name, attrs):
+    """README container and README/license links (the files README_LINK_RE and LICENSE_LINK_RE match)."""
+    if name == 'a':
+        href = (attrs.get('href') or '').lower()
+        return any(word in href for word in ('readme', 'license', 'licence', 'copying'))
+    return name == 'div' and attrs.get('id') == 'readme'
+
+
+@functools.lru_cache(maxsize=None)
+def _strainer(elements):
+    """SoupStrainer for an element filter; bs4 is imported on first parse, not with the module."""
+    from bs4 import SoupStrainer
+    return SoupStrainer(elements)
+
+
+class GithubScraper:
+    """
+    Scrapes a GitHub profile to extract data for technical evaluation based on raw HTML.
+    This version is improved to handle asynchronously loaded content like the contribution graph.
+    """
+
+    def __init__(self, username, partial_parsing=None, repo_probe=None):
+        self.username = username
+        # Build only the elements the extractors read (GITHUB_PARTIAL_PARSE=0 parses full pages)
+        if partial_parsing is None:
+            partial_parsing = os.getenv('GITHUB_PARTIAL_PARSE', '1') != '0'
+        self.partial_parsing = partial_parsing
+        # 'raw': HEAD-probe README/LICENSE on raw.githubusercontent.com; 'page': download the repo page
+        self.repo_probe = repo_probe or os.getenv('GITHUB_REPO_PROBE', 'raw')
+        self.transfer_stats = {"requests": 0, "bytes": 0}
+        self.base_url = f"{GITHUB_BASE_URL}/{username}"
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+
+    def _get_soup(self, url, elements=None):
+        """Fetches and parses HTML content from a URL, limited to `elements` when partial parsing is on."""
+        import requests
+        try:
+            response = http_get('github', url, headers=self.headers)
+            self._record_transfer(response)
+            return self._parse(response.text, elements)
+        except (requests.exceptions.RequestException, OutboundError) as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    def _record_transfer(self, response):
+        """Count the bytes a response cost on the wire (headers + body as sent)."""
+        header_bytes = sum(len(key) + len(value) + 4 for key, value in response.headers.items())
+        if response.request.method == 'HEAD':
+            body_bytes = 0
+        else:
+            body_bytes = int(response.headers.get('Content-Length') or len(response.content))
+        self.transfer_stats["requests"] += 1
+        self.transfer_stats["bytes"] += header_bytes + body_bytes
+
+    def _parse(self, html, elements=None):
+        """
+        Parse HTML, building only the elements accepted by the `elements` filter when partial parsing is enabled.
+
+        html.parser still tokenizes the whole page, but only those subtrees are built.
+        """
+        from bs4 import BeautifulSoup
+        if self.partial_parsing and elements is not None:
+            return BeautifulSoup(html, 'html.parser', parse_only=_strainer(elements))
+        return BeautifulSoup(html, 'html.parser')
+
+    @traced('github.scrape')
+    def scrape_profile(self):
+        """Main method to orchestrate the scraping process."""
+        print(f"Starting scrape for user: {self.username}...")
+        main_page_soup = self._get_soup(self.base_url, _profile_page_elements)
+        if not main_page_soup:
+            return None
+
+        profile_info = self._extract_profile_info(main_page_soup)
+
+        # Asynchronously loaded contribution data
+        contribution_stats = self._extract_contribution_stats(main_page_soup)
+
+        pinned_repos_data = self._extract_pinned_repos(main_page_soup)
+
+        analyzed_repositories = []
+        if pinned_repos_data:
+            print(
+                f"Found {len(pinned_repos_data)} pinned repositories. Analyzing each...")
+            for repo in pinned_repos_data:
+                repo_details = self._scrape_repo_details(repo['url'])
+                if repo_details:
+                    repo.update(repo_details)
+                    analyzed_repositories.append(repo)
+
+        print(f"Scraping complete ({self.transfer_stats['requests']} requests, "
+              f"{self.transfer_stats['bytes'] / 1024:.1f} KB transferred).")
+        return {
+            "profileInfo": profile_info,
+            "contributionStats": contribution_stats,
+            "analyzedRepositories": analyzed_repositories
+        }
+
+    def _extract_profile_info(self, soup):
+        """Extracts user's full name and bio using more stable selectors."""
+        name_tag = soup.find('span', itemprop='name')
+        bio_tag = soup.find('div', class_='user-profile-bio')
+        return {
+            "fullName": name_tag.get_text(strip=True) if name_tag else "N/A",
+            "bio": bio_tag.get_text(strip=True) if bio_tag else "N/A"
+        }
+
+    def _extract_contribution_stats(self, soup):
+        """
+        Finds the include-fragment for the contribution graph and scrapes it.
+        This is more reliable as the graph is loaded asynchronously.
+        """
+        # The main page has a placeholder that loads the contribution graph
+        contrib_fragment = soup.find(
+            'include-fragment', src=re.compile(r'/users/.*/contributions'))
+        if not contrib_fragment:
+            # Fallback for older page structures
+            day_rects_main = soup.find_all(
+                'rect', class_='ContributionCalendar-day')
+            if day_rects_main:
+                active_days = sum(1 for day in day_rects_main if day.get(
+                    'data-level') and int(day['data-level']) > 0)
+                return {"totalContributionDaysInLastYear": active_days}
+            return {"totalContributionDaysInLastYear": "Could not load"}
+
+        contributions_url = f"{GITHUB_BASE_URL}{contrib_fragment['src']}"
+        contrib_soup = self._get_soup(contributions_url, _contributions_page_elements)
+        if not contrib_soup:
+            return {"totalContributionDaysInLastYear": "Could not load"}
+
+        # Extract the total from the text, e.g., "53 contributions in the last year"
+        h2_text = contrib_soup.find('h2', class_='f4').get_text(
+            strip=True) if contrib_soup.find('h2', class_='f4') else ''
+        match = re.search(r'(\d+,\d+|\d+)\s+contributions', h2_text)
+        if match:
+            total_contributions = int(match.group(1).replace(',', ''))
+            return {"totalContributionsInLastYear": total_contributions}
+
+        # Fallback to counting days if the total isn't found
+        day_rects = contrib_soup.find_all(
+            'rect', class_='ContributionCalendar-day')
+        active_days = sum(1 for day in day_rects if day.get(
+            'data-level') and int(day['data-level']) > 0)
+        return {"totalContributionDaysInLastYear": active_days}
+
+    def _extract_pinned_repos(self, soup):
+        """Extracts basic info from pinned repositories."""
+        pinned_section = soup.find(
+            'div', class_='js-pinned-items-reorder-container')
+        if not pinned_section:
+            return []
+
+        repos = []
+        # The selector for pinned items is more reliable targeting the Box element
+        pinned_items = pinned_section.find_all('div', class_='Box')
+        for item in pinned_items:
+            repo_link = item.find(
+                'a', {'data-view-component': 'true'}, href=True)
+            if not repo_link or not repo_link.find('span', class_='repo'):
+                continue
+
+            repo_url = f"{GITHUB_BASE_URL}{repo_link['href']}"
+            name = repo_link.find('span', class_='repo').get_text(strip=True)
+            desc_tag = item.find('p', class_='pinned-item-desc')
+            lang_tag = item.find('span', itemprop='programmingLanguage')
+            star_tag = item.find('a', href=f"{repo_link['href']}/stargazers")
+            
+            # Parse star count, handling 'k'/'m' notation
+            stars = parse_github_number(star_tag.get_text(strip=True)) if star_tag else 0
+
+            repos.append({
+                "name": name,
+                "url": repo_url,
+                "description": desc_tag.get_text(strip=True) if desc_tag else "N/A",
+                "primaryLanguage": lang_tag.get_text(strip=True) if lang_tag else "N/A",
+                "stars": stars
+            })
+        return repos
+
+    def _scrape_repo_details(self, repo_url):
+        """Gets README/license details, probing raw files first and falling back to the repo page."""
+        if self.repo_probe == 'raw':
+            details = self._probe_repo_files(repo_url)
+            if details is not None:
+                return details
+        return self._scrape_repo_page(repo_url)
+
+    @staticmethod
+    def _repo_path(repo_url):
+        return repo_url[len(GITHUB_BASE_URL):] if repo_url.startswith(GITHUB_BASE_URL) else None
+
+    def _probe_file(self, repo_path, filenames):
+        """
+        HEAD the first existing file among `filenames` on the default branch.
+
+        Returns its size in bytes, 0 if none exist, or None if probing failed.
+        """
+        import requests
+        for filename in filenames:
+            url = f"{GITHUB_RAW_BASE_URL}{repo_path}/HEAD/{filename}"
+            try:
+                response = http_request('github_raw', 'HEAD', url, headers=self.headers, allow_redirects=True)
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    self._record_transfer(e.response)
+                    continue
+                return None
+            except (requests.exceptions.RequestException, OutboundError):
+                return None
+            self._record_transfer(response)
+            return max(1, int(response.headers.get('Content-Length') or 1))
+        return 0
+
+    def _probe_repo_files(self, repo_url):
+        """
+        Determine README presence/size and license with header-only requests.
+
+        `HEAD` resolves to the repository's default branch, so this works for
+        `main`, `master` or anything else. Only the common file names are
+        probed, so finding no README or no license is not conclusive: like a
+        failed probe, it returns None and the caller falls back to the full page.
+        """
+        repo_path = self._repo_path(repo_url)
+        if not repo_path:
+            return None
+        readme_size = self._probe_file(repo_path, README_FILENAMES)
+        if not readme_size:
+            return None
+        license_size = self._probe_file(repo_path, LICENSE_FILENAMES)
+        if not license_size:
+            return None
+        return {
+            "readme": {
+                "exists": readme_size > 0,
+                "contentLength": readme_size
+            },
+            "qualityFlags": {
+                "hasLicense": license_size > 0
+            }
+        }
+
+    def _scrape_repo_page(self, repo_url):
+        """
+        Scrapes detailed information from a single repository page.
+
+        `contentLength` is the README file's size in bytes, as _probe_repo_files
+        reports it: the file linked from the page is HEAD-probed, and only if
+        that fails is the size of the rendered README text used instead.
+        """
+        soup = self._get_soup(repo_url, _repo_page_elements)
+        if not soup:
+            return None
+
+        readme_div = soup.find('div', id='readme')
+        readme_content = readme_div.get_text() if readme_div else None
+        readme_size = 0
+        if readme_content:
+            readme_link = soup.find('a', href=README_LINK_RE)
+            repo_path = self._repo_path(repo_url)
+            if readme_link and repo_path:
+                filename = README_LINK_RE.search(readme_link['href']).group(1)
+                readme_size = self._probe_file(repo_path, (filename,))
+            readme_size = readme_size or len(readme_content.encode('utf-8'))
+
+        # A more reliable way to find the license is to look for a link to a license file
+        license_link = soup.find('a', href=LICENSE_LINK_RE)
+
+        return {
+            "readme": {
+                "exists": bool(readme_content),
+                "contentLength": readme_size
+            },
+            "qualityFlags": {
+                "hasLicense": bool(license_link)
+            }
+        }
+
+
+class HighlightGenerator:
+    """
+    Takes raw scraped GitHub data and formats it into a human-readable
+    highlights report for evaluation.
+    """
+
+    def __init__(self, github_data):
+        self.data = github_data
+
+    @traced('github.report')
+    def generate_report(self):
+        """Creates the full text report."""
+        profile_info = self.data.get('profileInfo', {})
+        username = profile_info.get(
+            'fullName') or self.data.get('username', 'N/A')
+        report_lines = []
+
+        report_lines.append("\n" + "="*50)
+        report_lines.append(f"      GITHUB PROFILE HIGHLIGHTS for {username}")
+        report_lines.append("="*50)
+
+        # Work Ethic & Consistency
+        contrib_stats = self.data.get('contributionStats', {})
+        contributions = contrib_stats.get('totalContributionsInLastYear') or contrib_stats.get(
+            'totalContributionDaysInLastYear', 0)
+        contrib_type = "Total Contributions" if 'totalContributionsInLastYear' in contrib_stats else "Active Days"
+        report_lines.append("\n**1. Work Ethic & Consistency:**")
+        report_lines.append(
+            f"* **Activity (Last Year):** {contributions} ({contrib_type}).")
+
+        # Project Analysis
+        repos = self.data.get('analyzedRepositories', [])
+        report_lines.append("\n**2. Project Details (Pinned Repositories):**")
+
+        total_stars = 0
+        documented_repos_count = 0
+        non_trivial_projects = []
+
+        if not repos:
+            report_lines.append("* No pinned repositories found.")
+        else:
+            for repo in repos:
+                total_stars += repo.get('stars', 0)
+                if repo.get('readme', {}).get('exists'):
+                    documented_repos_count += 1
+                if "solution" not in repo['name'].lower() and "leetcode" not in repo['name'].lower():
+                    non_trivial_projects.append(
+                        f"{repo['name']} ({repo.get('primaryLanguage', 'N/A')})")
+
+                report_lines.append(f"* **{repo.get('name', 'N/A')}:**")
+                report_lines.append(
+                    f"  - **Description:** {repo.get('description', 'N/A')}")
+                report_lines.append(f"  - **Stars:** {repo.get('stars', 0)}")
+                report_lines.append(
+                    f"  - **README:** {'Exists' if repo.get('readme', {}).get('exists') else 'MISSING'}")
+
+        # Key Takeaways for AI Prompt
+        report_lines.append("\n" + "="*50)
+        report_lines.append("      KEY DATA POINTS FOR SCORING")
+        report_lines.append("="*50)
+
+        report_lines.append(f"* **IMPACT (Community Validation):**")
+        report_lines.append(f"  - Total Stars on Pinned Repos: {total_stars}")
+
+        report_lines.append(f"\n* **COMPLEXITY (Project Types):**")
+        if non_trivial_projects:
+            report_lines.append(
+                f"  - Non-trivial projects identified: {', '.join(non_trivial_projects)}")
+        else:
+            report_lines.append(
+                "  - Projects appear to be primarily foundational or solution-based.")
+
+        report_lines.append(f"\n* **DOCUMENTATION (Professionalism):**")
+        report_lines.append(
+            f"  - README files exist for {documented_repos_count} out of {len(repos)} pinned repositories.")
+
+        report_lines.append("\n" + "="*50)
+
+        return "\n".join(report_lines)
+
+
+def analyze_github_profile(github_username):
+    """Scrape a profile; returns (scraped data or None, text report)"""
+    try:
+        scraper = GithubScraper(github_username)
+        github_data = scraper.scrape_profile()
+        
+        if github_data:
+            reporter = HighlightGenerator(github_data)
+            return github_data, reporter.generate_report()
+        return None, "Could not analyze GitHub profile"
+    except Exception as e:
+        print(f"Error analyzing GitHub profile: {e}")
+        return None, f"GitHub analysis failed: {str(e)}"
+
+
+def get_github_score(github_username):
+    """Get GitHub profile analysis for scoring"""
+    return analyze_github_profile(github_username)[1]
@@ -0,0 +1,187 @@
+"""
+Deterministic local ratings from GitHub metrics and resume features.
+
+`heuristic_ratings` returns the same git_rating / resume_rating /
+overall_rating shape as the Gemini prompt, on the same 0-1000 scale, in a
+millisecond or two and without any network access. It is used as an instant
+provisional score while the LLM result is pending and as the stored result
+when Gemini is unavailable or fails, so users never end up with all-zero
+scores that fall outside every team-candidate rating window.
+
+GitHub data may be either the scraper's raw output (profileInfo,
+contributionStats, analyzedRepositories) or RatingService's summary
+(repositories, total_stars).
+"""
+
+import math
+import re
+
+from backend.prompt_budget import split_resume_sections
+
+HEURISTIC_ENGINE = "heuristic"
+
+# Scores are mapped onto [MIN_SCORE, MAX_SCORE] so an empty profile still lands inside rating windows
+MIN_SCORE = 150
+MAX_SCORE = 950
+
+# (weight, saturation point) per GitHub signal
+CONTRIBUTIONS_FULL = 800
+STARS_FULL = 300
+PINNED_REPOS_FULL = 6
+GITHUB_WEIGHTS = {
+    "contributions": 0.35,
+    "stars": 0.20,
+    "pinned_repos": 0.15,
+    "readme_coverage": 0.15,
+    "license_coverage": 0.10,
+    "non_trivial_share": 0.05,
+}
+
+KEY_RESUME_SECTIONS = ("experience", "projects", "skills", "education")
+SKILLS_FULL = 12
+QUANTIFIED_FULL = 8
+# Word counts of a one-to-two page resume score full marks for length
+IDEAL_WORDS = (350, 900)
+RESUME_WEIGHTS = {
+    "section_coverage": 0.35,
+    "skills": 0.30,
+    "length": 0.20,
+    "quantified": 0.15,
+}
+GITHUB_SHARE_OF_OVERALL = 0.5
+
+SKILL_KEYWORDS = (
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "golang", "rust", "kotlin", "swift",
+    "ruby", "php", "scala", "sql", "html", "css", "react", "angular", "vue", "node.js", "express",
+    "django", "flask", "fastapi", "spring", "rails", "next.js", "tensorflow", "pytorch", "scikit-learn",
+    "pandas", "numpy", "docker", "kubernetes", "aws", "azure", "gcp", "linux", "git", "postgresql",
+    "mysql", "mongodb", "redis", "graphql", "rest", "ci/cd", "terraform", "machine learning",
+    "deep learning", "nlp", "computer vision", "android", "ios", "flutter", "firebase",
+)
+_SKILL_RE = re.compile(
+    r'(?<![\w+#.])(' + '|'.join(re.escape(skill) for skill in sorted(SKILL_KEYWORDS, key=len, reverse=True))
+    + r')(?![\w+#])', re.IGNORECASE)
+# Numbers that quantify an achievement: 40%, 3x, 10k, $2M, 1,200 users
+_QUANTIFIED_RE = re.compile(r'(?:\$\s?)?\b\d[\d,.]*\s?(?:%|x\b|k\b|m\b|\+)|\b\d{2,}[\d,]*\b', re.IGNORECASE)
+_WORD_RE = re.compile(r'\w+')
+
+
+def _saturating(value, full):
+    """0..1, logarithmic so the first few stars/contributions count the most."""
+    if not value or value <= 0:
+        return 0.0
+    return min(1.0, math.log1p(value) / math.log1p(full))
+
+
+def _count(value):
+    """A non-negative int from a scraped count; placeholders like "Could not load" count as 0."""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_score(fraction):
+    return int(round(MIN_SCORE + (MAX_SCORE - MIN_SCORE) * max(0.0, min(1.0, fraction))))
+
+
+def github_metrics(github_data):
+    """Structured GitHub signals from scraper output or RatingService's summary."""
+    github_data = github_data or {}
+    repos = [repo for repo in (github_data.get('analyzedRepositories') or github_data.get('repositories') or [])
+             if isinstance(repo, dict)]
+    contrib_stats = github_data.get('contributionStats') or {}
+    contributions = _count(contrib_stats.get('totalContributionsInLastYear')
+                           or contrib_stats.get('totalContributionDaysInLastYear'))
+    names = [(repo.get('name') or '').lower() for repo in repos]
+    return {
+        "contributions": contributions,
+        "pinned_repos": len(repos),
+        "total_stars": sum(_count(repo.get('stars')) for repo in repos) or _count(github_data.get('total_stars')),
+        "documented_repos": sum(1 for repo in repos if (repo.get('readme') or {}).get('exists')),
+        "licensed_repos": sum(1 for repo in repos if (repo.get('qualityFlags') or {}).get('hasLicense')),
+        "non_trivial_repos": sum(1 for name in names if 'solution' not in name and 'leetcode' not in name),
+        "languages": sorted({repo.get('primaryLanguage') for repo in repos
+                             if repo.get('primaryLanguage') and repo.get('primaryLanguage') != 'N/A'}),
+    }
+
+
+def resume_features(resume_text):
+    """Section coverage, skill keywords, length and quantified achievements of a resume."""
+    resume_text = resume_text or ''
+    sections = {name for name, _ in split_resume_sections(resume_text)} if resume_text else set()
+    return {
+        "sections": sorted(sections & set(KEY_RESUME_SECTIONS)),
+        "skills": sorted({match.lower() for match in _SKILL_RE.findall(resume_text)}),
+        "words": len(_WORD_RE.findall(resume_text)),
+        "quantified": len(_QUANTIFIED_RE.findall(resume_text)),
+    }
+
+
+def _length_fraction(words):
+    low, high = IDEAL_WORDS
+    if words < low:
+        return words / low
+    if words > high:
+        return max(0.3, high / words)
+    return 1.0
+
+
+def _git_rating(metrics):
+    repos = metrics["pinned_repos"]
+    parts = {
+        "contributions": _saturating(metrics["contributions"], CONTRIBUTIONS_FULL),
+        "stars": _saturating(metrics["total_stars"], STARS_FULL),
+        "pinned_repos": min(1.0, repos / PINNED_REPOS_FULL),
+        "readme_coverage": metrics["documented_repos"] / repos if repos else 0.0,
+        "license_coverage": metrics["licensed_repos"] / repos if repos else 0.0,
+        "non_trivial_share": metrics["non_trivial_repos"] / repos if repos else 0.0,
+    }
+    score = _to_score(sum(GITHUB_WEIGHTS[name] * value for name, value in parts.items()))
+    languages = ', '.join(metrics["languages"][:4]) or 'no listed languages'
+    reasoning = [
+        f"{metrics['contributions']} contributions in the last year and {metrics['total_stars']} stars "
+        f"across {repos} pinned repositories",
+        f"READMEs on {metrics['documented_repos']}/{repos} and licenses on {metrics['licensed_repos']}/{repos} "
+        f"pinned repositories ({languages})",
+    ]
+    weakest = min(parts, key=parts.get)
+    reasoning.append(f"Weakest signal: {weakest.replace('_', ' ')}")
+    return {"score": score, "reasoning": reasoning}
+
+
+def _resume_rating(features):
+    parts = {
+        "section_coverage": len(features["sections"]) / len(KEY_RESUME_SECTIONS),
+        "skills": min(1.0, len(features["skills"]) / SKILLS_FULL),
+        "length": _length_fraction(features["words"]),
+        "quantified": min(1.0, features["quantified"] / QUANTIFIED_FULL),
+    }
+    score = _to_score(sum(RESUME_WEIGHTS[name] * value for name, value in parts.items()))
+    missing = [name for name in KEY_RESUME_SECTIONS if name not in features["sections"]]
+    reasoning = [
+        f"{len(features['skills'])} recognised skills ({', '.join(features['skills'][:6]) or 'none'})",
+        f"{features['words']} words with {features['quantified']} quantified details",
+        f"Missing sections: {', '.join(missing)}" if missing else "Has experience, projects, skills and education sections",
+    ]
+    return {"score": score, "reasoning": reasoning}
+
+
+def heuristic_ratings(github_data, resume_text):
+    """Ratings in the Gemini JSON shape, computed locally and deterministically."""
+    git_rating = _git_rating(github_metrics(github_data))
+    resume_rating = _resume_rating(resume_features(resume_text))
+    overall = int(round(GITHUB_SHARE_OF_OVERALL * git_rating["score"]
+                        + (1 - GITHUB_SHARE_OF_OVERALL) * resume_rating["score"]))
+    return {
+        "git_rating": git_rating,
+        "resume_rating": resume_rating,
+        "overall_rating": {
+            "score": overall,
+            "reasoning": [
+                f"Weighted {GITHUB_SHARE_OF_OVERALL:.0%} GitHub / {1 - GITHUB_SHARE_OF_OVERALL:.0%} resume",
+                "Provisional score from local heuristics, not an AI assessment",
+            ],
+        },
+        "engine": HEURISTIC_ENGINE,
+    }
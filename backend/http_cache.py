@@ -0,0 +1,134 @@
+"""
+Conditional GET support: ETags, If-None-Match and per-route Cache-Control.
+
+`conditional(policy, tables=...)` wraps a GET view. With `tables`, the ETag
+is derived from the change counters that sqlite triggers keep in
+table_versions (see sql/create_tables.sql) plus the request path and query,
+so a matching If-None-Match is answered with 304 before the view runs any
+query. Without `tables`, the view runs and the ETag is the response's own
+(static_json_response sets one) or a hash of its body.
+
+ETags are weak: they identify the JSON content, whatever Content-Encoding
+it is sent with. Counts of 304s per route are kept in `http_cache_stats`.
+"""
+
+import functools
+import hashlib
+import threading
+
+from flask import current_app, request
+
+from backend.services import current_services
+
+# Cache-Control per kind of data
+CACHE_POLICIES = {
+    # Fixed for the lifetime of the process (logo SVGs)
+    "static": "public, max-age=86400",
+    # Reference data that changes rarely (skill categories)
+    "reference": "public, max-age=300",
+    # Polled lists and details; a short freshness window, then revalidation
+    "polled": "public, max-age=15, must-revalidate",
+    # Changes with user actions (team membership); always revalidate
+    "live": "no-cache",
+}
+
+
+class HttpCacheStats:
+    """Per-route counts of cacheable responses and 304s."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, not_modified, short_circuited=False):
+        with self._lock:
+            counts = self._routes.setdefault(route, {"responses": 0, "not_modified": 0, "short_circuited": 0})
+            counts["responses"] += 1
+            if not_modified:
+                counts["not_modified"] += 1
+            if short_circuited:
+                counts["short_circuited"] += 1
+
+    def summary(self):
+        with self._lock:
+            routes = {route: dict(counts) for route, counts in self._routes.items()}
+        for counts in routes.values():
+            counts["not_modified_ratio"] = round(counts["not_modified"] / counts["responses"], 3)
+        responses = sum(counts["responses"] for counts in routes.values())
+        not_modified = sum(counts["not_modified"] for counts in routes.values())
+        return {
+            "responses": responses,
+            "not_modified": not_modified,
+            "not_modified_ratio": round(not_modified / responses, 3) if responses else 0.0,
+            "routes": routes,
+        }
+
+
+http_cache_stats = HttpCacheStats()
+
+
+def table_versions(connection, tables):
+    """Current change counters of `tables` (0 for a table never written to)."""
+    placeholders = ','.join('?' for _ in tables)
+    rows = connection.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})", tuple(tables)
+    ).fetchall()
+    versions = {row[0]: row[1] for row in rows}
+    return [versions.get(table, 0) for table in tables]
+
+
+def content_etag(body):
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def _versioned_etag(tables):
+    versions = table_versions(current_services().db_manager.connection, tables)
+    key = f"{request.path}?{request.query_string.decode('latin-1')}|" + ','.join(map(str, versions))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def _not_modified(etag, cache_control):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def conditional(policy, tables=None):
+    """
+    Decorator adding ETag/If-None-Match handling and the Cache-Control of `policy` to a GET view.
+
+    `tables` lists every table the response is built from; their version
+    counters make the ETag and let a revalidation skip the view entirely.
+    """
+    cache_control = CACHE_POLICIES[policy]
+    tables = tuple(tables or ())
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = None
+            if tables:
+                etag = _versioned_etag(tables)
+                if request.if_none_match.contains_weak(etag):
+                    http_cache_stats.record(request.url_rule.rule, not_modified=True, short_circuited=True)
+                    return _not_modified(etag, cache_control)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if etag is None:
+                etag, _ = response.get_etag()
+                etag = etag or content_etag(response.get_data())
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            not_modified = request.if_none_match.contains_weak(etag)
+            http_cache_stats.record(request.url_rule.rule, not_modified=not_modified)
+            if not_modified:
+                return _not_modified(etag, cache_control)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,180 @@
+"""
+Incremental parsing of a streamed ratings JSON object.
+
+Gemini streams its answer in arbitrary chunks. RatingsStreamParser scans the
+text as it arrives and hands back each top-level member whose object value
+has just closed, e.g. ("git_rating", {"score": 628, "reasoning": [...]}),
+so callers can use the first score long before the response is complete.
+Anything that cannot be the start of the expected object (prose, a JSON
+array, a bad member) raises MalformedStreamError straight away, so a bad
+generation can be abandoned early instead of after the last token.
+"""
+
+import json
+
+# Longest response we are willing to buffer before giving up
+MAX_STREAM_CHARS = 50000
+
+_WHITESPACE = ' \t\r\n'
+
+
+class MalformedStreamError(ValueError):
+    """The streamed text cannot be the ratings JSON object."""
+
+
+class RatingsStreamParser:
+    """Feed it chunks; it returns (key, object_value) pairs as each top-level object member closes."""
+
+    def __init__(self, max_chars=MAX_STREAM_CHARS):
+        self.max_chars = max_chars
+        self.buffer = ''
+        self.members = {}
+        self.done = False
+        self._pos = 0
+        self._state = 'preamble'
+        self._key_start = 0
+        self._key = None
+        self._value_start = 0
+        self._nesting = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk):
+        """Consume more text; returns the members completed by it."""
+        self.buffer += chunk
+        if len(self.buffer) > self.max_chars:
+            raise MalformedStreamError(f"Response exceeded {self.max_chars} characters without completing")
+        completed = []
+        while self._pos < len(self.buffer) and not self.done:
+            member = self._step(self.buffer[self._pos])
+            self._pos += 1
+            if member:
+                completed.append(member)
+        return completed
+
+    def _fail(self, message):
+        context = self.buffer[max(0, self._pos - 20):self._pos + 20]
+        raise MalformedStreamError(f"{message} at offset {self._pos} (near {context!r})")
+
+    def _step(self, char):
+        state = self._state
+
+        if state == 'preamble':
+            # Allow whitespace and a ```json fence before the object
+            if char in _WHITESPACE:
+                return None
+            if char == '`':
+                self._state = 'fence'
+                return None
+            if char == '{':
+                self._state = 'expect_key'
+                return None
+            self._fail("Expected '{'")
+
+        if state == 'fence':
+            if char == '\n':
+                self._state = 'preamble'
+            elif char not in '`json \t\r':
+                self._fail("Unexpected text in code fence")
+            return None
+
+        if state in ('in_key', 'in_value') and (self._in_string or char == '"'):
+            return self._scan_string(char)
+
+        if state == 'expect_key':
+            if char in _WHITESPACE:
+                return None
+            if char == '"':
+                self._state = 'in_key'
+                self._key_start = self._pos
+                self._in_string = True
+                return None
+            if char == '}' and not self.members:
+                self.done = True
+                return None
+            self._fail("Expected a member name")
+
+        if state == 'expect_colon':
+            if char in _WHITESPACE:
+                return None
+            if char == ':':
+                self._state = 'expect_value'
+                return None
+            self._fail("Expected ':'")
+
+        if state == 'expect_value':
+            if char in _WHITESPACE:
+                return None
+            self._state = 'in_value'
+            self._value_start = self._pos
+            self._nesting = 0
+            if char == '"':
+                self._in_string = True
+                return None
+            return self._scan_value(char)
+
+        if state == 'in_value':
+            return self._scan_value(char)
+
+        if state == 'expect_comma_or_end':
+            if char in _WHITESPACE:
+                return None
+            if char == ',':
+                self._state = 'expect_key'
+                return None
+            if char == '}':
+                self.done = True
+                return None
+            self._fail("Expected ',' or '}'")
+
+        return None
+
+    def _scan_string(self, char):
+        if not self._in_string:
+            # Opening quote of a string inside a value
+            self._in_string = True
+            return None
+        if self._escaped:
+            self._escaped = False
+        elif char == '\\':
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if self._state == 'in_key':
+                try:
+                    self._key = json.loads(self.buffer[self._key_start:self._pos + 1])
+                except json.JSONDecodeError:
+                    self._fail("Invalid member name")
+                self._state = 'expect_colon'
+        return None
+
+    def _scan_value(self, char):
+        if char in '{[':
+            self._nesting += 1
+            return None
+        if char in '}]':
+            if self._nesting == 0:
+                # End of a scalar value followed directly by the closing brace
+                self._state = 'expect_comma_or_end'
+                self._pos -= 1
+                return None
+            self._nesting -= 1
+            if self._nesting == 0:
+                return self._finish_value(self._pos + 1)
+            return None
+        if char == ',' and self._nesting == 0:
+            # Scalar members are allowed but not reported
+            self._state = 'expect_key'
+        return None
+
+    def _finish_value(self, end):
+        text = self.buffer[self._value_start:end]
+        self._state = 'expect_comma_or_end'
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            self._fail(f"Invalid value for {self._key!r}: {e.msg}")
+        if not isinstance(value, dict):
+            return None
+        self.members[self._key] = value
+        return self._key, value
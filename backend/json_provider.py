@@ -0,0 +1,122 @@
+"""
+Fast JSON encoding for Flask responses and request bodies.
+
+FastJSONProvider replaces Flask's default provider. It encodes with orjson
+when it is installed (JSON_ENCODER=auto or orjson) and with the stdlib json
+module otherwise (or with JSON_ENCODER=stdlib), and keeps Flask's behaviour:
+sorted keys, pretty output in debug mode and a trailing newline.
+
+Both encoders handle sqlite3.Row (as a dict) and datetime/date/time (ISO
+8601) natively, so routes can return rows without copying them into dicts.
+Anything orjson cannot encode (ints over 64 bits, unknown types) falls back
+to the stdlib path instead of failing the request.
+
+static_json_response() serves payloads that never change after startup
+from bytes encoded once per app.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import date, datetime, time
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto').lower()
+
+
+def _default(obj):
+    """Types neither encoder knows: sqlite rows and temporal values, then Flask's own fallbacks."""
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when available, stdlib json otherwise."""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app, encoder=None):
+        super().__init__(app)
+        encoder = (encoder or JSON_ENCODER).lower()
+        if encoder == 'orjson' and orjson is None:
+            print("⚠️ JSON_ENCODER=orjson but orjson is not installed; using the stdlib encoder")
+        self.use_orjson = orjson is not None and encoder in ('auto', 'orjson')
+        self.encoder_name = 'orjson' if self.use_orjson else 'stdlib'
+
+    def dumps_bytes(self, obj, pretty=False):
+        """Encode `obj` to UTF-8 JSON bytes."""
+        if self.use_orjson:
+            option = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=_default, option=option)
+            except TypeError:
+                pass
+        return self._stdlib_dumps(obj, pretty).encode('utf-8')
+
+    def _stdlib_dumps(self, obj, pretty=False):
+        kwargs = {"default": _default, "ensure_ascii": self.ensure_ascii, "sort_keys": self.sort_keys}
+        if pretty:
+            kwargs["indent"] = 2
+        else:
+            kwargs["separators"] = (",", ":")
+        return json.dumps(obj, **kwargs)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or not self.use_orjson:
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def _pretty(self):
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj, pretty=self._pretty()) + b"\n",
+                                        mimetype=self.mimetype)
+
+
+def static_json_response(key, build, status=200):
+    """
+    Response for a payload that is fixed for the app's lifetime, encoded on first use.
+
+    `build()` returns the payload; its encoded bytes and a weak ETag (hash of
+    the bytes) are cached per app under `key`.
+    """
+    cache = current_app.extensions.setdefault('static_json', {})
+    cached = cache.get(key)
+    if cached is None:
+        provider = current_app.json
+        if isinstance(provider, FastJSONProvider):
+            body = provider.dumps_bytes(build(), pretty=provider._pretty()) + b"\n"
+        else:
+            body = (provider.dumps(build()) + "\n").encode('utf-8')
+        cached = cache[key] = (body, hashlib.sha1(body).hexdigest()[:20])
+    body, etag = cached
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,527 @@
+"""
+Prometheus metrics for the API, served in text format at /metrics.
+
+Recording is lock-free on the hot path: every thread writes only to its own
+shard (found through a threading.local), and a scrape merges the shards.
+Shards of threads that have exited are folded into a single retired shard,
+so counters stay monotonic when the dev server or a worker pool replaces
+its threads.
+
+What is recorded:
+    http_requests_total{method,route,status}     counter, per request
+    http_request_duration_seconds{method,route}  histogram, until the response is built
+    http_request_db_seconds{route}               histogram, sqlite time spent by the request
+    http_requests_in_flight                      gauge
+    db_operations_total, db_time_seconds_total   every timed sqlite call, including background jobs
+    outbound_call_duration_seconds{destination}  histogram, one observation per attempt
+And, read from the existing stats objects when scraped:
+    outbound_calls_total{destination,result}, outbound_in_flight, outbound_queue_depth,
+    outbound_breaker_open, http_cache_responses_total, http_cache_not_modified_total
+
+Routes are labelled by their URL rule (/api/teams/<int:team_id>), never the
+raw path, and unmatched requests share route="unmatched".
+
+Database time comes from TimedConnection/TimedCursor, which DatabaseManager
+passes to sqlite3.connect as its connection factory.
+
+Several worker processes (the prefork server) share one /metrics: with
+METRICS_MULTIPROC_DIR set (the prefork master sets it to a fresh directory)
+every worker writes a JSON snapshot of its metrics there every
+METRICS_SYNC_SECONDS and when it exits, and the worker answering a scrape
+merges all snapshots. Counters and histograms are summed over every worker
+that ever ran, so they stay monotonic across recycling and reloads; the
+snapshots of exited workers are folded into retired.json. Gauges are summed
+over live workers only (outbound_breaker_open takes the maximum and
+process_start_time_seconds the oldest). Other workers' numbers can be up to
+METRICS_SYNC_SECONDS old.
+
+METRICS_ENABLED=0 turns off the request hooks and the sqlite timing.
+"""
+
+import bisect
+import json
+import operator
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+METRICS_SYNC_SECONDS = float(os.getenv('METRICS_SYNC_SECONDS', '5'))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by route and status.", None),
+    "http_request_duration_seconds": ("histogram", "Time to build the response, by route.", LATENCY_BUCKETS),
+    "http_request_db_seconds": ("histogram", "sqlite time spent while handling a request, by route.", DB_BUCKETS),
+    "http_requests_in_flight": ("gauge", "Requests being handled.", None),
+    "db_operations_total": ("counter", "Timed sqlite calls (execute, fetch, commit).", None),
+    "db_time_seconds_total": ("counter", "Seconds spent in timed sqlite calls.", None),
+    "outbound_call_duration_seconds": ("histogram", "Duration of each GitHub/Gemini call attempt.", LATENCY_BUCKETS),
+}
+
+
+class _Shard:
+    """Values written by a single thread."""
+
+    __slots__ = ('thread', 'values', 'histograms', 'db_seconds', 'db_operations')
+
+    def __init__(self, thread):
+        self.thread = thread
+        # (name, labels) -> number, for counters and gauges
+        self.values = {}
+        # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+        self.histograms = {}
+        # Running sqlite totals, also read per request for http_request_db_seconds
+        self.db_seconds = 0.0
+        self.db_operations = 0
+
+    def merge(self, values, histograms):
+        for key, value in (("db_operations_total", self.db_operations), ("db_time_seconds_total", self.db_seconds)):
+            values[(key, ())] = values.get((key, ()), 0) + value
+        for key, value in self.values.copy().items():
+            values[key] = values.get(key, 0) + value
+        for key, histogram in self.histograms.copy().items():
+            histogram = list(histogram)
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = histogram
+            else:
+                for i, value in enumerate(histogram):
+                    merged[i] += value
+
+
+class MetricsRegistry:
+    """Per-thread metric shards, merged when scraped."""
+
+    # Fold exited threads' shards once this many are registered
+    MAX_SHARDS = 64
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(None)
+        self.started_at = time.time()
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+                if len(self._shards) > self.MAX_SHARDS:
+                    self._fold_exited()
+            return shard
+
+    def _fold_exited(self):
+        alive = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                alive.append(shard)
+            else:
+                shard.merge(self._retired.values, self._retired.histograms)
+        self._shards = alive
+
+    def inc(self, name, labels=(), value=1):
+        values = self.shard().values
+        key = (name, labels)
+        values[key] = values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        histograms = self.shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        buckets = METRICS[name][2]
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(buckets) + 2)
+        histogram[bisect.bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+
+    def observe_db(self, seconds):
+        shard = self.shard()
+        shard.db_seconds += seconds
+        shard.db_operations += 1
+
+    def collect(self):
+        """Merged (values, histograms) of every shard."""
+        with self._lock:
+            self._fold_exited()
+            shards = list(self._shards)
+            values = {}
+            histograms = {}
+            self._retired.merge(values, histograms)
+        for shard in shards:
+            shard.merge(values, histograms)
+        return values, histograms
+
+
+metrics = MetricsRegistry()
+
+
+def multiprocess_dir():
+    """Directory shared by the worker processes' snapshots, or None for a single process."""
+    return os.getenv('METRICS_MULTIPROC_DIR') or None
+
+
+# How gauges of live workers are combined (default: summed)
+GAUGE_MERGE = {"outbound_breaker_open": max, "process_start_time_seconds": min}
+
+RETIRED = 'retired'
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class WorkerSnapshots:
+    """Per-process metric snapshots in a shared directory, merged by whichever worker is scraped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self, directory):
+        """Write this process's snapshot every METRICS_SYNC_SECONDS (one thread per process)."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, args=(Path(directory),), name='metrics-sync', daemon=True).start()
+
+    def _run(self, directory):
+        while True:
+            time.sleep(METRICS_SYNC_SECONDS)
+            try:
+                self.write(directory)
+            except OSError as e:
+                print(f"⚠️ Could not write metrics snapshot to {directory}: {e}")
+
+    def write(self, directory):
+        values, histograms = metrics.collect()
+        families = {name: dict(samples) for name, (_, _, samples) in _scrape_time_families().items()}
+        self._save(Path(directory), os.getpid(), _snapshot_of(values, histograms, families))
+
+    def _save(self, directory, pid, data):
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{pid}.json"
+        with self._lock:
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(dict(data, pid=pid), separators=(",", ":")))
+            tmp_path.replace(path)
+
+    def merge(self, directory, kinds):
+        """
+        (values, histograms, families) over every snapshot, after writing this
+        process's own; `kinds` maps scrape-time family names to their type.
+        """
+        import fcntl
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        retired_path = directory / f"{RETIRED}.json"
+        totals, retired = ({}, {}, {}), ({}, {}, {})
+        # One scrape at a time folds exited workers, so none is counted twice or lost
+        with open(directory / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.write(directory)
+            _add_snapshot(retired, _load_snapshot(retired_path), False, kinds)
+            folded = False
+            for path in directory.glob('*.json'):
+                snapshot = _load_snapshot(path) if path != retired_path else None
+                if snapshot is None:
+                    continue
+                if _process_alive(snapshot["pid"]):
+                    _add_snapshot(totals, snapshot, True, kinds)
+                else:
+                    _add_snapshot(retired, snapshot, False, kinds)
+                    path.unlink(missing_ok=True)
+                    folded = True
+            if folded:
+                self._save(directory, RETIRED, _snapshot_of(*retired))
+        _add_snapshot(totals, _snapshot_of(*retired), False, kinds)
+        return totals
+
+
+def _snapshot_of(values, histograms, families):
+    """JSON-ready snapshot of (name, labels) -> value/histogram dicts and name -> {labels: value} families."""
+    return {
+        "values": [[name, labels, value] for (name, labels), value in values.items()],
+        "histograms": [[name, labels, histogram] for (name, labels), histogram in histograms.items()],
+        "families": {name: [[labels, value] for labels, value in samples.items()] for name, samples in families.items()},
+    }
+
+
+def _load_snapshot(path):
+    """A snapshot file's contents, or None if it vanished or is being replaced."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _labels_key(labels):
+    return tuple((name, value) for name, value in labels)
+
+
+def _add_snapshot(totals, snapshot, live, kinds):
+    """Add one snapshot into (values, histograms, families); gauges only count for live processes."""
+    if snapshot is None:
+        return
+    values, histograms, families = totals
+    for name, labels, value in snapshot["values"]:
+        if name not in METRICS or (METRICS[name][0] == 'gauge' and not live):
+            continue
+        key = (name, _labels_key(labels))
+        values[key] = values.get(key, 0) + value
+    for name, labels, histogram in snapshot["histograms"]:
+        if name not in METRICS:
+            continue
+        key = (name, _labels_key(labels))
+        merged = histograms.get(key)
+        if merged is None or len(merged) != len(histogram):
+            histograms[key] = list(histogram)
+        else:
+            for i, value in enumerate(histogram):
+                merged[i] += value
+    for name, samples in snapshot["families"].items():
+        kind = kinds.get(name)
+        if kind is None or (kind == 'gauge' and not live):
+            continue
+        combine = GAUGE_MERGE.get(name, operator.add) if kind == 'gauge' else operator.add
+        family = families.setdefault(name, {})
+        for labels, value in samples:
+            key = _labels_key(labels)
+            family[key] = combine(family[key], value) if key in family else value
+
+
+snapshots = WorkerSnapshots()
+
+
+def write_worker_snapshot():
+    """Record this process's final numbers before it exits (no-op for a single process)."""
+    directory = multiprocess_dir()
+    if directory and METRICS_ENABLED:
+        try:
+            snapshots.write(directory)
+        except OSError as e:
+            print(f"⚠️ Could not write metrics snapshot to {directory}: {e}")
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor adding the time of every execute and fetch to the thread's database time."""
+
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+    def executescript(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executescript(*args)
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(*args, **kwargs)
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors, shortcut executes and commits are timed."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def executescript(self, *args):
+        return self.cursor().executescript(*args)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            metrics.observe_db(time.perf_counter() - started)
+
+
+def connection_factory():
+    """sqlite3.connect factory: timed unless METRICS_ENABLED=0."""
+    return TimedConnection if METRICS_ENABLED else sqlite3.Connection
+
+
+def observe_outbound(destination, seconds):
+    metrics.observe("outbound_call_duration_seconds", (("destination", destination),), seconds)
+
+
+def init_metrics(app):
+    """Register the request hooks on `app` unless METRICS_ENABLED is off."""
+    if not app.config.get('METRICS_ENABLED', METRICS_ENABLED):
+        return
+    from flask import g, request
+
+    if multiprocess_dir():
+        snapshots.start(multiprocess_dir())
+
+    def start_request():
+        shard = metrics.shard()
+        g.metrics_started = (time.perf_counter(), shard.db_seconds)
+        metrics.inc("http_requests_in_flight")
+
+    def record_request(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+        shard = metrics.shard()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.inc("http_requests_total", (("method", request.method), ("route", route),
+                                            ("status", str(response.status_code))))
+        metrics.observe("http_request_duration_seconds", (("method", request.method), ("route", route)),
+                        time.perf_counter() - started[0])
+        metrics.observe("http_request_db_seconds", (("route", route),), shard.db_seconds - started[1])
+        return response
+
+    def end_request(exception=None):
+        if g.pop('metrics_started', None) is not None:
+            metrics.inc("http_requests_in_flight", value=-1)
+
+    app.before_request(start_request)
+    app.after_request(record_request)
+    app.teardown_request(end_request)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _render_family(lines, name, kind, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in sorted(samples):
+        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+
+def _render_histogram(lines, name, help_text, buckets, series):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(series):
+        cumulative = 0
+        for bound, count in zip(buckets, histogram):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+        cumulative += histogram[len(buckets)]
+        lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(histogram[-1])}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+
+def _scrape_time_families():
+    """Families read from the outbound and HTTP cache stats at scrape time: name -> (type, help, samples)."""
+    from backend.http_cache import http_cache_stats
+    from backend.outbound import outbound_status
+
+    calls, in_flight, queue_depth, breaker_open = [], [], [], []
+    for destination, status in outbound_status().items():
+        label = (("destination", destination),)
+        for result in ("successes", "failures", "retries", "rejected_open", "rejected_busy"):
+            calls.append((label + (("result", result),), status[result]))
+        in_flight.append((label, status["in_flight"]))
+        queue_depth.append((label, status["queue_depth"]))
+        breaker_open.append((label, int(status["breaker_state"] != 'closed')))
+
+    responses, not_modified = [], []
+    for route, counts in http_cache_stats.summary()["routes"].items():
+        responses.append(((("route", route),), counts["responses"]))
+        not_modified.append(((("route", route),), counts["not_modified"]))
+
+    return {
+        "outbound_calls_total": ("counter", "Outbound call outcomes by destination.", calls),
+        "outbound_in_flight": ("gauge", "Outbound calls running now.", in_flight),
+        "outbound_queue_depth": ("gauge", "Outbound calls waiting for a concurrency slot.", queue_depth),
+        "outbound_breaker_open": ("gauge", "1 while the destination's circuit breaker is open or half-open.",
+                                  breaker_open),
+        "http_cache_responses_total": ("counter", "Responses of conditional routes.", responses),
+        "http_cache_not_modified_total": ("counter", "304 responses of conditional routes.", not_modified),
+        "process_start_time_seconds": ("gauge", "Start time of the process since the epoch.",
+                                       [((), metrics.started_at)]),
+    }
+
+
+def render_metrics():
+    """Every metric in Prometheus text exposition format (of all workers with METRICS_MULTIPROC_DIR)."""
+    values, histograms = metrics.collect()
+    families = _scrape_time_families()
+    directory = multiprocess_dir()
+    if directory:
+        values, histograms, merged = snapshots.merge(
+            directory, {name: kind for name, (kind, _, _) in families.items()})
+        families = {name: (kind, help_text, list(merged.get(name, {}).items()))
+                    for name, (kind, help_text, _) in families.items()}
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        if kind == 'histogram':
+            series = [(labels, histogram) for (metric, labels), histogram in histograms.items() if metric == name]
+            _render_histogram(lines, name, help_text, buckets, series)
+        else:
+            samples = [(labels, value) for (metric, labels), value in values.items() if metric == name]
+            if kind == 'gauge' and not samples:
+                samples = [((), 0)]
+            _render_family(lines, name, kind, help_text, samples)
+    for name, (kind, help_text, samples) in families.items():
+        _render_family(lines, name, kind, help_text, samples)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,167 @@
+"""
+Tiered model routing for Gemini ratings.
+
+Every profile is first scored by the cheap GEMINI_FAST_MODEL. The answer is
+kept unless confidence is low, in which case the profile is re-scored by the
+full model (GEMINI_MODEL):
+
+- the overall score is within ROUTING_BORDERLINE_MARGIN of one of the
+  ROUTING_BORDERLINE_SCORES (e.g. a shortlist cut-off)
+- a rating has fewer than ROUTING_MIN_REASONING_POINTS reasoning bullets, or
+  a score outside 0..ROUTING_MAX_SCORE
+- the fast answer did not parse or validate at all
+
+Profiles with sparse GitHub data (fewer than ROUTING_MIN_REPOS repositories)
+skip the fast model and go straight to the full one. Leave GEMINI_FAST_MODEL
+empty to disable routing. Every decision is logged and counted in
+`routing_stats` with per-model latency, prompt tokens and estimated cost.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+
+from backend.outbound import OutboundError
+from backend.prompt_budget import estimate_tokens
+
+GEMINI_FAST_MODEL = os.getenv('GEMINI_FAST_MODEL', 'gemini-2.0-flash-lite')
+ROUTING_BORDERLINE_SCORES = [int(score) for score in os.getenv('ROUTING_BORDERLINE_SCORES', '600,800').split(',')
+                             if score.strip()]
+ROUTING_BORDERLINE_MARGIN = int(os.getenv('ROUTING_BORDERLINE_MARGIN', '25'))
+ROUTING_MIN_REASONING_POINTS = int(os.getenv('ROUTING_MIN_REASONING_POINTS', '2'))
+ROUTING_MAX_SCORE = int(os.getenv('ROUTING_MAX_SCORE', '1000'))
+ROUTING_MIN_REPOS = int(os.getenv('ROUTING_MIN_REPOS', '2'))
+# USD per 1M prompt tokens, for the cost mix in routing_stats
+ROUTING_FAST_PRICE = float(os.getenv('ROUTING_FAST_PRICE', '0.075'))
+ROUTING_FULL_PRICE = float(os.getenv('ROUTING_FULL_PRICE', '0.30'))
+
+
+def escalation_reasons(ratings):
+    """
+    Why a fast-model answer is not trusted, as (kind, detail) pairs.
+
+    An empty list means keep the answer.
+    """
+    reasons = []
+    for key, rating in ratings.items():
+        if not isinstance(rating, dict):
+            continue
+        score = rating.get('score')
+        if not isinstance(score, (int, float)) or not 0 <= score <= ROUTING_MAX_SCORE:
+            reasons.append(("score_out_of_range", f"{key} score {score!r} out of range"))
+        points = [point for point in rating.get('reasoning') or [] if isinstance(point, str) and point.strip()]
+        if len(points) < ROUTING_MIN_REASONING_POINTS:
+            reasons.append(("thin_reasoning", f"{key} has {len(points)} reasoning points"))
+    overall = ratings.get('overall_rating', {}).get('score')
+    if isinstance(overall, (int, float)):
+        for boundary in ROUTING_BORDERLINE_SCORES:
+            if abs(overall - boundary) <= ROUTING_BORDERLINE_MARGIN:
+                reasons.append(("borderline", f"overall score {overall} is near {boundary}"))
+    return reasons
+
+
+def sparse_github_reasons(github_data):
+    """(kind, detail) reasons to skip the fast model: too little GitHub data to judge."""
+    if not github_data:
+        return [("sparse_github", "no GitHub data")]
+    repo_count = github_data.get('total_repos') or len(github_data.get('repositories') or [])
+    if repo_count < ROUTING_MIN_REPOS:
+        return [("sparse_github", f"{repo_count} GitHub repositories")]
+    return []
+
+
+class RoutingStats:
+    """Routing decisions, escalation reasons and per-tier latency/tokens/cost, thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decisions = Counter()
+        self.reasons = Counter()
+        self.tiers = {}
+
+    def record_call(self, tier, model_name, latency, prompt_tokens):
+        price = ROUTING_FAST_PRICE if tier == 'fast' else ROUTING_FULL_PRICE
+        with self._lock:
+            stats = self.tiers.setdefault(tier, {"model": model_name, "calls": 0, "latency": 0.0,
+                                                 "prompt_tokens": 0, "cost_usd": 0.0})
+            stats["calls"] += 1
+            stats["latency"] += latency
+            stats["prompt_tokens"] += prompt_tokens
+            stats["cost_usd"] += prompt_tokens * price / 1e6
+
+    def record_decision(self, decision, reasons):
+        with self._lock:
+            self.decisions[decision] += 1
+            # Each kind counts once per profile
+            for kind in {kind for kind, _ in reasons}:
+                self.reasons[kind] += 1
+
+    def summary(self):
+        with self._lock:
+            tiers = {tier: {**stats, "latency": round(stats["latency"], 3),
+                            "mean_latency": round(stats["latency"] / stats["calls"], 3),
+                            "cost_usd": round(stats["cost_usd"], 6)}
+                     for tier, stats in self.tiers.items()}
+            total = sum(self.decisions.values())
+            return {
+                "profiles": total,
+                "decisions": dict(self.decisions),
+                "escalation_rate": round(self.decisions['escalated'] / total, 3) if total else None,
+                "reasons": dict(self.reasons),
+                "tiers": tiers,
+            }
+
+
+routing_stats = RoutingStats()
+
+
+def _describe(reasons):
+    return '; '.join(detail for _, detail in reasons)
+
+
+def _timed_call(tier, model_name, call, prompt):
+    started = time.perf_counter()
+    try:
+        return call()
+    finally:
+        routing_stats.record_call(tier, model_name, time.perf_counter() - started, estimate_tokens(prompt))
+
+
+def route_ratings(prompt, call_fast, call_full, fast_model_name, full_model_name, skip_reasons=()):
+    """
+    Score with `call_fast()` and fall back to `call_full()` when confidence is low.
+
+    Returns (ratings, tier) with tier 'fast' or 'full'. Both callables return
+    validated ratings or raise. `call_fast` may be None
+    (routing disabled). `skip_reasons` (e.g. from sparse_github_reasons) send
+    the profile straight to the full model. Throttling errors are not escalated:
+    both tiers share the Gemini outbound limits.
+    """
+    if call_fast is None:
+        return _timed_call('full', full_model_name, call_full, prompt), 'full'
+
+    if skip_reasons:
+        print(f"🔀 Routing to {full_model_name} directly: {_describe(skip_reasons)}")
+        routing_stats.record_decision('direct', skip_reasons)
+        return _timed_call('full', full_model_name, call_full, prompt), 'full'
+
+    started = time.perf_counter()
+    try:
+        ratings = _timed_call('fast', fast_model_name, call_fast, prompt)
+        reasons = escalation_reasons(ratings)
+    except OutboundError:
+        raise
+    except Exception as e:
+        reasons = [("invalid_answer", f"invalid answer: {e}")]
+    fast_latency = time.perf_counter() - started
+
+    if not reasons:
+        print(f"🔀 Routing kept {fast_model_name} answer ({fast_latency:.2f}s)")
+        routing_stats.record_decision('fast', [])
+        return ratings, 'fast'
+
+    print(f"🔀 Routing escalated to {full_model_name} after {fast_latency:.2f}s on {fast_model_name}: "
+          f"{_describe(reasons)}")
+    routing_stats.record_decision('escalated', reasons)
+    return _timed_call('full', full_model_name, call_full, prompt), 'full'
@@ -0,0 +1,456 @@
+"""
+Shared outbound-call layer for GitHub and Gemini.
+
+Every call to an external service goes through a named Destination, which
+applies (in order) a circuit breaker, a concurrency cap, a token-bucket rate
+limit, and retries with exponential backoff and full jitter. All state is
+thread-safe and per process, and `outbound_status()` reports breaker state
+and queue depth for each destination.
+
+Limits come from the environment, e.g. OUTBOUND_GITHUB_RATE=2 (calls/s),
+OUTBOUND_GITHUB_BURST, OUTBOUND_GITHUB_CONCURRENCY, OUTBOUND_GITHUB_RETRIES,
+OUTBOUND_GITHUB_BREAKER_FAILURES, OUTBOUND_GITHUB_BREAKER_RESET.
+"""
+
+import os
+import random
+import threading
+import time
+
+from backend.metrics import observe_outbound
+from backend.tracing import KIND_CLIENT, span
+
+
+class OutboundError(Exception):
+    """Base class for outbound failures: rejected calls and exhausted retries."""
+
+
+class CircuitOpenError(OutboundError):
+    """The destination's circuit breaker is open; the call was not attempted."""
+
+
+class OutboundBusyError(OutboundError):
+    """No concurrency slot or rate-limit token became available in time."""
+
+
+class RetryableError(OutboundError):
+    """Raised by call wrappers for failures worth retrying (throttling, 5xx, timeouts)."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available; returns the wait in seconds otherwise (0 on success)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate if self.rate > 0 else float('inf')
+
+    def acquire(self, timeout):
+        """Block until a token is available or `timeout` seconds pass; returns True on success."""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or wait > remaining:
+                return False
+            time.sleep(wait)
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls, rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through (half-open).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Return True if a call may proceed now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: exactly one trial call at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel_trial(self):
+        """Give back a half-open trial slot when the call was never attempted."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def _env_number(name, default, cast=float):
+    value = os.getenv(name)
+    return cast(value) if value not in (None, '') else default
+
+
+class Destination:
+    """Rate limit, concurrency cap, retry policy and circuit breaker for one external service."""
+
+    def __init__(self, name, rate=5.0, burst=5, max_concurrency=4, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, acquire_timeout=10.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._stats = {"calls": 0, "successes": 0, "failures": 0, "retries": 0,
+                       "rejected_open": 0, "rejected_busy": 0}
+
+    @classmethod
+    def from_env(cls, name, **defaults):
+        """Build a destination whose settings can be overridden by OUTBOUND_<NAME>_* variables."""
+        prefix = f"OUTBOUND_{name.upper()}_"
+        settings = dict(defaults)
+        for key, env_key, cast in (
+            ('rate', 'RATE', float), ('burst', 'BURST', int),
+            ('max_concurrency', 'CONCURRENCY', int), ('max_retries', 'RETRIES', int),
+            ('acquire_timeout', 'ACQUIRE_TIMEOUT', float),
+            ('failure_threshold', 'BREAKER_FAILURES', int),
+            ('reset_timeout', 'BREAKER_RESET', float),
+        ):
+            if key in settings or os.getenv(prefix + env_key):
+                settings[key] = _env_number(prefix + env_key, settings.get(key), cast)
+        return cls(name, **settings)
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than a server-supplied Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        try:
+            if retry_after:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+        except ValueError:
+            pass  # HTTP-date form of Retry-After; fall back to jitter
+        return delay
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` under this destination's policies.
+
+        Retries when `fn` raises RetryableError; any other exception counts as a
+        failure and propagates immediately. The circuit breaker sees one
+        outcome per call, after the retries, and retrying stops early if other
+        callers have opened it meanwhile. Raises CircuitOpenError or
+        OutboundBusyError without calling `fn` when the service is unhealthy or
+        saturated.
+        """
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected_open")
+            raise CircuitOpenError(f"{self.name}: circuit open, failing fast")
+        attempt = 0
+        while True:
+            with self._lock:
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.acquire_timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                self.breaker.cancel_trial()
+                self._count("rejected_busy")
+                raise OutboundBusyError(f"{self.name}: no free concurrency slot")
+
+            try:
+                if not self.bucket.acquire(self.acquire_timeout):
+                    self._count("rejected_busy")
+                    raise OutboundBusyError(f"{self.name}: rate limit token not available")
+
+                with self._lock:
+                    self._in_flight += 1
+                started = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    observe_outbound(self.name, time.perf_counter() - started)
+                    with self._lock:
+                        self._in_flight -= 1
+            except OutboundBusyError:
+                self.breaker.cancel_trial()
+                raise
+            except RetryableError as e:
+                if attempt >= self.max_retries:
+                    self.breaker.record_failure()
+                    self._count("failures")
+                    raise
+                if self.breaker.state == CircuitBreaker.OPEN:
+                    # Other calls already tripped the breaker; don't keep hammering the service
+                    self._count("failures")
+                    raise
+                retry_after = e.retry_after
+            except Exception:
+                self.breaker.record_failure()
+                self._count("failures")
+                raise
+            else:
+                self.breaker.record_success()
+                self._count("successes")
+                return result
+            finally:
+                self._slots.release()
+
+            self._count("retries")
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def status(self):
+        """Snapshot of breaker state, queue depth and counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            waiting, in_flight = self._waiting, self._in_flight
+        return {
+            "breaker_state": self.breaker.state,
+            "queue_depth": waiting,
+            "in_flight": in_flight,
+            "max_concurrency": self.max_concurrency,
+            "tokens_available": round(self.bucket.tokens, 2),
+            **stats
+        }
+
+
+_destinations = {}
+_destinations_lock = threading.Lock()
+
+# Default policies; GitHub throttles unauthenticated HTML scraping aggressively
+DESTINATION_DEFAULTS = {
+    "github": dict(rate=2.0, burst=5, max_concurrency=4, max_retries=3, failure_threshold=5, reset_timeout=60.0),
+    # raw.githubusercontent.com: header-only probes, served from a CDN
+    "github_raw": dict(rate=10.0, burst=20, max_concurrency=8, max_retries=2, failure_threshold=10, reset_timeout=30.0),
+    "gemini": dict(rate=1.0, burst=3, max_concurrency=2, max_retries=2, failure_threshold=3, reset_timeout=30.0,
+                   acquire_timeout=30.0),
+}
+
+
+def get_destination(name):
+    """Get (creating on first use) the shared Destination for a service name."""
+    with _destinations_lock:
+        destination = _destinations.get(name)
+        if destination is None:
+            destination = Destination.from_env(name, **DESTINATION_DEFAULTS.get(name, {}))
+            _destinations[name] = destination
+        return destination
+
+
+def reset_destinations():
+    """Forget all destinations (their state is rebuilt from the environment on next use)."""
+    with _destinations_lock:
+        _destinations.clear()
+
+
+def outbound_status():
+    """Status of every destination used so far, keyed by name."""
+    with _destinations_lock:
+        destinations = list(_destinations.values())
+    return {destination.name: destination.status() for destination in destinations}
+
+
+_http_observers = []
+
+
+def add_http_observer(observer):
+    """Call `observer(method, url, response)` for every HTTP response received (used for recording)."""
+    _http_observers.append(observer)
+
+
+def http_request(destination_name, method, url, **kwargs):
+    """
+    `requests.request` through a destination.
+
+    429, 5xx and GitHub's 403 secondary rate limit are retried (honouring
+    Retry-After); connection errors and timeouts are retried too. Other error
+    statuses raise `requests.HTTPError` without retry and without counting
+    against the circuit breaker (a missing profile is not an outage).
+    """
+    import requests
+
+    kwargs.setdefault('timeout', 10)
+    attempts = [0]
+
+    def attempt():
+        attempts[0] += 1
+        try:
+            response = requests.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise RetryableError(f"{url}: {e}")
+        for observer in _http_observers:
+            observer(method, url, response)
+        throttled = response.status_code == 403 and response.headers.get('X-RateLimit-Remaining') == '0'
+        if response.status_code == 429 or response.status_code >= 500 or throttled:
+            raise RetryableError(f"{url}: HTTP {response.status_code}",
+                                 retry_after=response.headers.get('Retry-After'))
+        return response
+
+    with span(f"HTTP {method}", KIND_CLIENT, **{"outbound.destination": destination_name, "http.url": url}) as current:
+        try:
+            response = get_destination(destination_name).call(attempt)
+        finally:
+            current.set_attribute("outbound.attempts", attempts[0])
+        current.set_attribute("http.status_code", response.status_code)
+    response.raise_for_status()
+    return response
+
+
+def http_get(destination_name, url, **kwargs):
+    """`requests.get` through a destination (see http_request)."""
+    return http_request(destination_name, 'GET', url, **kwargs)
+
+
+# google.api_core exception names that indicate throttling or a transient outage
+RETRYABLE_API_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+                        'DeadlineExceeded', 'InternalServerError', 'GatewayTimeout'}
+
+
+def _raise_api_error(destination_name, error):
+    """Re-raise an LLM API error, as RetryableError when it is transient."""
+    if type(error).__name__ in RETRYABLE_API_ERRORS or isinstance(error, TimeoutError):
+        raise RetryableError(f"{destination_name}: {type(error).__name__}: {error}") from error
+    raise error
+
+
+def llm_call(destination_name, fn, *args, **kwargs):
+    """Call an LLM client method through a destination, retrying transient API errors."""
+    attempts = [0]
+
+    def attempt():
+        attempts[0] += 1
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            _raise_api_error(destination_name, e)
+
+    with span(f"LLM {destination_name}", KIND_CLIENT, **{"outbound.destination": destination_name}) as current:
+        try:
+            return get_destination(destination_name).call(attempt)
+        finally:
+            current.set_attribute("outbound.attempts", attempts[0])
+
+
+class _BrokenStream(Exception):
+    """Wraps an error raised while iterating a response stream (as opposed to by its reader)."""
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _stream_chunks(chunks):
+    try:
+        yield from chunks
+    except Exception as e:
+        raise _BrokenStream(e) from e
+
+
+def llm_stream(destination_name, fn, consume, *args, **kwargs):
+    """
+    Call a streaming LLM client method through a destination and read it with `consume(chunks)`.
+
+    Opening and reading the stream form one attempt: the concurrency slot is
+    held until `consume` returns, and an API error raised mid-stream is
+    retried (when transient) and counted by the circuit breaker like one
+    raised by the initial request. A retry calls `consume` again with a fresh
+    stream. Exceptions raised by `consume` itself (e.g. malformed output)
+    propagate without retry and without counting against the breaker.
+    """
+    attempts = [0]
+
+    def attempt():
+        attempts[0] += 1
+        try:
+            chunks = fn(*args, stream=True, **kwargs)
+            try:
+                return consume(_stream_chunks(chunks)), None
+            except _BrokenStream as broken:
+                raise broken.error
+            except Exception as e:
+                return None, e
+        except Exception as e:
+            _raise_api_error(destination_name, e)
+
+    with span(f"LLM {destination_name}", KIND_CLIENT,
+              **{"outbound.destination": destination_name, "llm.stream": True}) as current:
+        try:
+            result, reader_error = get_destination(destination_name).call(attempt)
+        finally:
+            current.set_attribute("outbound.attempts", attempts[0])
+    if reader_error is not None:
+        raise reader_error
+    return result
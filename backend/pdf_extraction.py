@@ -0,0 +1,233 @@
+"""
+PDF text extraction for uploaded resumes.
+
+PyPDF2 is pure Python, so a large PDF parsed on a request thread holds the GIL
+and stalls the whole worker. Extraction therefore runs in a small pool of
+worker processes, and every job is bounded by a page, byte and character
+budget and by a timeout.
+
+The timeout covers a job's execution only: a request waiting for a free
+worker under load is not timed out, and a job that does time out kills just
+the worker running it (which is replaced on demand), never jobs running
+healthily in the other workers.
+"""
+
+import base64
+import binascii
+import io
+import multiprocessing
+import os
+import threading
+
+from backend.tracing import traced
+
+# Limits (overridable through the environment)
+PDF_MAX_BYTES = int(os.getenv('PDF_MAX_BYTES', 10 * 1024 * 1024))
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 20))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', 50000))
+PDF_EXTRACT_TIMEOUT = float(os.getenv('PDF_EXTRACT_TIMEOUT', 15))
+# 0 disables the pool and extracts inline (useful for debugging)
+PDF_POOL_WORKERS = int(os.getenv('PDF_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+class PDFExtractionError(Exception):
+    """Raised when a PDF is rejected or cannot be extracted within its limits."""
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+@traced('pdf.decode')
+def decode_pdf_base64(base64_data, max_bytes=None):
+    """Decode base64 (optionally a data URL) into PDF bytes, enforcing the size limit."""
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+
+    # Remove data URL prefix if present (e.g., "data:application/pdf;base64,")
+    if ',' in base64_data:
+        base64_data = base64_data.split(',', 1)[1]
+
+    # Reject oversized payloads before allocating the decoded copy
+    if len(base64_data) * 3 // 4 > max_bytes + 3:
+        raise PDFExtractionError(f"PDF exceeds the {max_bytes} byte limit")
+
+    try:
+        pdf_bytes = base64.b64decode(base64_data)
+    except (binascii.Error, ValueError) as e:
+        raise PDFExtractionError(f"Invalid base64 data: {e}")
+
+    if len(pdf_bytes) > max_bytes:
+        raise PDFExtractionError(f"PDF exceeds the {max_bytes} byte limit")
+    return pdf_bytes
+
+
+def extract_text_from_pdf_bytes(pdf_bytes, max_pages=None, max_chars=None):
+    """
+    Extract whitespace-normalised text from PDF bytes.
+
+    Stops after `max_pages` pages or once `max_chars` characters have been
+    collected, whichever comes first. Runs in the calling process.
+    """
+    from PyPDF2 import PdfReader
+
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+
+    pdf_reader = PdfReader(io.BytesIO(pdf_bytes))
+
+    parts = []
+    collected = 0
+    for page_number, page in enumerate(pdf_reader.pages):
+        if page_number >= max_pages or collected >= max_chars:
+            break
+        page_text = ' '.join((page.extract_text() or '').split())
+        if not page_text:
+            continue
+        parts.append(page_text)
+        collected += len(page_text) + 1
+
+    return ' '.join(parts)[:max_chars]
+
+
+def _worker_main(conn):
+    """Worker process loop: run (fn, args) jobs from `conn` until told to stop or the parent goes away."""
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            result = ('ok', fn(*args))
+        except Exception as e:
+            result = ('error', str(e))
+        conn.send(result)
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name='pdf-extract', daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    A fixed number of worker processes, each running one job at a time.
+
+    Callers wait (untimed) for a free worker, then give the job `timeout`
+    seconds of execution. A worker whose job times out or dies is killed and
+    discarded; the next job starts a fresh one.
+    """
+
+    def __init__(self, workers):
+        # Never fork a threaded server process; start clean interpreters instead
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(method)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._busy = set()
+        self._closed = False
+
+    def _checkout(self):
+        with self._lock:
+            if self._closed:
+                raise PDFExtractionError("PDF extraction pool is shut down")
+            worker = self._idle.pop() if self._idle else None
+            if worker is None or not worker.process.is_alive():
+                if worker is not None:
+                    worker.kill()
+                worker = _Worker(self._context)
+            self._busy.add(worker)
+            return worker
+
+    def _checkin(self, worker, healthy):
+        with self._lock:
+            self._busy.discard(worker)
+            if healthy and not self._closed:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    def run(self, fn, args, timeout):
+        """Run fn(*args) in a worker; raises PDFExtractionError on failure or after `timeout` seconds of execution."""
+        with self._slots:
+            worker = self._checkout()
+            healthy = False
+            try:
+                worker.conn.send((fn, args))
+                if not worker.conn.poll(timeout):
+                    raise PDFExtractionError(f"PDF extraction timed out after {timeout:g}s")
+                status, value = worker.conn.recv()
+                healthy = True
+            except (EOFError, OSError):
+                raise PDFExtractionError("PDF extraction worker crashed")
+            finally:
+                self._checkin(worker, healthy)
+        if status == 'error':
+            raise PDFExtractionError(value)
+        return value
+
+    def shutdown(self):
+        """Stop idle workers and kill busy ones."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            busy = list(self._busy)
+        for worker in idle:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(1)
+            worker.kill()
+        for worker in busy:
+            worker.kill()
+
+
+def _get_pool():
+    """Return the shared extraction pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(PDF_POOL_WORKERS)
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the extraction pool (AppServices.shutdown calls this); the next extraction starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+@traced('pdf.extract')
+def extract_pdf_text(pdf_bytes, max_pages=None, max_chars=None, timeout=None):
+    """
+    Extract text from PDF bytes in the process pool.
+
+    Raises PDFExtractionError if the PDF is too large, cannot be parsed, or the
+    job does not finish within `timeout` seconds.
+    """
+    timeout = PDF_EXTRACT_TIMEOUT if timeout is None else timeout
+
+    if len(pdf_bytes) > PDF_MAX_BYTES:
+        raise PDFExtractionError(f"PDF exceeds the {PDF_MAX_BYTES} byte limit")
+
+    if PDF_POOL_WORKERS <= 0:
+        return extract_text_from_pdf_bytes(pdf_bytes, max_pages, max_chars)
+
+    return _get_pool().run(extract_text_from_pdf_bytes, (pdf_bytes, max_pages, max_chars), timeout)
@@ -0,0 +1,297 @@
+"""
+Prefork multi-process WSGI server for production.
+
+The master process binds the listening socket once and forks SERVER_WORKERS
+workers that all accept on it. The master never imports the application:
+each worker loads and initializes it after the fork, so every worker has its
+own sqlite connection, rating service and job pool, and a reload picks up new
+code. Rating job events are written to sqlite, so any worker can stream them. Workers handle connections on a fixed pool of SERVER_THREADS threads
+(long-lived responses such as server-sent events hold a thread each), and
+accept a connection only while one of those threads is free, so a busy
+worker leaves new connections to its idle siblings instead of queueing them.
+
+`load_app()` returns the WSGI app of a worker and `on_worker_exit(app)`, if
+given, runs after the worker has drained its in-flight requests.
+
+Signals to the master:
+    SIGHUP           graceful reload: start a fresh set of workers, then let
+                     the old ones finish their in-flight requests and exit
+    SIGTERM, SIGINT  graceful shutdown
+
+The master gives its workers a clean METRICS_MULTIPROC_DIR (a temporary
+directory unless set), where backend/metrics.py keeps each worker's snapshot
+so /metrics reports all workers whichever one answers the scrape.
+
+A worker exits after SERVER_MAX_REQUESTS connections (plus a random
+0..SERVER_MAX_REQUESTS_JITTER so they do not all restart together) and is
+replaced. Workers still busy SERVER_GRACEFUL_TIMEOUT seconds after being
+asked to stop are killed.
+"""
+
+import os
+import random
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS') or min(2 * (os.cpu_count() or 1) + 1, 8))
+SERVER_THREADS = int(os.getenv('SERVER_THREADS', '8'))
+SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', '5000'))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', '500'))
+SERVER_GRACEFUL_TIMEOUT = float(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))
+SERVER_BACKLOG = int(os.getenv('SERVER_BACKLOG', '256'))
+
+# Exit code of a worker whose application failed to load; the master gives up instead of respawning
+WORKER_BOOT_ERROR = 3
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server on an inherited socket, handling connections on a fixed thread pool."""
+
+    poll_interval = 0.5
+
+    def __init__(self, host, port, app, fd, threads, max_requests=0):
+        super().__init__(host, port, app, fd=fd)
+        # Workers race for each connection; the losers get BlockingIOError (ignored by
+        # socketserver) instead of blocking in accept() where retire() cannot reach them
+        self.socket.setblocking(False)
+        # Set after __init__ so responses stay HTTP/1.0 (one request per connection):
+        # idle keep-alive connections would otherwise pin pool threads
+        self.multithread = True
+        self.multiprocess = True
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        # One slot per pool thread, taken before accept() and returned when the connection is done
+        self._slots = threading.BoundedSemaphore(threads)
+        self.max_requests = max_requests
+        self.handled = 0
+        self._retiring = False
+
+    def get_request(self):
+        # Leave the connection in the shared backlog, for a sibling worker, until a thread is free
+        while not self._slots.acquire(timeout=self.poll_interval):
+            if self._retiring:
+                raise OSError("worker is retiring")
+        try:
+            return super().get_request()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def process_request(self, request, client_address):
+        self.handled += 1
+        try:
+            self.pool.submit(self._handle, request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+        if self.max_requests and self.handled >= self.max_requests:
+            print(f"♻️  Worker {os.getpid()} reached {self.handled} requests; recycling")
+            self.retire()
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def retire(self):
+        """Stop accepting; serve_forever returns once the current poll ends."""
+        if not self._retiring:
+            self._retiring = True
+            # shutdown() waits for serve_forever, so it must run on another thread
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def _worker_main(listener, load_app, host, port, threads, max_requests, on_exit=None):
+    """Body of a forked worker; never returns."""
+    # Ctrl+C reaches the whole process group; the master coordinates the shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Asked to stop before serving anything: nothing in flight, exit quietly
+    signal.signal(signal.SIGTERM, lambda signum, frame: os._exit(0))
+    try:
+        app = load_app()
+    except BaseException as e:
+        if not isinstance(e, SystemExit):
+            print(f"❌ Worker {os.getpid()} failed to load the application: {e}")
+        sys.stdout.flush()
+        os._exit(WORKER_BOOT_ERROR)
+
+    server = PooledWSGIServer(host, port, app, listener.fileno(), threads, max_requests)
+    listener.close()
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.retire())
+    print(f"👷 Worker {os.getpid()} serving with {threads} threads")
+    sys.stdout.flush()
+
+    exit_code = 0
+    try:
+        server.serve_forever(poll_interval=server.poll_interval)
+        # Finish in-flight requests before exiting
+        server.pool.shutdown(wait=True)
+        if on_exit:
+            on_exit(app)
+    except BaseException as e:
+        print(f"❌ Worker {os.getpid()} crashed: {e}")
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        os._exit(exit_code)
+
+
+class PreforkServer:
+    """Master process: owns the socket, forks workers, replaces them and handles signals."""
+
+    def __init__(self, load_app, host='0.0.0.0', port=5000, workers=None, threads=None,
+                 max_requests=None, max_requests_jitter=None, graceful_timeout=None, on_worker_exit=None):
+        self.load_app = load_app
+        self.on_worker_exit = on_worker_exit
+        self.host = host
+        self.port = port
+        self.num_workers = workers or SERVER_WORKERS
+        self.threads = threads or SERVER_THREADS
+        self.max_requests = SERVER_MAX_REQUESTS if max_requests is None else max_requests
+        self.max_requests_jitter = SERVER_MAX_REQUESTS_JITTER if max_requests_jitter is None else max_requests_jitter
+        self.graceful_timeout = SERVER_GRACEFUL_TIMEOUT if graceful_timeout is None else graceful_timeout
+        self.listener = None
+        self.workers = {}      # pid -> generation
+        self.retiring = {}     # pid -> kill deadline
+        self.generation = 0
+        self._reload_requested = False
+        self._stop_requested = False
+        self._rng = random.Random()
+
+    def run(self):
+        """Serve until SIGTERM/SIGINT; returns the process exit code."""
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("The prefork server needs os.fork (use the development server on this platform)")
+
+        self.listener = socket.create_server((self.host, self.port), backlog=SERVER_BACKLOG)
+        created_metrics_dir = self._prepare_metrics_dir()
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        print(f"🏭 Master {os.getpid()} listening on {self.host}:{self.port} with {self.num_workers} workers "
+              f"x {self.threads} threads (max requests {self.max_requests or 'unlimited'})")
+
+        exit_code = 0
+        try:
+            while not self._stop_requested:
+                if self._reap() == WORKER_BOOT_ERROR:
+                    print("❌ A worker could not load the application; shutting down")
+                    exit_code = 1
+                    break
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload()
+                self._kill_overdue()
+                self._spawn_missing()
+                time.sleep(0.2)
+        finally:
+            self._stop_all()
+            self.listener.close()
+            if created_metrics_dir:
+                shutil.rmtree(created_metrics_dir, ignore_errors=True)
+        print("👋 Server stopped")
+        return exit_code
+
+    @staticmethod
+    def _prepare_metrics_dir():
+        """Point the workers at an empty METRICS_MULTIPROC_DIR; returns the directory if created here."""
+        directory = os.getenv('METRICS_MULTIPROC_DIR')
+        if not directory:
+            directory = os.environ['METRICS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='hackbite-metrics-')
+            return directory
+        # Snapshots of a previous run would resurrect its counters
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(('.json', '.tmp')):
+                os.unlink(os.path.join(directory, name))
+        return None
+
+    def _on_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame):
+        self._stop_requested = True
+
+    def _spawn_missing(self):
+        current = sum(1 for generation in self.workers.values() if generation == self.generation)
+        for _ in range(self.num_workers - current):
+            self._spawn()
+
+    def _spawn(self):
+        max_requests = self.max_requests
+        if max_requests and self.max_requests_jitter:
+            max_requests += self._rng.randint(0, self.max_requests_jitter)
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            _worker_main(self.listener, self.load_app, self.host, self.port, self.threads, max_requests,
+                         self.on_worker_exit)
+        self.workers[pid] = self.generation
+
+    def _reap(self):
+        """Collect exited workers; returns WORKER_BOOT_ERROR if any failed to boot."""
+        result = None
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.workers.pop(pid, None)
+            retired = self.retiring.pop(pid, None) is not None
+            code = os.waitstatus_to_exitcode(status)
+            if code == WORKER_BOOT_ERROR:
+                result = WORKER_BOOT_ERROR
+            elif code != 0 and not retired:
+                print(f"⚠️ Worker {pid} exited with code {code}; replacing it")
+        return result
+
+    def _retire(self, pid):
+        if pid in self.retiring:
+            return
+        self.retiring[pid] = time.monotonic() + self.graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                print(f"⚠️ Worker {pid} did not finish within {self.graceful_timeout}s; killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring[pid] = float('inf')
+
+    def _reload(self):
+        """Start a new generation of workers, then retire the previous one."""
+        old = list(self.workers)
+        self.generation += 1
+        print(f"🔄 Reloading: starting {self.num_workers} new workers, retiring {len(old)}")
+        self._spawn_missing()
+        for pid in old:
+            self._retire(pid)
+
+    def _stop_all(self):
+        for pid in list(self.workers):
+            self._retire(pid)
+        while self.workers:
+            self._reap()
+            self._kill_overdue()
+            time.sleep(0.1)
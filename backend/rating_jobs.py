@@ -0,0 +1,231 @@
+"""
+Background profile-rating jobs with server-sent progress events.
+
+A rating submission runs on a small worker pool. Each stage it completes
+(queued, started, pdf_extracted, github_scraped, provisional_scored,
+llm_started, one rating_received per score as Gemini streams it, scored or
+failed) is appended to the job's event log with timings. Streamed scores are
+provisional; the stored ratings in the `scored` event replace them.
+
+Jobs and their event logs live in sqlite (rating_jobs and rating_job_events),
+so under the prefork server any worker can stream a job that another worker
+runs. Clients follow the log as a text/event-stream and can reconnect with
+Last-Event-ID without missing or repeating events: events of a job running in
+the same process are picked up as soon as they are emitted, those of other
+workers within RATING_JOB_POLL_SECONDS. Finished jobs are forgotten after
+RATING_JOB_TTL seconds.
+
+Jobs run inside a `rating_job` tracing span that is a child of the submitting
+request's span, and each stage is also recorded as an event on the current
+span (see backend/tracing.py).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from backend.metrics import connection_factory
+from backend.tracing import bind_current_span, current_span, span
+
+RATING_JOB_WORKERS = int(os.getenv('RATING_JOB_WORKERS', '4'))
+RATING_JOB_TTL = float(os.getenv('RATING_JOB_TTL', '600'))
+# How often a job's event log is re-read while waiting for events from another worker
+RATING_JOB_POLL_SECONDS = float(os.getenv('RATING_JOB_POLL_SECONDS', '0.25'))
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# Stages after which a job emits nothing more
+FINAL_STAGES = ('scored', 'failed')
+
+
+class RatingJobStore:
+    """Job rows and event logs in the app's sqlite database, shared by all worker processes."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def _connect(self):
+        # Short-lived connections: jobs are written from pool threads and read from request threads
+        connection = sqlite3.connect(self.db_path, timeout=30, factory=connection_factory())
+        connection.row_factory = sqlite3.Row
+        return closing(connection)
+
+    def create(self, job_id, created_at):
+        with self._connect() as connection, connection:
+            connection.execute("INSERT INTO rating_jobs (job_id, created_at) VALUES (?, ?)", (job_id, created_at))
+
+    def append(self, job_id, event, finished_at=None):
+        with self._connect() as connection, connection:
+            connection.execute(
+                "INSERT INTO rating_job_events (job_id, event_id, stage, event_json) VALUES (?, ?, ?, ?)",
+                (job_id, event["id"], event["stage"], json.dumps(event))
+            )
+            if finished_at is not None:
+                connection.execute("UPDATE rating_jobs SET finished_at = ? WHERE job_id = ?", (finished_at, job_id))
+
+    def job(self, job_id):
+        """The job's row (created_at, finished_at), or None if it is unknown or forgotten."""
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT created_at, finished_at FROM rating_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+
+    def events_after(self, job_id, after_id):
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT event_json FROM rating_job_events WHERE job_id = ? AND event_id > ? ORDER BY event_id",
+                (job_id, after_id)
+            ).fetchall()
+        return [json.loads(row["event_json"]) for row in rows]
+
+    def prune(self, cutoff):
+        """Forget jobs that finished before `cutoff` (a time.time() value)."""
+        with self._connect() as connection, connection:
+            connection.execute(
+                """DELETE FROM rating_job_events WHERE job_id IN
+                   (SELECT job_id FROM rating_jobs WHERE finished_at < ?)""", (cutoff,)
+            )
+            connection.execute("DELETE FROM rating_jobs WHERE finished_at < ?", (cutoff,))
+
+
+class RatingJob:
+    """
+    Event log of one rating submission.
+
+    The process running the job appends with emit(); any process can read the
+    log through the job returned by RatingJobRegistry.get().
+    """
+
+    def __init__(self, job_id, store, changed, created_at=None, finished=False):
+        self.job_id = job_id
+        self.created_at = time.time() if created_at is None else created_at
+        self._store = store
+        # Notified on every emit in this process, so local readers need not wait for the next poll
+        self._changed = changed
+        self._finished = finished
+        self._next_id = 1
+        self._last_stage_at = self.created_at
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        if not self._finished:
+            row = self._store.job(self.job_id)
+            self._finished = row is None or row["finished_at"] is not None
+        return self._finished
+
+    def emit(self, stage, **data):
+        """Append a stage event with total and per-stage elapsed milliseconds."""
+        with self._lock:
+            if self._finished:
+                return
+            now = time.time()
+            event = {
+                "id": self._next_id,
+                "stage": stage,
+                "elapsed_ms": round((now - self.created_at) * 1000),
+                "stage_ms": round((now - self._last_stage_at) * 1000),
+                **data
+            }
+            final = stage in FINAL_STAGES
+            self._store.append(self.job_id, event, finished_at=now if final else None)
+            self._next_id += 1
+            self._last_stage_at = now
+            self._finished = final
+            current_span().add_event(stage)
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait_for_events(self, after_id, timeout):
+        """Events with id > after_id, waiting up to `timeout` seconds for the first one."""
+        deadline = time.monotonic() + timeout
+        while True:
+            # Checked before reading, so a finished job's final event is always in `events`
+            finished = self.done
+            events = self._store.events_after(self.job_id, after_id)
+            remaining = deadline - time.monotonic()
+            if events or finished or remaining <= 0:
+                return events
+            with self._changed:
+                self._changed.wait(min(RATING_JOB_POLL_SECONDS, remaining))
+
+    def snapshot(self):
+        events = self._store.events_after(self.job_id, 0)
+        return {
+            "job_id": self.job_id,
+            "status": events[-1]["stage"] if events else "queued",
+            "done": bool(events) and events[-1]["stage"] in FINAL_STAGES,
+            "events": events
+        }
+
+
+class RatingJobRegistry:
+    """Runs rating jobs on a thread pool and stores their event logs (in `db_path`) for streaming."""
+
+    def __init__(self, db_path, workers=None, ttl=None):
+        self.ttl = RATING_JOB_TTL if ttl is None else ttl
+        self.store = RatingJobStore(db_path)
+        self._executor = ThreadPoolExecutor(max_workers=workers or RATING_JOB_WORKERS,
+                                            thread_name_prefix='rating-job')
+        self._changed = threading.Condition()
+
+    def submit(self, fn, *args, **kwargs):
+        """Start `fn(job, *args, **kwargs)` in the background and return the job."""
+        self.store.prune(time.time() - self.ttl)
+        job = RatingJob(uuid.uuid4().hex, self.store, self._changed)
+        self.store.create(job.job_id, job.created_at)
+        job.emit('queued')
+        self._executor.submit(bind_current_span(self._run), job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        with span('rating_job', **{"job.id": job.job_id}) as job_span:
+            job.emit('started')
+            try:
+                fn(job, *args, **kwargs)
+            except Exception as e:
+                print(f"❌ Rating job {job.job_id} failed: {e}")
+                job_span.record_exception(e)
+                job.emit('failed', message=str(e))
+            if not job.done:
+                job.emit('failed', message="Rating job ended without a result")
+
+    def get(self, job_id):
+        """The job with this id, whichever worker process runs it, or None."""
+        row = self.store.job(job_id)
+        if row is None:
+            return None
+        return RatingJob(job_id, self.store, self._changed, created_at=row["created_at"],
+                         finished=row["finished_at"] is not None)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def format_sse(event):
+    """One event in text/event-stream wire format."""
+    return f"id: {event['id']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+
+def stream_job_events(job, last_event_id=0, heartbeat=SSE_HEARTBEAT_SECONDS):
+    """Yield a job's events as SSE until its final stage, with keep-alive comments while idle."""
+    # Tell EventSource how long to wait before reconnecting
+    yield "retry: 2000\n\n"
+    sent = last_event_id
+    while True:
+        finished = job.done
+        events = job.wait_for_events(sent, heartbeat)
+        if not events:
+            if finished:
+                return
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            yield format_sse(event)
+            sent = event["id"]
+        if events[-1]["stage"] in FINAL_STAGES:
+            return
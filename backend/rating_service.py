@@ -1,14 +1,109 @@
 import json
 import os
-import sys
-from dotenv import load_dotenv
-import google.generativeai as genai
+import time
+from pathlib import Path
 
-# Add parent directory to path to import GitHub scraper
-sys.path.append('/home/rudra/Code/hackbite')
+from backend.github_scraper import GithubScraper
+from backend.heuristic_rating import heuristic_ratings
+from backend.incremental_json import MalformedStreamError, RatingsStreamParser
+from backend.model_routing import GEMINI_FAST_MODEL, route_ratings, sparse_github_reasons
+from backend.outbound import OutboundError, llm_call, llm_stream
+from backend.prompt_budget import fit_prompt_sections, record_prompt_call, shorten
+from backend.replay import gemini_model, replay_mode
+from backend.tracing import span, traced
+
+DEFAULT_PROMPT_FILE = Path(__file__).parent.parent / 'prompt.txt'
+
+# Profiles per Gemini request in batch mode, and the token budget of each profile's data
+GEMINI_BATCH_SIZE = int(os.getenv('GEMINI_BATCH_SIZE', '5'))
+# Stream Gemini responses and parse the ratings as they arrive
+GEMINI_STREAM = os.getenv('GEMINI_STREAM', '1') != '0'
+
+PROMPT_BATCH_PROFILE_TOKENS = int(os.getenv('PROMPT_BATCH_PROFILE_TOKENS', '3000'))
+
+
+def strip_markdown_fences(response_text):
+    """Remove a ```json ... ``` wrapper around a model response."""
+    cleaned_response = response_text.strip()
+    if cleaned_response.startswith('```json'):
+        cleaned_response = cleaned_response[7:]
+    if cleaned_response.endswith('```'):
+        cleaned_response = cleaned_response[:-3]
+    return cleaned_response.strip()
+
+
+RATING_KEYS = ('git_rating', 'resume_rating', 'overall_rating')
+
+
+def validate_ratings(ratings):
+    """Raise ValueError unless `ratings` has the three scored and reasoned ratings."""
+    if not isinstance(ratings, dict):
+        raise ValueError("Ratings must be a JSON object")
+    for key in RATING_KEYS:
+        if key not in ratings:
+            raise ValueError(f"Missing key: {key}")
+        if 'score' not in ratings[key]:
+            raise ValueError(f"Missing score in {key}")
+        if 'reasoning' not in ratings[key]:
+            raise ValueError(f"Missing reasoning in {key}")
+    return ratings
+
+
+def parse_ratings_json(response_text):
+    """Parse and validate a ratings JSON response from Gemini."""
+    try:
+        # Clean response - remove any markdown formatting
+        cleaned_response = strip_markdown_fences(response_text)
+
+        # Parse JSON
+        ratings = json.loads(cleaned_response)
+
+        # Validate structure
+        return validate_ratings(ratings)
+
+    except json.JSONDecodeError as e:
+        print(f"JSON decode error: {e}")
+        print(f"Response text: {response_text}")
+        raise
+    except Exception as e:
+        print(f"Error parsing response: {e}")
+        raise
+
+
+def parse_batch_ratings_json(response_text, profile_ids):
+    """
+    Parse a batch response (JSON array of ratings tagged with profile_id).
+
+    Returns {profile_id: ratings} for the items that validate; items that are
+    missing, unknown or malformed are skipped so the caller can retry them.
+    An unparseable array raises like parse_ratings_json.
+    """
+    items = json.loads(strip_markdown_fences(response_text))
+    if not isinstance(items, list):
+        raise ValueError("Batch response must be a JSON array")
+
+    expected = set(profile_ids)
+    results = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            print(f"Skipping batch item {index}: not a JSON object")
+            continue
+        if 'profile_id' in item:
+            profile_id = str(item['profile_id'])
+        else:
+            # Fall back to position when the model dropped the id
+            profile_id = profile_ids[index] if index < len(profile_ids) else None
+        if profile_id not in expected or profile_id in results:
+            print(f"Skipping batch item {index}: unexpected or duplicate profile_id {profile_id!r}")
+            continue
+        try:
+            ratings = validate_ratings({key: value for key, value in item.items() if key != 'profile_id'})
+        except ValueError as e:
+            print(f"Invalid ratings for profile {profile_id}: {e}")
+            continue
+        results[profile_id] = ratings
+    return results
 
-# Load environment variables
-load_dotenv()
 
 class RatingService:
     def __init__(self):
@@ -16,110 +111,194 @@ class RatingService:
         self.api_key = os.getenv('GEMINI_API_KEY')
         self.model_name = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-exp')
         
-        if not self.api_key:
+        if not self.api_key and replay_mode() != 'replay':
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
-        # Configure Gemini API
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(self.model_name)
+        # Configure Gemini API (REPLAY_MODE=replay substitutes an offline fake)
+        self.model = gemini_model(self.model_name, self._create_live_model)
+        # Cheaper model tried first; None disables routing
+        self.fast_model_name = GEMINI_FAST_MODEL or None
+        self.fast_model = None
+        if self.fast_model_name:
+            self.fast_model = gemini_model(self.fast_model_name,
+                                           lambda: self._create_live_model(self.fast_model_name))
         
         # Load prompt template
         self.prompt_template = self._load_prompt_template()
     
+    def _create_live_model(self, model_name=None):
+        # Imported on first use: the SDK takes most of a second to import and replay mode never needs it
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(model_name or self.model_name)
+    
     def _load_prompt_template(self):
-        """Load the prompt template from prompt.txt."""
-        prompt_path = '/home/rudra/Code/hackbite/1/prompt.txt'
+        """Load the prompt template (PROMPT_FILE, default: prompt.txt in the project root)."""
+        prompt_path = os.getenv('PROMPT_FILE', str(DEFAULT_PROMPT_FILE))
         try:
             with open(prompt_path, 'r') as f:
                 return f.read()
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt template not found at {prompt_path}")
     
-    def generate_ratings(self, github_url, resume_text):
+    def generate_ratings(self, github_url, resume_text, on_rating=None, stream=None, scraped_github=None):
         """
         Generate ratings using Gemini API based on GitHub profile and resume.
         
         Args:
             github_url (str): GitHub profile URL
             resume_text (str): Extracted resume text
+            on_rating (callable): called as on_rating(name, rating) as soon as each of
+                git_rating, resume_rating and overall_rating is available
+            stream (bool): stream the response and parse it incrementally (default GEMINI_STREAM)
+            scraped_github (dict): GithubScraper.scrape_profile() output, if already scraped
             
         Returns:
             dict: JSON response with git_rating, resume_rating, and overall_rating
+            (local heuristic ratings if Gemini's answer is unusable)
         """
+        github_data = None
         try:
             # Extract GitHub username from URL
             github_username = self._extract_github_username(github_url)
             
-            # Import and use GitHub scraper
-            try:
-                import importlib.util
-                spec = importlib.util.spec_from_file_location("github_scraper", "/home/rudra/Code/hackbite/2.py")
-                github_scraper_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(github_scraper_module)
-                
-                # Create scraper instance and use it
-                scraper = github_scraper_module.GithubScraper(github_username)
-                github_data = scraper.scrape_profile()
-                
-                # Convert the data format to match our expected structure
-                if github_data:
-                    # Extract useful metrics from the scraped data
-                    total_stars = 0
-                    analyzed_repos = github_data.get('analyzedRepositories', [])
-                    total_repos = len(analyzed_repos)
-                    
-                    # Debug: print the actual structure
-                    print(f"DEBUG: First repo structure: {analyzed_repos[0] if analyzed_repos else 'No repos'}")
-                    
-                    for repo in analyzed_repos:
-                        if isinstance(repo, dict):
-                            total_stars += repo.get('stars', 0)
-                    
-                    # Convert to simplified format
-                    github_data = {
-                        'username': github_username,
-                        'total_repos': total_repos,
-                        'total_stars': total_stars,
-                        'total_forks': 0,  # Not readily available in new format
-                        'following': 0,    # Not readily available in new format
-                        'followers': 0,    # Not readily available in new format
-                        'repositories': analyzed_repos  # Keep original format for prompt
-                    }
-                else:
-                    raise Exception("No data returned from scraper")
-                    
-            except Exception as scraper_error:
-                print(f"GitHub scraper error: {scraper_error}")
-                # Create minimal GitHub data for fallback
-                github_data = {
-                    'username': github_username,
-                    'total_repos': 0,
-                    'total_stars': 0,
-                    'total_forks': 0,
-                    'following': 0,
-                    'followers': 0,
-                    'repositories': []
-                }
+            if scraped_github:
+                github_data = self._summarize_github_data(github_username, scraped_github)
+            else:
+                github_data = self._collect_github_data(github_username)
             
             # Prepare the analysis prompt
-            analysis_prompt = self._create_analysis_prompt(github_data, resume_text)
-            
-            # Call Gemini API
-            response = self.model.generate_content(analysis_prompt)
+            with span('prompt.build') as prompt_span:
+                analysis_prompt = self._create_analysis_prompt(github_data, resume_text)
+                prompt_span.set_attribute('prompt.characters', len(analysis_prompt))
             
-            # Parse JSON response
-            ratings_json = self._parse_json_response(response.text)
+            stream = GEMINI_STREAM if stream is None else stream
             
-            return ratings_json
+            ratings, tier = route_ratings(
+                analysis_prompt,
+                (lambda: self._call_model(self.fast_model, analysis_prompt, stream=stream)) if self.fast_model else None,
+                lambda: self._call_model(self.model, analysis_prompt, on_rating, stream),
+                self.fast_model_name, self.model_name,
+                skip_reasons=sparse_github_reasons(github_data))
+            # The fast model's answer is only reported once routing has accepted it
+            if tier == 'fast' and on_rating:
+                for key in RATING_KEYS:
+                    on_rating(key, ratings[key])
+            return ratings
             
+        except OutboundError:
+            # Gemini is throttled or down: fail fast instead of storing zero scores
+            raise
         except Exception as e:
-            print(f"Error generating ratings: {e}")
-            # Return default ratings on error
-            return {
-                "git_rating": {"score": 0, "reasoning": ["Error occurred during rating generation"]},
-                "resume_rating": {"score": 0, "reasoning": ["Error occurred during rating generation"]}, 
-                "overall_rating": {"score": 0, "reasoning": ["Error occurred during rating generation"]}
+            print(f"Error generating ratings: {e}; falling back to heuristic ratings")
+            return heuristic_ratings(github_data, resume_text)
+    
+    def _call_model(self, model, analysis_prompt, on_rating=None, stream=False):
+        """Ratings from one model, validated; raises on unusable output."""
+        with span('llm.generate', **{"llm.model": getattr(model, 'model_name', None), "llm.stream": stream}):
+            if stream:
+                return self._generate_streaming(model, analysis_prompt, on_rating)
+            
+            # Call Gemini API (rate limited, retried and circuit-broken)
+            started = time.perf_counter()
+            response = llm_call('gemini', model.generate_content, analysis_prompt)
+            record_prompt_call('rating_service', analysis_prompt, time.perf_counter() - started, response)
+        
+        # Parse JSON response
+        ratings_json = self._parse_json_response(response.text)
+        if on_rating:
+            for key in RATING_KEYS:
+                on_rating(key, ratings_json[key])
+        return ratings_json
+    
+    def _generate_streaming(self, model, analysis_prompt, on_rating=None):
+        """
+        Stream the Gemini response, emitting each rating as soon as its object closes.
+        
+        Malformed output raises MalformedStreamError at the first bad character;
+        the rest of the stream is abandoned rather than waited for. A stream that
+        breaks off is retried from the start; ratings already emitted are only
+        emitted again if the retry changes them.
+        """
+        started = time.perf_counter()
+        emitted = {}
+        
+        def read(chunks):
+            parser = RatingsStreamParser()
+            first_score_latency = None
+            last_chunk = None
+            for chunk in chunks:
+                last_chunk = chunk
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks carrying only metadata (e.g. the finish reason) have no text
+                    continue
+                for key, rating in parser.feed(text):
+                    if key not in RATING_KEYS:
+                        continue
+                    if first_score_latency is None:
+                        first_score_latency = time.perf_counter() - started
+                    if on_rating and emitted.get(key) != rating:
+                        emitted[key] = rating
+                        on_rating(key, rating)
+                if parser.done:
+                    break
+            record_prompt_call('rating_service', analysis_prompt, time.perf_counter() - started, last_chunk,
+                               first_score_latency=first_score_latency)
+            if not parser.done:
+                raise MalformedStreamError("Response ended before the ratings object was complete")
+            return validate_ratings(parser.members)
+        
+        # The whole read goes through the outbound layer, so the slot is held until the stream ends
+        return llm_stream('gemini', model.generate_content, read, analysis_prompt)
+    
+    def _collect_github_data(self, github_username):
+        """Scrape GitHub (rate limited through the shared outbound layer) into the prompt's format."""
+        try:
+            scraper = GithubScraper(github_username)
+            github_data = scraper.scrape_profile()
+            
+            # Convert the data format to match our expected structure
+            if github_data:
+                github_data = self._summarize_github_data(github_username, github_data)
+            else:
+                raise Exception("No data returned from scraper")
+                
+        except Exception as scraper_error:
+            print(f"GitHub scraper error: {scraper_error}")
+            # Create minimal GitHub data for fallback
+            github_data = {
+                'username': github_username,
+                'total_repos': 0,
+                'total_stars': 0,
+                'total_forks': 0,
+                'following': 0,
+                'followers': 0,
+                'repositories': []
             }
+        return github_data
+    
+    def _summarize_github_data(self, github_username, scraped):
+        """Scraper output in the prompt's format."""
+        # Extract useful metrics from the scraped data
+        total_stars = 0
+        analyzed_repos = scraped.get('analyzedRepositories', [])
+        
+        for repo in analyzed_repos:
+            if isinstance(repo, dict):
+                total_stars += repo.get('stars', 0)
+        
+        return {
+            'username': github_username,
+            'total_repos': len(analyzed_repos),
+            'total_stars': total_stars,
+            'total_forks': 0,  # Not readily available in new format
+            'following': 0,    # Not readily available in new format
+            'followers': 0,    # Not readily available in new format
+            'contributionStats': scraped.get('contributionStats', {}),
+            'repositories': analyzed_repos  # Keep original format for prompt
+        }
     
     def _extract_github_username(self, github_url):
         """Extract username from GitHub URL."""
@@ -129,8 +308,34 @@ class RatingService:
     
     def _create_analysis_prompt(self, github_data, resume_text):
         """Create the analysis prompt combining GitHub data and resume."""
+        github_summary = self._format_github_summary(github_data)
         
-        # Format GitHub data
+        # Combine with resume, trimmed to the prompt token budget
+        prompt_frame = """
+{template}
+
+=== DATA TO ANALYZE ===
+
+{github_summary}
+
+Resume Content:
+{resume_text}
+
+=== END DATA ===
+
+Please analyze the above data and respond with the JSON rating structure only.
+"""
+        fitted = fit_prompt_sections(
+            prompt_frame.format(template=self.prompt_template, github_summary='', resume_text=''),
+            github_summary, resume_text)
+        full_prompt = prompt_frame.format(template=self.prompt_template,
+                                          github_summary=fitted['github_text'],
+                                          resume_text=fitted['resume_text'])
+        
+        return full_prompt
+    
+    def _format_github_summary(self, github_data):
+        """Format scraped GitHub data for the prompt."""
         github_summary = f"""
 GitHub Profile Analysis:
 - Username: {github_data.get('username', 'N/A')}
@@ -151,7 +356,7 @@ Top Repositories:
                 name = repo.get('name', 'Unknown')
                 language = repo.get('primaryLanguage', repo.get('language', 'N/A'))
                 stars = repo.get('stars', 0)
-                description = repo.get('description', 'No description')
+                description = shorten(repo.get('description') or 'No description')
                 
                 github_summary += f"""
 {i}. {name}
@@ -165,57 +370,114 @@ Top Repositories:
 {i}. Repository data: {str(repo)[:100]}...
 """
         
-        # Combine with resume
-        full_prompt = f"""
-{self.prompt_template}
+        return github_summary
+    
+    def generate_ratings_batch(self, profiles, batch_size=None):
+        """
+        Rate several candidates with one Gemini request per batch.
+        
+        Args:
+            profiles (list): dicts with 'profile_id', 'resume_text' and either
+                'github_url' or pre-scraped 'github_data' (as from _collect_github_data)
+            batch_size (int): profiles per request (default GEMINI_BATCH_SIZE)
+            
+        Returns:
+            dict: profile_id -> ratings dict. Profiles the batch answer is missing
+            or invalid for are retried with a single-profile request.
+        """
+        batch_size = batch_size or GEMINI_BATCH_SIZE
+        prepared = []
+        for profile in profiles:
+            github_data = profile.get('github_data')
+            if github_data is None:
+                github_data = self._collect_github_data(self._extract_github_username(profile['github_url']))
+            prepared.append((str(profile['profile_id']), github_data, profile.get('resume_text') or ''))
+        
+        results = {}
+        for start in range(0, len(prepared), batch_size):
+            batch = prepared[start:start + batch_size]
+            batch_results = {}
+            if len(batch) > 1:
+                batch_prompt = self._create_batch_prompt(batch)
+                try:
+                    started = time.perf_counter()
+                    response = llm_call('gemini', self.model.generate_content, batch_prompt)
+                    record_prompt_call('rating_service_batch', batch_prompt, time.perf_counter() - started, response)
+                    batch_results = self._parse_json_response(response.text, [profile_id for profile_id, _, _ in batch])
+                except OutboundError:
+                    raise
+                except Exception as e:
+                    print(f"Batch of {len(batch)} profiles failed, rating individually: {e}")
+            
+            for profile_id, github_data, resume_text in batch:
+                ratings = batch_results.get(profile_id)
+                if ratings is None:
+                    ratings = self._rate_single(github_data, resume_text)
+                results[profile_id] = ratings
+        
+        return results
+    
+    def _rate_single(self, github_data, resume_text):
+        """Single-profile request for already-collected GitHub data."""
+        try:
+            analysis_prompt = self._create_analysis_prompt(github_data, resume_text)
+            started = time.perf_counter()
+            response = llm_call('gemini', self.model.generate_content, analysis_prompt)
+            record_prompt_call('rating_service', analysis_prompt, time.perf_counter() - started, response)
+            return self._parse_json_response(response.text)
+        except OutboundError:
+            raise
+        except Exception as e:
+            print(f"Error generating ratings: {e}; falling back to heuristic ratings")
+            return heuristic_ratings(github_data, resume_text)
+    
+    def _create_batch_prompt(self, batch):
+        """Prompt for several profiles, each between delimiters, answered as one JSON array."""
+        profile_ids = [profile_id for profile_id, _, _ in batch]
+        batch_frame = """
+{template}
 
-=== DATA TO ANALYZE ===
+=== BATCH INSTRUCTIONS ===
+This request contains {count} independent candidate profiles, each between
+"=== PROFILE <id> START ===" and "=== PROFILE <id> END ===". Rate every profile
+on its own, exactly as described above, and respond ONLY with a JSON array that
+has one object per profile, in the same order:
+[{{"profile_id": "<id>", "git_rating": {{...}}, "resume_rating": {{...}}, "overall_rating": {{...}}}}, ...]
+Profile ids: {profile_ids}
 
+{profiles}
+"""
+        profile_frame = """
+=== PROFILE {profile_id} START ===
 {github_summary}
 
 Resume Content:
 {resume_text}
-
-=== END DATA ===
-
-Please analyze the above data and respond with the JSON rating structure only.
+=== PROFILE {profile_id} END ===
 """
+        sections = []
+        for profile_id, github_data, resume_text in batch:
+            fitted = fit_prompt_sections(
+                profile_frame.format(profile_id=profile_id, github_summary='', resume_text=''),
+                self._format_github_summary(github_data), resume_text,
+                max_tokens=PROMPT_BATCH_PROFILE_TOKENS)
+            sections.append(profile_frame.format(profile_id=profile_id, github_summary=fitted['github_text'],
+                                                 resume_text=fitted['resume_text']))
         
-        return full_prompt
+        return batch_frame.format(template=self.prompt_template, count=len(batch),
+                                  profile_ids=', '.join(profile_ids), profiles=''.join(sections))
     
-    def _parse_json_response(self, response_text):
-        """Parse and validate JSON response from Gemini."""
-        try:
-            # Clean response - remove any markdown formatting
-            cleaned_response = response_text.strip()
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
-            
-            # Parse JSON
-            ratings = json.loads(cleaned_response)
-            
-            # Validate structure
-            required_keys = ['git_rating', 'resume_rating', 'overall_rating']
-            for key in required_keys:
-                if key not in ratings:
-                    raise ValueError(f"Missing key: {key}")
-                if 'score' not in ratings[key]:
-                    raise ValueError(f"Missing score in {key}")
-                if 'reasoning' not in ratings[key]:
-                    raise ValueError(f"Missing reasoning in {key}")
-            
-            return ratings
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            print(f"Response text: {response_text}")
-            raise
-        except Exception as e:
-            print(f"Error parsing response: {e}")
-            raise
+    @traced('llm.parse')
+    def _parse_json_response(self, response_text, profile_ids=None):
+        """
+        Parse and validate JSON response from Gemini.
+        
+        With `profile_ids` the response is a batch array, split into
+        {profile_id: ratings}; invalid or missing profiles are left out.
+        """
+        if profile_ids is not None:
+            return parse_batch_ratings_json(response_text, profile_ids)
+        return parse_ratings_json(response_text)
 
 def test_rating_service():
     """Test the rating service with sample data."""
@@ -0,0 +1,506 @@
+"""
+Offline record/replay stand-ins for GitHub and Gemini.
+
+A cassette is a JSON file holding recorded HTTP exchanges and LLM
+prompt/response pairs:
+
+    {"version": 1,
+     "http": [{"method": "GET", "url": "https://github.com/octocat",
+               "status": 200, "headers": {"Content-Type": "text/html"}, "body": "..."}],
+     "llm":  [{"prompt_sha256": "...", "prompt_chars": 1234, "model": "...", "response": "..."}]}
+
+REPLAY_MODE selects the behaviour (REPLAY_CASSETTE is the file):
+
+    off     live GitHub and Gemini (default)
+    record  live calls, every GitHub response and Gemini answer is appended to the cassette
+            (written every REPLAY_SAVE_EVERY new entries and when the process shuts down)
+    replay  Gemini is a FakeGeminiModel answering from the cassette (or synthesising a
+            deterministic rating), GitHub is served by StubGithubServer - start it with
+            `python -m backend.replay serve CASSETTE` and point GITHUB_BASE_URL /
+            GITHUB_RAW_BASE_URL at it
+
+FAKE_GEMINI_LATENCY (seconds), FAKE_GEMINI_JITTER, FAKE_GEMINI_PER_1K_PROMPT_CHARS,
+FAKE_GEMINI_PER_1K_OUTPUT_CHARS and FAKE_GEMINI_FAILURE_RATE (0..1) shape the
+fake model so load tests see realistic timing and retries.
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from backend import outbound
+
+CASSETTE_VERSION = 1
+
+# While recording, rewrite the cassette file after this many new entries (and at shutdown)
+REPLAY_SAVE_EVERY = int(os.getenv('REPLAY_SAVE_EVERY', '50'))
+
+# Hosts the stub server impersonates, and the path prefix each is served under
+STUB_HOSTS = {
+    "github.com": "",
+    "raw.githubusercontent.com": "/raw",
+}
+
+# Response headers worth keeping in a cassette
+RECORDED_HEADERS = ('Content-Type', 'Content-Length', 'Retry-After', 'X-RateLimit-Remaining')
+
+
+def replay_mode():
+    return os.getenv('REPLAY_MODE', 'off').lower()
+
+
+def prompt_digest(prompt):
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Recorded HTTP exchanges and LLM responses, persisted as JSON."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.http = []
+        self.llm = []
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a cassette, or return an empty one if the file does not exist yet."""
+        cassette = cls(path)
+        if cassette.path.exists():
+            with open(cassette.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {data.get('version')} in {path}")
+            cassette.http = data.get('http', [])
+            cassette.llm = data.get('llm', [])
+        return cassette
+
+    def save(self):
+        """Write the cassette atomically."""
+        with self._lock:
+            self._write()
+
+    def checkpoint(self, every=None):
+        """Save once `every` (default REPLAY_SAVE_EVERY) entries have been added since the last save."""
+        with self._lock:
+            if self._unsaved >= (every or REPLAY_SAVE_EVERY):
+                self._write()
+
+    def flush(self):
+        """Save if anything was added since the last save."""
+        with self._lock:
+            if self._unsaved:
+                self._write()
+
+    def _write(self):
+        # Caller holds self._lock; the temporary file is unique so concurrent writers never share it
+        data = {"version": CASSETTE_VERSION, "http": self.http, "llm": self.llm}
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.path.parent,
+                                         prefix=self.path.name + '.', suffix='.tmp', delete=False) as f:
+            try:
+                json.dump(data, f, indent=1)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self.path)
+        self._unsaved = 0
+
+    def add_http(self, method, url, status, headers=None, body=''):
+        entry = {"method": method.upper(), "url": url, "status": status,
+                 "headers": dict(headers or {}), "body": body}
+        with self._lock:
+            # Keep only the latest exchange for a request
+            self.http = [e for e in self.http if (e["method"], e["url"]) != (entry["method"], url)]
+            self.http.append(entry)
+            self._unsaved += 1
+        return entry
+
+    def find_http(self, method, url):
+        with self._lock:
+            for entry in reversed(self.http):
+                if entry["method"] == method.upper() and entry["url"] == url:
+                    return entry
+        return None
+
+    def add_llm(self, prompt, response_text, model=None):
+        digest = prompt_digest(prompt)
+        entry = {"prompt_sha256": digest, "prompt_chars": len(prompt), "model": model, "response": response_text}
+        with self._lock:
+            self.llm = [e for e in self.llm if e["prompt_sha256"] != digest]
+            self.llm.append(entry)
+            self._unsaved += 1
+        return entry
+
+    def find_llm(self, prompt):
+        digest = prompt_digest(prompt)
+        with self._lock:
+            for entry in self.llm:
+                if entry["prompt_sha256"] == digest:
+                    return entry["response"]
+        return None
+
+
+_active_cassette = None
+_active_cassette_lock = threading.Lock()
+
+
+def active_cassette():
+    """The REPLAY_CASSETTE cassette shared by this process (None when REPLAY_MODE=off)."""
+    global _active_cassette
+    if replay_mode() == 'off':
+        return None
+    with _active_cassette_lock:
+        if _active_cassette is None:
+            _active_cassette = Cassette.load(os.getenv('REPLAY_CASSETTE', 'replay_cassette.json'))
+            if replay_mode() == 'record':
+                outbound.add_http_observer(HttpRecorder(_active_cassette))
+                atexit.register(_active_cassette.flush)
+                print(f"📼 Recording GitHub and Gemini traffic to {_active_cassette.path}")
+            else:
+                print(f"📼 Replaying Gemini responses from {_active_cassette.path}")
+        return _active_cassette
+
+
+def flush_active_cassette():
+    """Write out entries recorded since the last checkpoint (no-op unless recording)."""
+    with _active_cassette_lock:
+        cassette = _active_cassette
+    if cassette is not None:
+        cassette.flush()
+
+
+class HttpRecorder:
+    """outbound HTTP observer that appends every response to a cassette."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def __call__(self, method, url, response):
+        headers = {key: response.headers[key] for key in RECORDED_HEADERS if key in response.headers}
+        body = '' if method.upper() == 'HEAD' else response.text
+        self.cassette.add_http(method, url, response.status_code, headers, body)
+        self.cassette.checkpoint()
+
+
+# ---------------------------------------------------------------------------
+# GitHub stub server
+# ---------------------------------------------------------------------------
+
+def stub_path(url):
+    """Path under which the stub server serves a recorded URL (None for hosts it does not mimic)."""
+    parts = urlsplit(url)
+    prefix = STUB_HOSTS.get(parts.hostname)
+    if prefix is None:
+        return None
+    return prefix + parts.path + (f"?{parts.query}" if parts.query else '')
+
+
+class StubGithubServer:
+    """
+    Local HTTP server answering GitHub and raw.githubusercontent.com requests from a cassette.
+
+    Point the scraper at `base_url` / `raw_base_url` (GITHUB_BASE_URL and
+    GITHUB_RAW_BASE_URL). HEAD requests are answered from recorded GETs too;
+    anything not recorded is a 404, like a missing README on GitHub.
+    """
+
+    def __init__(self, cassette, host='127.0.0.1', port=0, latency=0.0):
+        self.routes = {}
+        for entry in cassette.http:
+            path = stub_path(entry["url"])
+            if path is not None:
+                self.routes[(entry["method"], path)] = entry
+        self.latency = latency
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def raw_base_url(self):
+        return self.base_url + STUB_HOSTS["raw.githubusercontent.com"]
+
+    def lookup(self, method, path):
+        entry = self.routes.get((method, path))
+        if entry is None:
+            entry = self.routes.get(('GET', path)) or self.routes.get(('HEAD', path))
+        if entry is None and '?' in path:
+            # Contribution URLs carry a date range that changes between recordings
+            return self.lookup(method, path.split('?', 1)[0])
+        return entry
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self, send_body):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                entry = stub.lookup(self.command, self.path)
+                body = (entry or {}).get("body", '').encode('utf-8')
+                headers = dict((entry or {}).get("headers", {}))
+                self.send_response(entry["status"] if entry else 404)
+                self.send_header('Content-Type', headers.pop('Content-Type', 'text/html; charset=utf-8'))
+                recorded_length = headers.pop('Content-Length', None)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                # Recorded HEADs have no body but keep the real file size
+                if self.command == 'HEAD' and recorded_length and not body:
+                    self.send_header('Content-Length', recorded_length)
+                else:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+# ---------------------------------------------------------------------------
+# Gemini stand-ins
+# ---------------------------------------------------------------------------
+
+class ResourceExhausted(Exception):
+    """Injected failure; named like google.api_core's 429 so llm_call retries it."""
+
+
+# Characters per chunk when the fake streams (roughly what Gemini sends per chunk)
+STREAM_CHUNK_CHARS = 64
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+_BATCH_PROFILE_RE = re.compile(r'=== PROFILE (\S+) START ===\n(.*?)=== PROFILE \1 END ===', re.DOTALL)
+
+
+def _synthetic_rating(seed_text):
+    rng = random.Random(prompt_digest(seed_text))
+    # Same 0-1000 scale and bullet count as prompt.txt asks for
+    git_score, resume_score = rng.randint(300, 950), rng.randint(300, 950)
+    overall_score = round((git_score + resume_score) / 2)
+    reasoning = ["Synthetic rating from FakeGeminiModel", "Derived from a hash of the prompt",
+                 "Not a real assessment"]
+    return {
+        "git_rating": {"score": git_score, "reasoning": list(reasoning)},
+        "resume_rating": {"score": resume_score, "reasoning": list(reasoning)},
+        "overall_rating": {"score": overall_score, "reasoning": list(reasoning)},
+    }
+
+
+def synthetic_ratings(prompt):
+    """
+    Deterministic, well-formed ratings JSON derived from the prompt text.
+
+    Batch prompts (profiles between "=== PROFILE <id> START/END ===") get a JSON
+    array with one rating per profile, each derived from that profile's text.
+    """
+    profiles = _BATCH_PROFILE_RE.findall(prompt)
+    if profiles:
+        return json.dumps([{"profile_id": profile_id, **_synthetic_rating(text)} for profile_id, text in profiles])
+    return json.dumps(_synthetic_rating(prompt))
+
+
+class FakeGeminiModel:
+    """
+    Drop-in for genai.GenerativeModel: answers from a cassette, or with
+    synthetic ratings, after `latency` (+/- `jitter`) seconds plus
+    `per_1k_prompt_chars` / `per_1k_output_chars` seconds per thousand
+    characters in and out, failing a `failure_rate` fraction of calls with
+    ResourceExhausted.
+    """
+
+    def __init__(self, cassette=None, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None, model_name='fake-gemini',
+                 per_1k_prompt_chars=0.0, per_1k_output_chars=0.0):
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.per_1k_prompt_chars = per_1k_prompt_chars
+        self.per_1k_output_chars = per_1k_output_chars
+        self.model_name = model_name
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls, cassette=None, model_name='fake-gemini'):
+        return cls(cassette,
+                   latency=float(os.getenv('FAKE_GEMINI_LATENCY', '0')),
+                   jitter=float(os.getenv('FAKE_GEMINI_JITTER', '0')),
+                   failure_rate=float(os.getenv('FAKE_GEMINI_FAILURE_RATE', '0')),
+                   seed=os.getenv('FAKE_GEMINI_SEED'),
+                   model_name=model_name,
+                   per_1k_prompt_chars=float(os.getenv('FAKE_GEMINI_PER_1K_PROMPT_CHARS', '0')),
+                   per_1k_output_chars=float(os.getenv('FAKE_GEMINI_PER_1K_OUTPUT_CHARS', '0')))
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        with self._rng_lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.failure_rate
+        if fail:
+            time.sleep(delay)
+            raise ResourceExhausted("Injected failure: quota exceeded")
+        recorded = self.cassette.find_llm(prompt) if self.cassette else None
+        text = recorded if recorded is not None else synthetic_ratings(prompt)
+        # Time to first token, then output time proportional to length
+        time.sleep(delay + len(prompt) * self.per_1k_prompt_chars / 1000)
+        if stream:
+            return self._stream(text)
+        time.sleep(len(text) * self.per_1k_output_chars / 1000)
+        return FakeResponse(text)
+
+    def _stream(self, text, chunk_chars=STREAM_CHUNK_CHARS):
+        for start in range(0, len(text), chunk_chars):
+            chunk = text[start:start + chunk_chars]
+            time.sleep(len(chunk) * self.per_1k_output_chars / 1000)
+            yield FakeResponse(chunk)
+
+
+class RecordingModel:
+    """Wraps a real model and records each prompt and response text into a cassette."""
+
+    def __init__(self, model, cassette, model_name=None):
+        self.model = model
+        self.cassette = cassette
+        self.model_name = model_name
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        if stream:
+            return self._record_stream(prompt, self.model.generate_content(prompt, stream=True, **kwargs))
+        response = self.model.generate_content(prompt, **kwargs)
+        self.cassette.add_llm(prompt, response.text, self.model_name)
+        self.cassette.checkpoint()
+        return response
+
+    def _record_stream(self, prompt, chunks):
+        texts = []
+        for chunk in chunks:
+            texts.append(chunk.text)
+            yield chunk
+        self.cassette.add_llm(prompt, ''.join(texts), self.model_name)
+        self.cassette.checkpoint()
+
+
+class _FakeClientModels:
+    """`client.models` for google.genai-style callers, backed by a FakeGeminiModel."""
+
+    def __init__(self, fake):
+        self._fake = fake
+
+    def generate_content(self, model=None, contents=None, **kwargs):
+        return self._fake.generate_content(contents)
+
+
+class _RecordingClientModels:
+    """`client.models` wrapper recording each call's contents and response text."""
+
+    def __init__(self, models, cassette):
+        self._models = models
+        self._cassette = cassette
+
+    def generate_content(self, model=None, contents=None, **kwargs):
+        response = self._models.generate_content(model=model, contents=contents, **kwargs)
+        self._cassette.add_llm(contents, response.text, model)
+        self._cassette.checkpoint()
+        return response
+
+
+class ReplayClient:
+    """google.genai.Client stand-in exposing only `models.generate_content`."""
+
+    def __init__(self, models):
+        self.models = models
+
+
+def gemini_model(model_name, make_live_model):
+    """
+    Model for RatingService according to REPLAY_MODE.
+
+    `make_live_model()` is only called when a real model is needed, so replay
+    runs need neither an API key nor network access.
+    """
+    mode = replay_mode()
+    if mode == 'replay':
+        return FakeGeminiModel.from_env(active_cassette(), model_name)
+    model = make_live_model()
+    if mode == 'record':
+        return RecordingModel(model, active_cassette(), model_name)
+    return model
+
+
+def gemini_client(make_live_client):
+    """google.genai client for rating_generator.py according to REPLAY_MODE."""
+    mode = replay_mode()
+    if mode == 'replay':
+        return ReplayClient(_FakeClientModels(FakeGeminiModel.from_env(active_cassette())))
+    client = make_live_client()
+    if mode == 'record':
+        return ReplayClient(_RecordingClientModels(client.models, active_cassette()))
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a recorded cassette as a stub GitHub server')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    serve = subcommands.add_parser('serve', help='Serve recorded GitHub pages over HTTP')
+    serve.add_argument('cassette', help='Cassette JSON file')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0, help='Seconds to delay every response')
+    args = parser.parse_args()
+
+    cassette = Cassette.load(args.cassette)
+    server = StubGithubServer(cassette, args.host, args.port, args.latency)
+    print(f"📼 Serving {len(server.routes)} recorded responses")
+    print(f"   GITHUB_BASE_URL={server.base_url}")
+    print(f"   GITHUB_RAW_BASE_URL={server.raw_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stub server stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+On-demand cProfile of single requests.
+
+An operator asks for a profile by adding `X-Profile: 1` (or `?_profile=1`)
+to an ordinary request together with the admin secret (see backend/admin.py).
+The request is then run under cProfile, from before_request until the
+response is built, and the stats are written with Profile.dump_stats() to
+PROFILE_DIR, which snakeviz, gprof2dot, flameprof and pstats read directly.
+The response carries the file name in X-Profile-Id; the admin routes
+/api/admin/profiles list and download the files, or return the top of the
+pstats report as text.
+
+Requests without the admin secret are never profiled and see no difference.
+Abuse limits, in this order:
+    - one profile at a time per process; others run unprofiled (X-Profile-Status: busy)
+    - a token bucket of PROFILE_RATE_PER_MINUTE with PROFILE_BURST (X-Profile-Status: rate_limited)
+    - only the newest PROFILE_KEEP files are kept
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from flask import g, request
+
+from backend.admin import is_admin_request
+from backend.outbound import TokenBucket
+
+PROFILE_DIR = os.getenv('PROFILE_DIR') or str(Path(__file__).parent.parent / "profiles")
+PROFILE_RATE_PER_MINUTE = float(os.getenv('PROFILE_RATE_PER_MINUTE', '6'))
+PROFILE_BURST = int(os.getenv('PROFILE_BURST', '2'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))
+
+PROFILE_NAME = re.compile(r'^[\w.-]+\.prof$')
+
+
+class RequestProfiler:
+    """Profiles requests that ask for it, within the rate and concurrency limits."""
+
+    def __init__(self, directory=None, rate_per_minute=None, burst=None, keep=None):
+        self.directory = Path(directory or PROFILE_DIR)
+        rate_per_minute = PROFILE_RATE_PER_MINUTE if rate_per_minute is None else rate_per_minute
+        self.bucket = TokenBucket(rate_per_minute / 60.0, PROFILE_BURST if burst is None else burst)
+        self.keep = PROFILE_KEEP if keep is None else keep
+        self._running = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"profiled": 0, "busy": 0, "rate_limited": 0}
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def requested():
+        flag = request.headers.get('X-Profile') or request.args.get('_profile')
+        return flag in ('1', 'true', 'yes') and is_admin_request()
+
+    def start_request(self):
+        if not self.requested():
+            return
+        if not self._running.acquire(blocking=False):
+            self._count("busy")
+            g.profile_status = 'busy'
+            return
+        if self.bucket.try_acquire() != 0:
+            self._running.release()
+            self._count("rate_limited")
+            g.profile_status = 'rate_limited'
+            return
+        profile = cProfile.Profile()
+        g.profile = (profile, time.perf_counter())
+        profile.enable()
+
+    def finish_request(self, response):
+        status = g.pop('profile_status', None)
+        if status:
+            response.headers['X-Profile-Status'] = status
+        running = g.pop('profile', None)
+        if running is None:
+            return response
+        profile, started = running
+        profile.disable()
+        elapsed = time.perf_counter() - started
+        try:
+            name = self._save(profile)
+        finally:
+            self._running.release()
+        self._count("profiled")
+        response.headers['X-Profile-Status'] = 'profiled'
+        response.headers['X-Profile-Id'] = name
+        response.headers['X-Profile-Seconds'] = f"{elapsed:.4f}"
+        print(f"🔬 Profiled {request.method} {request.path} in {elapsed:.3f}s -> {name}")
+        return response
+
+    def teardown_request(self, exception=None):
+        # after_request did not run (the response could not be built); drop the profile
+        running = g.pop('profile', None)
+        if running is not None:
+            running[0].disable()
+            self._running.release()
+
+    def _save(self, profile):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        route = request.url_rule.rule if request.url_rule else request.path
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_')[:60] or 'root'
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S.%f')[:-3]
+        name = f"{stamp}-{os.getpid()}-{request.method}-{slug}.prof"
+        profile.dump_stats(str(self.directory / name))
+        self._prune()
+        return name
+
+    def _prune(self):
+        files = sorted(self.directory.glob('*.prof'), key=lambda path: path.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.keep)]:
+            path.unlink(missing_ok=True)
+
+    def list_profiles(self):
+        """Stored profiles, newest first."""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for path in self.directory.glob('*.prof'):
+            stat = path.stat()
+            profiles.append({"name": path.name, "size": stat.st_size, "created_at": stat.st_mtime})
+        return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+    def path_for(self, name):
+        """Path of stored profile `name`, or None if the name is invalid or unknown."""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    @staticmethod
+    def report(path, sort='cumulative', limit=40):
+        """The top of the pstats report for a stored profile, as text."""
+        stream = io.StringIO()
+        pstats.Stats(str(path), stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+def init_profiler(app):
+    """Register the profiling hooks on `app`; returns its RequestProfiler."""
+    profiler = RequestProfiler(app.config.get('PROFILE_DIR'))
+    app.extensions['request_profiler'] = profiler
+    app.before_request(profiler.start_request)
+    app.after_request(profiler.finish_request)
+    app.teardown_request(profiler.teardown_request)
+    return profiler
@@ -0,0 +1,243 @@
+"""
+Always-on statistical CPU profiler.
+
+A daemon thread wakes every SAMPLER_INTERVAL_MS, reads the stack of every
+other thread from sys._current_frames() and counts it in an in-memory table
+of collapsed stacks ("outer;inner;leaf" -> samples), the format read by
+flamegraph.pl, speedscope and inferno. Every SAMPLER_ROTATE_SECONDS the
+table is written to SAMPLER_DIR as <time>-<pid>.collapsed and cleared; the
+newest SAMPLER_KEEP files are kept. Prefork workers each run their own
+sampler into the same directory, so merging the files gives the picture
+across all workers (see /api/admin/sampler/stacks).
+
+Threads blocked in a wait (idle pool workers, the accept loop, condition
+variables, sockets) are skipped unless SAMPLER_INCLUDE_IDLE=1, so the
+profile shows where CPU goes rather than where threads sleep.
+
+Overhead: taking a sample costs CPU proportional to the number of threads
+and their stack depth. The sampler measures that cost (its own thread CPU
+time) and stretches its interval so sampling never uses more than
+SAMPLER_MAX_OVERHEAD of one CPU.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+SAMPLER_ENABLED = os.getenv('SAMPLER_ENABLED', '0') == '1'
+SAMPLER_INTERVAL_MS = float(os.getenv('SAMPLER_INTERVAL_MS', '10'))
+SAMPLER_MAX_OVERHEAD = float(os.getenv('SAMPLER_MAX_OVERHEAD', '0.01'))
+SAMPLER_ROTATE_SECONDS = float(os.getenv('SAMPLER_ROTATE_SECONDS', '60'))
+SAMPLER_KEEP = int(os.getenv('SAMPLER_KEEP', '240'))
+SAMPLER_MAX_DEPTH = int(os.getenv('SAMPLER_MAX_DEPTH', '64'))
+SAMPLER_INCLUDE_IDLE = os.getenv('SAMPLER_INCLUDE_IDLE', '0') == '1'
+SAMPLER_DIR = os.getenv('SAMPLER_DIR') or str(Path(__file__).parent.parent / "profiles" / "samples")
+
+# Distinct stacks kept per window; further new stacks are counted as one overflow entry
+MAX_STACKS = 20000
+
+# (file name, function) of leaf frames that mean "blocked, not using CPU"
+IDLE_LEAVES = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'), ('threading.py', 'join'),
+    ('queue.py', 'get'), ('selectors.py', 'select'), ('socket.py', 'accept'), ('socket.py', 'readinto'),
+    ('ssl.py', 'read'), ('ssl.py', 'recv_into'), ('socketserver.py', 'serve_forever'),
+    ('thread.py', '_worker'),
+}
+
+_PROJECT_ROOT = str(Path(__file__).parent.parent) + os.sep
+
+
+class SamplingProfiler:
+    """Samples every thread's stack on a timer and keeps collapsed-stack counts per window."""
+
+    def __init__(self, interval_ms=None, directory=None, rotate_seconds=None, keep=None,
+                 max_overhead=None, include_idle=None):
+        self.interval = (SAMPLER_INTERVAL_MS if interval_ms is None else interval_ms) / 1000.0
+        self.directory = Path(directory or SAMPLER_DIR)
+        self.rotate_seconds = SAMPLER_ROTATE_SECONDS if rotate_seconds is None else rotate_seconds
+        self.keep = SAMPLER_KEEP if keep is None else keep
+        self.max_overhead = SAMPLER_MAX_OVERHEAD if max_overhead is None else max_overhead
+        self.include_idle = SAMPLER_INCLUDE_IDLE if include_idle is None else include_idle
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._window = Counter()
+        self._window_started = time.time()
+        self._users = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at = None
+        # Wall time of earlier start()..stop() periods, for the overhead ratio
+        self._active_seconds = 0.0
+
+    def _label(self, code):
+        """'function (path:line)' for a code object, cached; paths are relative to the project."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if filename.startswith(_PROJECT_ROOT):
+                filename = filename[len(_PROJECT_ROOT):]
+            else:
+                filename = os.path.basename(filename)
+            label = self._labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+        return label
+
+    def sample(self):
+        """Count the current stack of every thread but the sampler's own."""
+        own = threading.get_ident()
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None and len(labels) < SAMPLER_MAX_DEPTH:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.reverse()
+            stacks.append(tuple(labels))
+        with self._lock:
+            for stack in stacks:
+                if stack not in self._window and len(self._window) >= MAX_STACKS:
+                    stack = ('[overflow]',)
+                self._window[stack] += 1
+
+    def _run(self):
+        next_rotation = time.monotonic() + self.rotate_seconds
+        while not self._stop.is_set():
+            # CPU time of this thread only; wall time would include waiting for the GIL
+            started = time.thread_time()
+            self.sample()
+            cost = time.thread_time() - started
+            self.samples += 1
+            self.sampling_seconds += cost
+            # Sleep long enough that sampling stays under max_overhead of one CPU
+            delay = max(self.interval, cost / self.max_overhead - cost) if self.max_overhead > 0 else self.interval
+            if self._stop.wait(delay):
+                break
+            if time.monotonic() >= next_rotation:
+                self.rotate()
+                next_rotation = time.monotonic() + self.rotate_seconds
+
+    def start(self):
+        """Start sampling (once per process; every start() needs a matching stop())."""
+        with self._lock:
+            self._users += 1
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self.started_at = time.time()
+            self._window_started = self.started_at
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        print(f"🔬 Sampling profiler started ({self.interval * 1000:.0f}ms interval, {self.directory})")
+
+    def stop(self):
+        """Stop sampling when the last user stops, writing the current window to disk."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            thread = self._thread
+            if self._users or thread is None:
+                return
+            self._thread = None
+        self._stop.set()
+        thread.join()
+        self._active_seconds += time.time() - self.started_at
+        self.rotate()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def rotate(self):
+        """Write the current window to a .collapsed file and start a new one; returns the path or None."""
+        with self._lock:
+            window, self._window = self._window, Counter()
+            started, self._window_started = self._window_started, time.time()
+        if not window:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(started).strftime('%Y%m%dT%H%M%S.%f')[:-3]
+        path = self.directory / f"{stamp}-{os.getpid()}.collapsed"
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(collapsed_text(window))
+        tmp_path.replace(path)
+        self._prune()
+        return path
+
+    def _prune(self):
+        files = []
+        for path in self.directory.glob('*.collapsed'):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # pruned by another worker
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.keep)]:
+            path.unlink(missing_ok=True)
+
+    def current_window(self):
+        with self._lock:
+            return Counter(self._window)
+
+    def stacks(self, since_seconds):
+        """
+        Collapsed-stack counts of this process's current window plus every
+        rotated file (from any worker) written in the last `since_seconds`.
+        """
+        merged = self.current_window()
+        cutoff = time.time() - since_seconds
+        if self.directory.exists():
+            for path in self.directory.glob('*.collapsed'):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        continue
+                    merged.update(parse_collapsed(path.read_text()))
+                except FileNotFoundError:
+                    continue  # pruned by another worker
+        return merged
+
+    def status(self):
+        elapsed = self._active_seconds + (time.time() - self.started_at if self.running else 0.0)
+        files = sorted(self.directory.glob('*.collapsed')) if self.directory.exists() else []
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "max_overhead": self.max_overhead,
+            "samples": self.samples,
+            "mean_sample_ms": round(self.sampling_seconds / self.samples * 1000, 4) if self.samples else 0.0,
+            # Sampler CPU time over wall time while running
+            "overhead": round(self.sampling_seconds / elapsed, 5) if elapsed else 0.0,
+            "window_stacks": len(self._window),
+            "files": len(files),
+            "directory": str(self.directory),
+        }
+
+
+def collapsed_text(counts):
+    """Counter of stack tuples (or 'a;b' strings) as collapsed-stack lines, most samples first."""
+    lines = []
+    for stack, count in counts.most_common():
+        if not isinstance(stack, str):
+            stack = ';'.join(stack)
+        lines.append(f"{stack} {count}")
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def parse_collapsed(text):
+    counts = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack and count.isdigit():
+            counts[tuple(stack.split(';'))] += int(count)
+    return counts
+
+
+sampler = SamplingProfiler()
@@ -0,0 +1,181 @@
+"""
+Per-application services for the Flask API.
+
+create_app() gives every Flask app its own AppServices (database connection,
+managers, rating service, background job pool), stored in
+app.extensions['hackbite']. Routes reach the services of the app handling
+the request through the LocalProxy objects returned by service_proxy(), so
+several apps (benchmarks, tests, prefork workers) can live side by side.
+
+Lifecycle:
+    startup()     connect, create tables and build the managers; once per app.
+                  RatingService (and the Gemini SDK it imports) is built per
+                  RATING_SERVICE_INIT: 'background' (a thread started here),
+                  'lazy' (first use) or 'eager' (before startup returns)
+    teardown()    end of every app context: close the context's own connection
+    shutdown()    drain background jobs, stop the PDF extraction workers,
+                  flush the sampling profiler (if SAMPLER_ENABLED), buffered
+                  tracing spans, the metrics snapshot (prefork) and the cassette
+                  being recorded (REPLAY_MODE=record), and close the database;
+                  at exit and when a prefork worker exits
+"""
+
+import os
+import sqlite3
+import threading
+
+from flask import current_app, g
+from werkzeug.local import LocalProxy
+
+from backend.database import (DatabaseManager, UserManager, SkillManager, SystemManager, TeamManager,
+                              ResumeBlobManager, GithubProfileManager)
+from backend.metrics import connection_factory, write_worker_snapshot
+from backend.pdf_extraction import shutdown_pool as shutdown_pdf_pool
+from backend.rating_jobs import RatingJobRegistry
+from backend.replay import flush_active_cassette
+from backend.sampling_profiler import SAMPLER_ENABLED, sampler
+from backend.tracing import exporter as span_exporter
+
+EXTENSION_KEY = 'hackbite'
+
+DEFAULT_CONFIG = {
+    # None keeps DatabaseManager's default (DATABASE_PATH or database/database.db)
+    'DATABASE_PATH': None,
+    # False skips RatingService entirely (heuristic ratings only)
+    'ENABLE_RATING_SERVICE': True,
+    'RATING_SERVICE_INIT': os.getenv('RATING_SERVICE_INIT', 'background'),
+    # None keeps RATING_JOB_WORKERS / RATING_JOB_TTL
+    'RATING_JOB_WORKERS': None,
+    'RATING_JOB_TTL': None,
+    # JSON response encoder: auto (orjson when installed), orjson or stdlib
+    'JSON_ENCODER': os.getenv('JSON_ENCODER', 'auto'),
+    # Run the process-wide sampling profiler while this app is up
+    'SAMPLER_ENABLED': SAMPLER_ENABLED,
+}
+
+
+class AppServices:
+    """Database connection, managers and background workers of one Flask app."""
+
+    def __init__(self, config):
+        self.config = config
+        self.db_manager = None
+        self.user_manager = None
+        self.skill_manager = None
+        self.system_manager = None
+        self.team_manager = None
+        self.resume_blob_manager = None
+        self.github_profile_manager = None
+        self.rating_jobs = None
+        self._rating_service = None
+        self._rating_service_ready = threading.Event()
+        self._rating_service_lock = threading.Lock()
+        self._sampling = False
+        self.started = False
+
+    def startup(self) -> bool:
+        """Connect and build every manager; returns False (after logging) on failure."""
+        try:
+            self.db_manager = DatabaseManager(self.config.get('DATABASE_PATH'))
+            if not self.db_manager.connect():
+                raise Exception("Failed to connect to database")
+
+            # Initialize tables
+            self.db_manager.initialize_tables()
+
+            # Initialize managers
+            self.user_manager = UserManager(self.db_manager)
+            self.skill_manager = SkillManager(self.db_manager)
+            self.system_manager = SystemManager(self.db_manager)
+            self.team_manager = TeamManager(self.db_manager)
+            self.resume_blob_manager = ResumeBlobManager(self.db_manager)
+            self.github_profile_manager = GithubProfileManager(self.db_manager)
+
+            # Initialize rating service
+            init_mode = self.config.get('RATING_SERVICE_INIT') or 'background'
+            if not self.config.get('ENABLE_RATING_SERVICE', True):
+                self._rating_service_ready.set()
+            elif init_mode == 'eager':
+                self._init_rating_service()
+            elif init_mode == 'background':
+                threading.Thread(target=self._init_rating_service, name='rating-service-init', daemon=True).start()
+
+            # Background rating jobs for /api/rate-profile/jobs, logged in the database for every worker
+            self.rating_jobs = RatingJobRegistry(self.db_manager.db_path,
+                                                 workers=self.config.get('RATING_JOB_WORKERS'),
+                                                 ttl=self.config.get('RATING_JOB_TTL'))
+
+            if self.config.get('SAMPLER_ENABLED'):
+                sampler.start()
+                self._sampling = True
+
+            self.started = True
+            print("✅ Flask app initialized successfully")
+            return True
+        except Exception as e:
+            print(f"❌ Flask app initialization failed: {e}")
+            return False
+
+    @property
+    def rating_service(self):
+        """The RatingService, or None if it is disabled or failed; waits for a background init in progress."""
+        if not self._rating_service_ready.is_set():
+            self._init_rating_service()
+        return self._rating_service
+
+    def _init_rating_service(self):
+        with self._rating_service_lock:
+            if self._rating_service_ready.is_set():
+                return
+            try:
+                from backend.rating_service import RatingService
+                self._rating_service = RatingService()
+                print("✅ Rating service initialized successfully")
+            except Exception as e:
+                print(f"⚠️ Rating service initialization failed: {e}")
+                self._rating_service = None
+            self._rating_service_ready.set()
+
+    def connection(self):
+        """A sqlite connection private to the current app context, closed by teardown()."""
+        if 'db_connection' not in g:
+            g.db_connection = sqlite3.connect(self.db_manager.db_path, factory=connection_factory())
+        return g.db_connection
+
+    def teardown(self, exception=None):
+        connection = g.pop('db_connection', None)
+        if connection is not None:
+            connection.close()
+
+    def shutdown(self):
+        """Wait for running rating jobs, stop the PDF workers, then close the database; safe to call more than once."""
+        if not self.started:
+            return
+        self.started = False
+        if self.rating_jobs:
+            self.rating_jobs.shutdown(wait=True)
+        shutdown_pdf_pool()
+        if self._sampling:
+            sampler.stop()
+            self._sampling = False
+        span_exporter.flush()
+        write_worker_snapshot()
+        flush_active_cassette()
+        if self.db_manager:
+            self.db_manager.close()
+        print("👋 App services shut down")
+
+
+def current_services() -> AppServices:
+    return current_app.extensions[EXTENSION_KEY]
+
+
+def service_proxy(name):
+    """Proxy to attribute `name` of the current app's services."""
+    return LocalProxy(lambda: getattr(current_services(), name))
+
+
+def shutdown_app(app):
+    services = app.extensions.get(EXTENSION_KEY)
+    if services:
+        services.shutdown()
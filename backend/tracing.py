@@ -0,0 +1,398 @@
+"""
+Lightweight tracing spans for the rating pipeline, exported as OTLP JSON.
+
+With TRACING_ENABLED=1 every sampled request (TRACE_SAMPLE_RATE) gets a root
+span, continuing the caller's trace when it sends a W3C `traceparent`
+header, and answers with its trace id in X-Trace-Id. Code inside the
+request opens child spans with
+
+    with span('pdf.extract', pages=3) as current:
+        ...
+        current.set_attribute('characters', len(text))
+
+or the @traced('name') decorator. The current span lives in a contextvar;
+work handed to other threads keeps its parent through bind_current_span()
+(rating jobs do this), so a background job's stages join the trace of the
+request that submitted it. Outside a trace span() is a no-op, and so is
+everything when tracing is off.
+
+log(message) prints like the rest of the backend and also records the
+message as an event on the current span, with its timestamp.
+
+Finished spans are buffered and appended by a background thread to
+TRACE_FILE as JSON lines in the OTLP/JSON ExportTraceServiceRequest shape
+({"resourceSpans": [...]}), which the OpenTelemetry Collector's otlpjsonfile
+receiver and Jaeger's OTLP importer read. The file is rotated to TRACE_FILE.1
+past TRACE_MAX_BYTES. /api/admin/traces/<trace_id> lists one trace's spans
+with their offsets and durations.
+"""
+
+import functools
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from flask import g, request
+
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', '0') == '1'
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '1.0'))
+TRACE_FILE = os.getenv('TRACE_FILE') or str(Path(__file__).parent.parent / "traces" / "spans.jsonl")
+TRACE_FLUSH_SECONDS = float(os.getenv('TRACE_FLUSH_SECONDS', '2'))
+TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', str(50 * 1024 * 1024)))
+TRACE_SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'hackbite-backend')
+
+# OTLP SpanKind and StatusCode values
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+_current = ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation of a trace; a context manager that makes it the current span."""
+
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_span_id', 'start_ns', 'end_ns',
+                 'attributes', 'events', 'status', 'status_message', '_token')
+
+    def __init__(self, name, trace_id, parent_span_id=None, kind=KIND_INTERNAL, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = STATUS_UNSET
+        self.status_message = None
+        self._token = None
+
+    recording = True
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, **attributes):
+        self.events.append((time.time_ns(), name, attributes))
+
+    def set_error(self, message):
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def record_exception(self, exception):
+        self.add_event('exception', **{"exception.type": type(exception).__name__,
+                                       "exception.message": str(exception)})
+        self.set_error(f"{type(exception).__name__}: {exception}")
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            exporter.export(self)
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exception, traceback):
+        if exception is not None:
+            self.record_exception(exception)
+        self.end()
+        _current.reset(self._token)
+        return False
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [{"timeUnixNano": str(at), "name": name, "attributes": _otlp_attributes(attributes)}
+                       for at, name, attributes in self.events],
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span outside a trace or in an unsampled one; every method does nothing."""
+
+    recording = False
+    trace_id = None
+    traceparent = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, **attributes):
+        pass
+
+    def set_error(self, message):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exception, traceback):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def _plain_value(value):
+    """Inverse of _otlp_value (OTLP/JSON carries 64-bit ints as strings)."""
+    kind, inner = next(iter(value.items()))
+    if kind == "intValue":
+        return int(inner)
+    if kind == "arrayValue":
+        return [_plain_value(item) for item in inner.get("values", [])]
+    return inner
+
+
+def current_span():
+    """The active span, or NOOP_SPAN."""
+    return _current.get() or NOOP_SPAN
+
+
+def span(name, kind=KIND_INTERNAL, **attributes):
+    """Child span of the current one; NOOP_SPAN when no trace is active."""
+    parent = _current.get()
+    if parent is None or not parent.recording:
+        return NOOP_SPAN
+    return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+
+
+def start_trace(name, kind=KIND_INTERNAL, traceparent=None, **attributes):
+    """
+    Root span of a new trace (or of the remote trace in a W3C `traceparent`),
+    subject to TRACE_SAMPLE_RATE; NOOP_SPAN when unsampled.
+    """
+    match = TRACEPARENT.match(traceparent or '')
+    if match:
+        trace_id, parent_span_id, flags = match.groups()
+        if not int(flags, 16) & 1:
+            return NOOP_SPAN
+    else:
+        if random.random() >= TRACE_SAMPLE_RATE:
+            return NOOP_SPAN
+        trace_id, parent_span_id = f"{random.getrandbits(128):032x}", None
+    return Span(name, trace_id, parent_span_id, kind, attributes)
+
+
+def traced(name, kind=KIND_INTERNAL):
+    """Decorator running the function inside span(name)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind_current_span(fn):
+    """`fn` wrapped to run with the caller's current span, for handing work to another thread."""
+    parent = _current.get()
+    if parent is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+
+def log(message, **attributes):
+    """print() a progress message and record it as an event on the current span."""
+    current = _current.get()
+    if current is not None and current.recording:
+        current.add_event(message, **attributes)
+        print(f"[trace {current.trace_id[:8]}] {message}")
+    else:
+        print(message)
+
+
+class FileSpanExporter:
+    """Buffers finished spans and appends them to a file as OTLP/JSON lines from a background thread."""
+
+    def __init__(self, path=None, flush_seconds=None, max_bytes=None):
+        self.path = Path(path or TRACE_FILE)
+        self.flush_seconds = TRACE_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.max_bytes = TRACE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._pending = []
+        self._thread = None
+        self._pid = None
+        self.exported = 0
+
+    def export(self, finished):
+        with self._lock:
+            self._pending.append(finished)
+            # Threads do not survive fork; each prefork worker starts its own flusher
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        """Write every buffered span now; returns how many were written."""
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return 0
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": TRACE_SERVICE_NAME,
+                                                         "process.pid": os.getpid()})},
+            "scopeSpans": [{"scope": {"name": "backend.tracing"},
+                            "spans": [finished.to_otlp() for finished in spans]}],
+        }]}, separators=(",", ":")) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                os.replace(self.path, self.path.with_name(self.path.name + '.1'))
+            # One O_APPEND write per batch, so lines from several workers never interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"⚠️ Could not write {len(spans)} spans to {self.path}: {e}")
+            return 0
+        self.exported += len(spans)
+        return len(spans)
+
+    def find_trace(self, trace_id):
+        """Every exported span of `trace_id` (from the current and rotated file), sorted by start."""
+        found = []
+        for path in (self.path.with_name(self.path.name + '.1'), self.path):
+            if not path.exists():
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if trace_id not in line:
+                        continue
+                    for resource_spans in json.loads(line)["resourceSpans"]:
+                        for scope_spans in resource_spans["scopeSpans"]:
+                            found.extend(s for s in scope_spans["spans"] if s["traceId"] == trace_id)
+        return sorted(found, key=lambda s: int(s["startTimeUnixNano"]))
+
+
+exporter = FileSpanExporter()
+
+
+def trace_summary(spans):
+    """OTLP spans as rows with millisecond offsets from the trace start, durations and depth."""
+    if not spans:
+        return []
+    trace_start = min(int(s["startTimeUnixNano"]) for s in spans)
+    depth = {}
+    by_id = {s["spanId"]: s for s in spans}
+
+    def depth_of(s):
+        if s["spanId"] not in depth:
+            parent = by_id.get(s.get("parentSpanId"))
+            depth[s["spanId"]] = depth_of(parent) + 1 if parent else 0
+        return depth[s["spanId"]]
+
+    rows = []
+    for s in spans:
+        start, end = int(s["startTimeUnixNano"]), int(s["endTimeUnixNano"])
+        rows.append({
+            "name": s["name"],
+            "span_id": s["spanId"],
+            "parent_span_id": s.get("parentSpanId"),
+            "depth": depth_of(s),
+            "offset_ms": round((start - trace_start) / 1e6, 3),
+            "duration_ms": round((end - start) / 1e6, 3),
+            "status": s["status"].get("message") or ("error" if s["status"]["code"] == STATUS_ERROR else "ok"),
+            "attributes": {a["key"]: _plain_value(a["value"]) for a in s["attributes"]},
+            "events": [{"name": e["name"], "offset_ms": round((int(e["timeUnixNano"]) - trace_start) / 1e6, 3)}
+                       for e in s.get("events", [])],
+        })
+    return rows
+
+
+def init_tracing(app):
+    """Register request hooks that open a root span per sampled request, unless tracing is off."""
+    if not app.config.get('TRACING_ENABLED', TRACING_ENABLED):
+        return
+
+    def start_request():
+        root = start_trace(f"{request.method} {request.url_rule.rule if request.url_rule else 'unmatched'}",
+                           KIND_SERVER, traceparent=request.headers.get('traceparent'),
+                           **{"http.method": request.method, "http.target": request.path})
+        g.trace_span = root
+        g.trace_token = _current.set(root)
+
+    def finish_request(response):
+        root = g.get('trace_span')
+        if root is not None and root.recording:
+            root.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                root.set_error(f"HTTP {response.status_code}")
+            response.headers['X-Trace-Id'] = root.trace_id
+        return response
+
+    def end_request(exception=None):
+        root = g.pop('trace_span', None)
+        if root is None:
+            return
+        if exception is not None:
+            root.record_exception(exception)
+        root.end()
+        _current.reset(g.pop('trace_token'))
+
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.teardown_request(end_request)
@@ -0,0 +1,76 @@
+"""
+Streaming resume uploads.
+
+Binary uploads (raw application/pdf bodies or multipart file fields) are
+written chunk by chunk into a spooled temporary file that hashes the bytes as
+they arrive and enforces a size limit, so the server never holds the whole
+request, a base64 copy and the decoded PDF in memory at once.
+"""
+
+import hashlib
+import tempfile
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from backend.pdf_extraction import PDF_MAX_BYTES
+
+# Uploads up to this size stay in memory; larger ones roll over to disk
+UPLOAD_SPOOL_SIZE = 512 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class HashingSpooledFile:
+    """Writable spooled temp file that SHA-256 hashes and size-checks everything written to it."""
+
+    def __init__(self, max_bytes=None, spool_size=UPLOAD_SPOOL_SIZE):
+        self.max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_size)
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise RequestEntityTooLarge(f"Resume exceeds the {self.max_bytes} byte limit")
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._sha256.hexdigest()
+
+    def read_all(self):
+        """Rewind and return the full contents."""
+        self._file.seek(0)
+        return self._file.read()
+
+    def __getattr__(self, name):
+        # read/seek/readline/close etc. go straight to the temp file
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+
+
+def spool_stream(stream, max_bytes=None, content_length=None):
+    """Copy a request body stream into a HashingSpooledFile without buffering it whole."""
+    spooled = HashingSpooledFile(max_bytes)
+    if content_length is not None and content_length > spooled.max_bytes:
+        raise RequestEntityTooLarge(f"Resume exceeds the {spooled.max_bytes} byte limit")
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+class UploadRequest(Request):
+    """Request class whose multipart file fields are parsed straight into HashingSpooledFile."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpooledFile()
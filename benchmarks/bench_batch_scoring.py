@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark single vs batched Gemini scoring with the offline fake model.
+
+Rates the same synthetic candidates one request per profile and with
+RatingService.generate_ratings_batch at several batch sizes, using a
+FakeGeminiModel whose latency has a per-call part and a per-character part.
+Reports LLM calls/sec, profiles/sec, prompt/output tokens and estimated cost
+per profile. --drop-rate removes items from batch answers to exercise the
+per-profile retry path.
+
+Usage:
+    python3 benchmarks/bench_batch_scoring.py [--profiles N] [--batch-sizes 2,5,10]
+        [--call-latency S] [--drop-rate P]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ['REPLAY_MODE'] = 'replay'
+# Nothing recorded: the fake synthesises every answer
+os.environ['REPLAY_CASSETTE'] = str(Path(tempfile.gettempdir()) / 'bench_batch_scoring_cassette.json')
+# The fake model is local; keep the production Gemini rate limit out of the timing
+os.environ['OUTBOUND_GEMINI_RATE'] = '10000'
+os.environ['OUTBOUND_GEMINI_BURST'] = '10000'
+
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from backend.prompt_budget import estimate_tokens
+from backend.rating_service import RatingService
+from backend.replay import FakeGeminiModel
+from synthetic_pdfs import make_pdf
+
+
+class MeteredModel:
+    """Counts calls and tokens; optionally drops items from batch answers."""
+
+    def __init__(self, model, drop_rate=0.0, seed=0):
+        self.model = model
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def generate_content(self, prompt, **kwargs):
+        response = self.model.generate_content(prompt, **kwargs)
+        text = response.text
+        items = json.loads(text)
+        if isinstance(items, list) and self.drop_rate:
+            text = json.dumps([item for item in items if self.rng.random() >= self.drop_rate])
+            response.text = text
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.output_tokens += estimate_tokens(text)
+        return response
+
+
+def make_profiles(count):
+    profiles = []
+    for i in range(count):
+        repos = [{"name": f"project-{j}", "description": f"A tool that does useful thing number {j}",
+                  "primaryLanguage": "Python", "stars": (i * 7 + j) % 50} for j in range(6)]
+        github_data = {"username": f"user{i}", "total_repos": len(repos),
+                       "total_stars": sum(repo["stars"] for repo in repos), "repositories": repos}
+        resume_text = extract_text_from_pdf_bytes(make_pdf(pages=2, seed=i))
+        profiles.append({"profile_id": f"u{i}", "github_data": github_data, "resume_text": resume_text})
+    return profiles
+
+
+def run(service, profiles, batch_size, args):
+    service.model = MeteredModel(
+        FakeGeminiModel(latency=args.call_latency, per_1k_prompt_chars=args.per_1k_prompt_chars,
+                        per_1k_output_chars=args.per_1k_output_chars, seed=0),
+        drop_rate=args.drop_rate)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if batch_size == 1:
+            results = {p["profile_id"]: service._rate_single(p["github_data"], p["resume_text"]) for p in profiles}
+        else:
+            results = service.generate_ratings_batch(profiles, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    model = service.model
+    cost = (model.prompt_tokens * args.input_price + model.output_tokens * args.output_price) / 1e6
+    scored = sum(1 for ratings in results.values() if ratings["overall_rating"]["score"] > 0)
+    label = "single" if batch_size == 1 else f"batch x{batch_size}"
+    print(f"{label:<11} {model.calls:>6} {model.calls / elapsed:>10.2f} {len(profiles) / elapsed:>12.2f} "
+          f"{model.prompt_tokens / len(profiles):>12.0f} {model.output_tokens / len(profiles):>10.0f} "
+          f"{cost / len(profiles) * 1000:>14.4f}  {scored}/{len(profiles)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched LLM scoring against single requests')
+    parser.add_argument('--profiles', type=int, default=20)
+    parser.add_argument('--batch-sizes', type=str, default='2,5,10')
+    parser.add_argument('--call-latency', type=float, default=0.4, help='Fixed fake latency per call (s)')
+    parser.add_argument('--per-1k-prompt-chars', type=float, default=0.005, help='Fake latency per 1k prompt chars (s)')
+    parser.add_argument('--per-1k-output-chars', type=float, default=0.05, help='Fake latency per 1k output chars (s)')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Fraction of batch items the fake drops')
+    parser.add_argument('--input-price', type=float, default=0.30, help='USD per 1M prompt tokens')
+    parser.add_argument('--output-price', type=float, default=2.50, help='USD per 1M output tokens')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = RatingService()
+    profiles = make_profiles(args.profiles)
+    print(f"{args.profiles} profiles, fake call latency {args.call_latency}s, drop rate {args.drop_rate}")
+    print("=" * 90)
+    print(f"{'mode':<11} {'calls':>6} {'calls/s':>10} {'profiles/s':>12} {'prompt tok/p':>12} "
+          f"{'out tok/p':>10} {'USD/1k profiles':>14}  scored")
+    run(service, profiles, 1, args)
+    for batch_size in (int(size) for size in args.batch_sizes.split(',')):
+        run(service, profiles, batch_size, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression: bytes on the wire vs CPU per encoding and level.
+
+Encodes the large JSON payloads (/api/team-candidates with full resume text,
+/api/teams?include_members=true, /api/users) once, then times every codec
+backend/compression.py can use here (gzip at several levels, brotli and zstd
+when installed) and reports compressed size, ratio, compression time and the
+time the bytes take on a link of --mbps, so the CPU cost can be weighed
+against the transfer it saves.
+
+Usage:
+    python3 benchmarks/bench_compression.py [--repeat N] [--mbps N]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.compression import BrotliCodec, GzipCodec, ZstdCodec, brotli, zstandard
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from bench_json_encoding import candidates_payload, teams_payload
+from synthetic_pdfs import make_pdf
+
+
+def users_payload():
+    users = [{'user_id': i, 'name': f'User {i}', 'email': f'user{i}@example.com', 'location': 'Pune',
+              'experience': 'beginner', 'profile_logo': 'rocket', 'created_at': '2025-01-01 10:00:00',
+              'is_active': 1} for i in range(500)]
+    return {"success": True, "users": users}
+
+
+def codecs():
+    result = {f"gzip-{level}": GzipCodec(level) for level in (1, 6, 9)}
+    if brotli is not None:
+        result.update({f"br-{quality}": BrotliCodec(quality) for quality in (1, 4, 11)})
+    if zstandard is not None:
+        result.update({f"zstd-{level}": ZstdCodec(level) for level in (1, 3, 10)})
+    return result
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark response compression')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--mbps', type=float, default=10.0, help='Link speed for the transfer-time column')
+    args = parser.parse_args()
+
+    resumes = [extract_text_from_pdf_bytes(make_pdf(pages=2, seed=i)) for i in range(10)]
+    payloads = {
+        "team-candidates (50)": candidates_payload(resumes),
+        "teams (200)": teams_payload(),
+        "users (500)": users_payload(),
+    }
+    bytes_per_ms = args.mbps * 1_000_000 / 8 / 1000
+
+    print(f"median of {args.repeat} compressions; transfer at {args.mbps:g} Mbit/s "
+          f"(brotli {'installed' if brotli else 'not installed'}, zstd {'installed' if zstandard else 'not installed'})")
+    for label, payload in payloads.items():
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode('utf-8')
+        print("=" * 70)
+        print(f"{label}: {len(body) / 1024:.1f}KB identity, {len(body) / bytes_per_ms:.2f}ms transfer")
+        print(f"{'encoding':<10} {'size':>10} {'ratio':>7} {'compress':>10} {'transfer':>10} {'total':>10}")
+        for name, codec in codecs().items():
+            compressed = codec.compress(body)
+            seconds = measure(lambda: codec.compress(body), args.repeat)
+            transfer = len(compressed) / bytes_per_ms
+            print(f"{name:<10} {len(compressed) / 1024:>8.1f}KB {len(body) / len(compressed):>6.1f}x "
+                  f"{seconds * 1000:>8.3f}ms {transfer:>8.2f}ms {seconds * 1000 + transfer:>8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
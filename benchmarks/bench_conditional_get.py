@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark polling with and without ETag revalidation.
+
+Seeds a temporary database with hackathons, users and a full team, then
+polls the conditional routes through the Flask test client twice: plain
+GETs (full body every time) and GETs carrying the last ETag in
+If-None-Match, with a write to the polled data every --change-every polls.
+Reports latency, bytes sent and the 304 ratio from http_cache_stats.
+
+Usage:
+    python3 benchmarks/bench_conditional_get.py [--polls N] [--hackathons N] [--change-every N]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import http_cache
+from backend.api_server import create_app
+from backend.services import shutdown_app
+
+ROUTES = ('/api/hackathons', '/api/hackathons/1', '/api/skill-categories', '/api/profile-logos', '/api/teams/1')
+
+
+def seed(client, connection, hackathons):
+    for i in range(hackathons):
+        connection.execute(
+            "INSERT INTO hackathons (name, description, status, theme, prizes) VALUES (?, ?, ?, ?, ?)",
+            (f"Hackathon {i}", "Build something useful in 48 hours " * 4, 'upcoming', 'AI',
+             '{"first": "$1000", "second": "$500"}'))
+    connection.commit()
+    users = []
+    for i in range(4):
+        result = client.post('/api/register', json={"name": f"User {i}", "email": f"user{i}@example.com",
+                                                   "password": "password123"}).get_json()
+        users.append(result['user_id'])
+    client.post('/api/teams', json={"team_name": "Team", "leader_id": users[0], "hackathon_id": 1,
+                                    "description": "A team", "max_members": 4})
+    for user_id in users[1:]:
+        client.post('/api/teams/1/join', json={"user_id": user_id})
+
+
+def poll(client, connection, polls, change_every, revalidate):
+    http_cache.http_cache_stats = http_cache.HttpCacheStats()
+    etags = {}
+    latencies, sent = [], 0
+    for i in range(polls):
+        if change_every and i and i % change_every == 0:
+            connection.execute("UPDATE hackathons SET current_participants = current_participants + 1 "
+                               "WHERE hackathon_id = 1")
+            connection.commit()
+        for route in ROUTES:
+            headers = {'If-None-Match': etags[route]} if revalidate and route in etags else {}
+            start = time.perf_counter()
+            response = client.get(route, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            sent += len(response.data)
+            if response.headers.get('ETag'):
+                etags[route] = response.headers['ETag']
+    return latencies, sent, http_cache.http_cache_stats.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ETag revalidation on polled routes')
+    parser.add_argument('--polls', type=int, default=200, help='Polls of every route')
+    parser.add_argument('--hackathons', type=int, default=100)
+    parser.add_argument('--change-every', type=int, default=20, help='Write to hackathons every N polls (0: never)')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app({"DATABASE_PATH": str(Path(tempfile.mkdtemp(prefix='bench_cgi_')) / 'db.sqlite'),
+                          "ENABLE_RATING_SERVICE": False})
+    client = app.test_client()
+    connection = app.extensions['hackbite'].db_manager.connection
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(client, connection, args.hackathons)
+
+    print(f"{args.polls} polls x {len(ROUTES)} routes, {args.hackathons} hackathons, "
+          f"write every {args.change_every or 'never'} polls")
+    print("=" * 70)
+    print(f"{'mode':<14} {'mean':>9} {'p50':>9} {'bytes/req':>12} {'304 ratio':>10}")
+    for label, revalidate in (("plain GET", False), ("If-None-Match", True)):
+        latencies, sent, summary = poll(client, connection, args.polls, args.change_every, revalidate)
+        print(f"{label:<14} {statistics.mean(latencies) * 1000:>7.3f}ms {statistics.median(latencies) * 1000:>7.3f}ms "
+              f"{sent / len(latencies):>12.0f} {summary['not_modified_ratio']:>10.1%}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        shutdown_app(app)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark GitHub page parsing: full BeautifulSoup trees vs strainer-limited parsing.
+
+Runs GithubScraper.scrape_profile over synthetic HTML fixtures (no network) and
+reports CPU time and peak traced memory per profile for both modes, after
+checking that both produce identical scrape results.
+
+Usage:
+    python3 benchmarks/bench_github_parsing.py [--profiles N] [--pinned N]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.github_scraper import GithubScraper
+from github_fixtures import profile_fixture_set
+
+
+class FixtureScraper(GithubScraper):
+    """GithubScraper that reads pages from an in-memory fixture set instead of the network."""
+
+    def __init__(self, username, pages, partial_parsing):
+        super().__init__(username, partial_parsing=partial_parsing)
+        self.pages = pages
+
+    def _get_soup(self, url, elements=None):
+        html = self.pages.get(urlparse(url).path)
+        return self._parse(html, elements) if html is not None else None
+
+
+def measure(fixtures, partial_parsing):
+    cpu_total = 0.0
+    peaks = []
+    results = []
+    for username, pages in fixtures:
+        scraper = FixtureScraper(username, pages, partial_parsing)
+        tracemalloc.start()
+        cpu_start = time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(scraper.scrape_profile())
+        cpu_total += time.process_time() - cpu_start
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return cpu_total / len(fixtures), max(peaks), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GitHub HTML parsing modes')
+    parser.add_argument('--profiles', type=int, default=5, help='Number of synthetic profiles')
+    parser.add_argument('--pinned', type=int, default=6, help='Pinned repositories per profile')
+    args = parser.parse_args()
+
+    fixtures = [(f"user{i}", profile_fixture_set(f"user{i}", args.pinned, seed=i)) for i in range(args.profiles)]
+    html_kb = sum(len(html) for _, pages in fixtures for html in pages.values()) / 1024 / len(fixtures)
+    print(f"{args.profiles} profiles, {args.pinned} pinned repos each, {html_kb:.0f} KB of HTML per profile")
+    print("=" * 70)
+
+    full_cpu, full_peak, full_results = measure(fixtures, partial_parsing=False)
+    partial_cpu, partial_peak, partial_results = measure(fixtures, partial_parsing=True)
+
+    if full_results != partial_results:
+        print("❌ Partial parsing produced different scrape results")
+        sys.exit(1)
+
+    print(f"{'mode':<10} {'cpu/profile':>12} {'peak memory':>14}")
+    print(f"{'full':<10} {full_cpu * 1000:>10.1f}ms {full_peak / 1e6:>12.1f}MB")
+    print(f"{'partial':<10} {partial_cpu * 1000:>10.1f}ms {partial_peak / 1e6:>12.1f}MB")
+    print(f"CPU saved {100 * (1 - partial_cpu / full_cpu):.0f}%, "
+          f"peak memory saved {100 * (1 - partial_peak / full_peak):.0f}% (results identical)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local heuristic rating engine.
+
+Scores synthetic profiles (scraper-shaped GitHub data from sparse to strong,
+plus synthetic resume PDFs of different lengths) with heuristic_ratings and
+reports per-call latency and the spread of the resulting scores, which should
+stay inside the 0-1000 range team-candidate windows use.
+
+Usage:
+    python3 benchmarks/bench_heuristic_rating.py [--profiles N] [--repeat N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.heuristic_rating import heuristic_ratings
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from github_fixtures import LANGUAGES
+from synthetic_pdfs import make_pdf
+
+
+def make_github_data(seed):
+    """Scraper output with 0-6 pinned repositories and varied activity."""
+    rng = random.Random(seed)
+    repos = []
+    for i in range(rng.randint(0, 6)):
+        repos.append({
+            "name": f"project-{i}" if rng.random() > 0.2 else f"leetcode-solutions-{i}",
+            "description": "A project",
+            "primaryLanguage": rng.choice(LANGUAGES),
+            "stars": int(rng.expovariate(1 / 20)),
+            "readme": {"exists": rng.random() > 0.3, "contentLength": rng.randint(0, 8000)},
+            "qualityFlags": {"hasLicense": rng.random() > 0.5},
+        })
+    return {
+        "profileInfo": {"fullName": f"User {seed}", "bio": "N/A"},
+        "contributionStats": {"totalContributionsInLastYear": int(rng.expovariate(1 / 300))},
+        "analyzedRepositories": repos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark heuristic_ratings')
+    parser.add_argument('--profiles', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20, help='Scoring passes over all profiles')
+    args = parser.parse_args()
+
+    profiles = [(make_github_data(i), extract_text_from_pdf_bytes(make_pdf(pages=1 + i % 3, seed=i)))
+                for i in range(args.profiles)]
+
+    timings = []
+    for _ in range(args.repeat):
+        for github_data, resume_text in profiles:
+            start = time.perf_counter()
+            heuristic_ratings(github_data, resume_text)
+            timings.append(time.perf_counter() - start)
+
+    results = [heuristic_ratings(github_data, resume_text) for github_data, resume_text in profiles]
+    print(f"{args.profiles} profiles x {args.repeat} passes")
+    print("=" * 60)
+    print(f"latency   mean {statistics.mean(timings) * 1000:.3f}ms  "
+          f"p99 {sorted(timings)[int(len(timings) * 0.99) - 1] * 1000:.3f}ms")
+    for name in ("git_rating", "resume_rating", "overall_rating"):
+        scores = [ratings[name]["score"] for ratings in results]
+        print(f"{name:<15} min {min(scores):>4}  median {statistics.median(scores):>6.0f}  max {max(scores):>4}")
+
+
+if __name__ == '__main__':
+    main()
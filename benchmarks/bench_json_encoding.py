@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON response encoding: Flask's default provider vs FastJSONProvider.
+
+Builds realistic response payloads and times producing the full response
+(`app.json.response(...)`) with:
+    flask     Flask's DefaultJSONProvider (stdlib json, what every route used before)
+    stdlib    FastJSONProvider with JSON_ENCODER=stdlib
+    orjson    FastJSONProvider with orjson (skipped when it is not installed)
+
+Payloads: /api/team-candidates with 50 candidates carrying full resume text,
+/api/teams with 200 teams and their members, 500 user rows straight from
+sqlite (the flask provider has to copy them into dicts first) and
+/api/profile-logos, which is also timed as a pre-encoded static response.
+
+Usage:
+    python3 benchmarks/bench_json_encoding.py [--repeat N]
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend.database import UserManager
+from backend.json_provider import FastJSONProvider, orjson, static_json_response
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from synthetic_pdfs import make_pdf
+
+SKILLS = ['Python', 'React', 'Node.js', 'Docker', 'AWS', 'UI/UX Design', 'Machine Learning', 'TypeScript']
+
+
+def candidates_payload(resumes):
+    candidates = []
+    for i in range(50):
+        candidates.append({
+            'id': f'user_{i}', 'user_id': i, 'name': f'Candidate {i}', 'email': f'candidate{i}@example.com',
+            'bio': "Passionate developer looking to collaborate on innovative projects.",
+            'location': 'Bengaluru', 'experience': 'intermediate', 'available': True,
+            'overallScore': 500 + i * 7, 'githubScore': 450 + i * 5, 'resumeScore': 520 + i * 3,
+            'complementaryScore': 10 + i % 40, 'github_link': f'https://github.com/candidate{i}',
+            'resume_data': resumes[i % len(resumes)],
+            'skills': SKILLS[i % 4:i % 4 + 4], 'complementary_skills': SKILLS[:2],
+            'skill_match_details': {'complementary': SKILLS[:2], 'matching': SKILLS[2:3]},
+        })
+    return {"success": True, "candidates": candidates, "total_candidates": 50,
+            "leader_skills": SKILLS[:3], "recommended_skills": SKILLS[3:]}
+
+
+def teams_payload():
+    teams = []
+    for i in range(200):
+        teams.append({
+            'team_id': i, 'team_name': f'Team {i}', 'description': 'Building a tool for hackathon team formation ' * 3,
+            'hackathon_id': i % 5, 'leader_id': i * 4, 'max_members': 4, 'status': 'forming',
+            'required_skills': SKILLS[i % 5:i % 5 + 3], 'created_at': '2025-01-01 10:00:00',
+            'members': [{'user_id': i * 4 + j, 'name': f'Member {j}', 'role': 'member' if j else 'leader',
+                         'joined_at': '2025-01-02 12:00:00'} for j in range(1 + i % 4)],
+        })
+    return {"success": True, "teams": teams}
+
+
+def user_rows():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE users (user_id INTEGER, name TEXT, email TEXT, location TEXT, experience TEXT, "
+                 "profile_logo TEXT, created_at TEXT, is_active INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     [(i, f'User {i}', f'user{i}@example.com', 'Pune', 'beginner', 'rocket',
+                       '2025-01-01 10:00:00', 1) for i in range(500)])
+    return conn.execute("SELECT * FROM users").fetchall()
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON response encoding')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    resumes = [extract_text_from_pdf_bytes(make_pdf(pages=2, seed=i)) for i in range(10)]
+    rows = user_rows()
+    logos = UserManager(None)
+
+    def logos_payload():
+        available = logos.get_available_logos()
+        return {"success": True, "logos": available, "avatar_names": list(available.keys())}
+
+    payloads = {
+        "team-candidates (50)": lambda: candidates_payload(resumes),
+        "teams (200)": teams_payload,
+        "user rows (500)": lambda: {"success": True, "users": rows},
+        "profile-logos": logos_payload,
+    }
+
+    providers = {"flask": DefaultJSONProvider, "stdlib": lambda app: FastJSONProvider(app, encoder='stdlib')}
+    if orjson is not None:
+        providers["orjson"] = lambda app: FastJSONProvider(app, encoder='orjson')
+    apps = {}
+    for name, make_provider in providers.items():
+        app = Flask(__name__)
+        app.json = make_provider(app)
+        apps[name] = app
+
+    print(f"median of {args.repeat} encodes per payload (orjson {'installed' if orjson else 'not installed'})")
+    print("=" * 78)
+    print(f"{'payload':<22} {'size':>9}" + ''.join(f"{name:>12}" for name in providers) + f"{'speedup':>10}")
+    for label, build in payloads.items():
+        payload = build()
+        results = {}
+        for name, app in apps.items():
+            with app.app_context():
+                if name == 'flask' and label.startswith('user rows'):
+                    # The default provider cannot encode sqlite3.Row; routes copy rows into dicts first
+                    encode = lambda: app.json.response({"success": True, "users": [dict(row) for row in rows]})
+                else:
+                    encode = lambda: app.json.response(payload)
+                size = len(encode().get_data())
+                results[name] = measure(encode, args.repeat)
+        best = min(results.values())
+        print(f"{label:<22} {size / 1024:>7.0f}KB" + ''.join(f"{seconds * 1000:>10.3f}ms" for seconds in results.values())
+              + f"{results['flask'] / best:>9.1f}x")
+
+    app = apps[list(apps)[-1]]
+    with app.app_context():
+        static = measure(lambda: static_json_response('profile-logos', logos_payload), args.repeat)
+        per_call = measure(lambda: app.json.response(logos_payload()), args.repeat)
+    print("-" * 78)
+    print(f"profile-logos per call {per_call * 1000:.3f}ms vs pre-encoded {static * 1000:.3f}ms "
+          f"({per_call / static:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of metrics recording.
+
+1. Per operation: a counter increment and a histogram observation on the
+   per-thread shards, against the same counter behind a threading.Lock, from
+   1 and --threads threads.
+2. sqlite: a point query on a plain connection vs TimedConnection.
+3. End to end: GET /health and GET /api/users through the Flask test client
+   with METRICS_ENABLED on and off, plus the time to render /metrics.
+
+Usage:
+    python3 benchmarks/bench_metrics_overhead.py [--requests N] [--threads N]
+"""
+
+import argparse
+import contextlib
+import io
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import metrics as metrics_module
+from backend.metrics import MetricsRegistry, TimedConnection, render_metrics
+
+
+def per_op(fn, threads, ops):
+    """Nanoseconds per call of fn() run `ops` times in each of `threads` threads."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(ops):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    return (time.perf_counter() - start) / (threads * ops) * 1e9
+
+
+def bench_recording(threads, ops):
+    registry = MetricsRegistry()
+    lock = threading.Lock()
+    locked = {"value": 0}
+
+    def locked_inc():
+        with lock:
+            locked["value"] += 1
+
+    labels = (("method", "GET"), ("route", "/api/users"))
+    print(f"{'operation':<34} {'1 thread':>12} {f'{threads} threads':>12}")
+    for label, fn in (
+        ("counter, per-thread shard", lambda: registry.inc("http_requests_total", labels)),
+        ("counter, shared lock", locked_inc),
+        ("histogram observe", lambda: registry.observe("http_request_duration_seconds", labels, 0.012)),
+    ):
+        print(f"{label:<34} {per_op(fn, 1, ops):>10.0f}ns {per_op(fn, threads, ops // threads):>10.0f}ns")
+
+
+def bench_sqlite(ops):
+    timings = {}
+    for label, factory in (("plain", sqlite3.Connection), ("timed", TimedConnection)):
+        connection = sqlite3.connect(':memory:', factory=factory, check_same_thread=False)
+        connection.execute("CREATE TABLE users (user_id INTEGER PRIMARY KEY, name TEXT)")
+        connection.executemany("INSERT INTO users VALUES (?, ?)", [(i, f"User {i}") for i in range(1000)])
+
+        def query():
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM users WHERE user_id = ?", (500,))
+            cursor.fetchone()
+
+        timings[label] = per_op(query, 1, ops)
+    print(f"sqlite point query: plain {timings['plain'] / 1000:.2f}us, timed {timings['timed'] / 1000:.2f}us "
+          f"(+{(timings['timed'] - timings['plain']) / 1000:.2f}us)")
+
+
+def bench_requests(requests):
+    from backend.api_server import create_app
+    from backend.services import shutdown_app
+
+    apps, clients = {}, {}
+    for enabled in (False, True):
+        metrics_module.METRICS_ENABLED = enabled
+        with contextlib.redirect_stdout(io.StringIO()):
+            app = apps[enabled] = create_app({
+                "DATABASE_PATH": str(Path(tempfile.mkdtemp(prefix='bench_metrics_')) / 'db.sqlite'),
+                "ENABLE_RATING_SERVICE": False, "METRICS_ENABLED": enabled})
+            client = clients[enabled] = app.test_client()
+            for i in range(20):
+                client.post('/api/register', json={"name": f"User {i}", "email": f"user{i}@example.com",
+                                                   "password": "password123"})
+
+    # Alternate between the two apps so machine noise hits both equally
+    results = {}
+    for route in ('/health', '/api/users'):
+        timings = {False: [], True: []}
+        for _ in range(requests):
+            for enabled in (False, True):
+                start = time.perf_counter()
+                clients[enabled].get(route)
+                timings[enabled].append(time.perf_counter() - start)
+        for enabled in (False, True):
+            results[(route, enabled)] = statistics.median(timings[enabled])
+
+    start = time.perf_counter()
+    body = render_metrics()
+    render = time.perf_counter() - start
+    with contextlib.redirect_stdout(io.StringIO()):
+        for app in apps.values():
+            shutdown_app(app)
+
+    print(f"{'route':<14} {'metrics off':>12} {'metrics on':>12} {'overhead':>10}")
+    for route in ('/health', '/api/users'):
+        off, on = results[(route, False)], results[(route, True)]
+        print(f"{route:<14} {off * 1e6:>10.1f}us {on * 1e6:>10.1f}us {(on - off) * 1e6:>8.1f}us")
+    print(f"render /metrics: {render * 1000:.2f}ms for {len(body) / 1024:.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark metrics recording overhead')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=200000)
+    args = parser.parse_args()
+
+    bench_recording(args.threads, args.ops)
+    print("=" * 62)
+    bench_sqlite(args.ops // 10)
+    print("=" * 62)
+    bench_requests(args.requests)
+
+
+if __name__ == '__main__':
+    main()
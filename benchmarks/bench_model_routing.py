@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark tiered model routing against always using the full model.
+
+Rates synthetic candidates with RatingService.generate_ratings twice: with
+routing disabled (every profile on the full model) and with a fast model
+tried first. Both models are FakeGeminiModels; the fast one is quicker and
+cheaper, and answers a --fast-thin-rate fraction of profiles with a single
+reasoning bullet so the escalation path is exercised alongside borderline
+scores and sparse GitHub profiles (--sparse-rate). Reports latency, the
+routing decision mix and the estimated prompt cost.
+
+Usage:
+    python3 benchmarks/bench_model_routing.py [--profiles N] [--fast-latency S] [--full-latency S]
+        [--fast-thin-rate P] [--sparse-rate P]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ['REPLAY_MODE'] = 'replay'
+# Nothing recorded: the fake synthesises every answer
+os.environ['REPLAY_CASSETTE'] = str(Path(tempfile.gettempdir()) / 'bench_model_routing_cassette.json')
+os.environ['OUTBOUND_GEMINI_RATE'] = '10000'
+os.environ['OUTBOUND_GEMINI_BURST'] = '10000'
+os.environ['GEMINI_STREAM'] = '0'
+
+from backend import model_routing
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from backend.rating_service import RatingService
+from backend.replay import FakeGeminiModel
+from synthetic_pdfs import make_pdf
+
+
+class ThinFastModel(FakeGeminiModel):
+    """Fast fake that sometimes gives a single reasoning bullet per rating."""
+
+    def __init__(self, thin_rate, **kwargs):
+        super().__init__(**kwargs)
+        self.thin_rate = thin_rate
+
+    def generate_content(self, prompt, **kwargs):
+        response = super().generate_content(prompt, **kwargs)
+        if self._rng.random() < self.thin_rate:
+            response.text = response.text.replace(
+                '"Synthetic rating from FakeGeminiModel", "Derived from a hash of the prompt", "Not a real assessment"',
+                '"Synthetic rating from FakeGeminiModel"')
+        return response
+
+
+def make_candidates(count, sparse_rate, seed=0):
+    sparse = set(random.Random(seed).sample(range(count), round(count * sparse_rate)))
+    candidates = []
+    for i in range(count):
+        repo_count = 1 if i in sparse else 6
+        repos = [{"name": f"project-{j}", "description": f"A tool that does useful thing number {j}",
+                  "primaryLanguage": "Python", "stars": (i * 7 + j) % 50} for j in range(repo_count)]
+        github_data = {"username": f"user{i}", "total_repos": len(repos),
+                       "total_stars": sum(repo["stars"] for repo in repos), "repositories": repos}
+        candidates.append((github_data, extract_text_from_pdf_bytes(make_pdf(pages=2, seed=i))))
+    return candidates
+
+
+def run(service, candidates):
+    latencies = []
+    for github_data, resume_text in candidates:
+        service._collect_github_data = lambda username, data=github_data: data
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            service.generate_ratings(f"https://github.com/{github_data['username']}", resume_text)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tiered model routing')
+    parser.add_argument('--profiles', type=int, default=40)
+    parser.add_argument('--fast-latency', type=float, default=0.1, help='Fake fast model latency (s)')
+    parser.add_argument('--full-latency', type=float, default=0.4, help='Fake full model latency (s)')
+    parser.add_argument('--fast-thin-rate', type=float, default=0.1,
+                        help='Fraction of fast answers with too little reasoning')
+    parser.add_argument('--sparse-rate', type=float, default=0.1, help='Fraction of profiles with one repository')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = RatingService()
+    candidates = make_candidates(args.profiles, args.sparse_rate)
+    service.model = FakeGeminiModel(latency=args.full_latency, seed=0)
+    fast_model = ThinFastModel(args.fast_thin_rate, latency=args.fast_latency, seed=1)
+
+    print(f"{args.profiles} profiles, fast model {args.fast_latency}s, full model {args.full_latency}s, "
+          f"thin fast answers {args.fast_thin_rate:.0%}, sparse profiles {args.sparse_rate:.0%}")
+    print("=" * 90)
+    print(f"{'mode':<10} {'mean':>8} {'p50':>8} {'max':>8}  {'USD/1k profiles':>15}  decisions")
+    for label, fast in (("full only", None), ("routed", fast_model)):
+        model_routing.routing_stats = model_routing.RoutingStats()
+        service.fast_model = fast
+        latencies = run(service, candidates)
+        summary = model_routing.routing_stats.summary()
+        cost = sum(tier["cost_usd"] for tier in summary["tiers"].values())
+        decisions = summary["decisions"] or {"full": args.profiles}
+        print(f"{label:<10} {statistics.mean(latencies) * 1000:>6.0f}ms {statistics.median(latencies) * 1000:>6.0f}ms "
+              f"{max(latencies) * 1000:>6.0f}ms  {cost / args.profiles * 1000:>15.4f}  {decisions} {summary['reasons']}")
+
+
+if __name__ == '__main__':
+    main()
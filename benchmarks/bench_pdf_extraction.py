@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark resume PDF extraction throughput.
+
+Compares the old unbounded in-thread extraction against the bounded extractor,
+inline and through the process pool at several worker counts.
+
+Usage:
+    python3 benchmarks/bench_pdf_extraction.py [--copies N] [--max-workers N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PyPDF2 import PdfReader
+
+from backend import pdf_extraction
+from synthetic_pdfs import make_corpus
+
+
+def legacy_extract(pdf_bytes):
+    """The pre-pool implementation: every page, quadratic concatenation."""
+    text = ""
+    for page in PdfReader(io.BytesIO(pdf_bytes)).pages:
+        text += page.extract_text() + "\n"
+    return ' '.join(text.split()).strip()
+
+
+def run(label, extract, corpus, concurrency=1):
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    if concurrency == 1:
+        chars = sum(len(extract(pdf)) for _, pdf in corpus)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            chars = sum(len(text) for text in executor.map(extract, (pdf for _, pdf in corpus)))
+    elapsed = time.perf_counter() - start
+    parent_cpu = time.process_time() - cpu_start
+    docs_per_sec = len(corpus) / elapsed
+    print(f"{label:<32} {elapsed:8.2f}s {docs_per_sec:8.1f} docs/s "
+          f"{docs_per_sec / max(1, concurrency):8.1f} docs/s/core  "
+          f"parent cpu {parent_cpu:6.2f}s  chars {chars}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF text extraction')
+    parser.add_argument('--copies', type=int, default=3, help='Copies of each page-count in the corpus')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='Largest pool size to measure')
+    args = parser.parse_args()
+
+    corpus = make_corpus(copies=args.copies)
+    total_mb = sum(len(pdf) for _, pdf in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} PDFs, {total_mb:.1f} MB, "
+          f"limits pages={pdf_extraction.PDF_MAX_PAGES} chars={pdf_extraction.PDF_MAX_CHARS}")
+    print("=" * 100)
+
+    run("legacy (unbounded, inline)", legacy_extract, corpus)
+    run("bounded, inline", pdf_extraction.extract_text_from_pdf_bytes, corpus)
+
+    workers = 1
+    while workers <= args.max_workers:
+        pdf_extraction.shutdown_pool()
+        pdf_extraction.PDF_POOL_WORKERS = workers
+        # Warm the pool so interpreter start-up is not counted
+        pdf_extraction.extract_pdf_text(corpus[0][1])
+        run(f"bounded, pool x{workers}", pdf_extraction.extract_pdf_text, corpus, concurrency=workers)
+        workers *= 2
+
+    pdf_extraction.shutdown_pool()
+
+
+if __name__ == '__main__':
+    main()
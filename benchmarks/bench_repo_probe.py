@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark bytes transferred per profile scrape: repo pages vs raw-file probes.
+
+Serves synthetic GitHub pages and raw README/LICENSE files from a local HTTP
+server, points GithubScraper at it via GITHUB_BASE_URL/GITHUB_RAW_BASE_URL,
+and compares requests, bytes and wall time for GITHUB_REPO_PROBE=page and
+GITHUB_REPO_PROBE=raw, checking that both agree on README size and license presence.
+
+Usage:
+    python3 benchmarks/bench_repo_probe.py [--profiles N] [--pinned N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from github_fixtures import profile_fixture_set
+
+
+def raw_files(pages):
+    """Raw README.md/LICENSE bodies for every repository page in a fixture set."""
+    files = {}
+    for path in pages:
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] != 'users':
+            readme = ''.join(f"Section {i}: lorem ipsum dolor sit amet, usage notes and examples.\n" for i in range(40))
+            files[f"/raw/{parts[0]}/{parts[1]}/HEAD/README.md"] = readme.encode()
+            files[f"/raw/{parts[0]}/{parts[1]}/HEAD/LICENSE"] = b"MIT License\n" + b"Permission is hereby granted...\n" * 30
+    return files
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    routes = {}
+
+    def _lookup(self):
+        body = self.routes.get(urlparse(self.path).path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_GET(self):
+        body = self._lookup()
+        if body:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._lookup()
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(scraper_cls, usernames, repo_probe):
+    totals = {"requests": 0, "bytes": 0}
+    results = []
+    start = time.perf_counter()
+    for username in usernames:
+        scraper = scraper_cls(username, repo_probe=repo_probe)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = scraper.scrape_profile()
+        results.append([(repo["name"], repo["readme"], repo["qualityFlags"]["hasLicense"])
+                        for repo in data["analyzedRepositories"]])
+        for key in totals:
+            totals[key] += scraper.transfer_stats[key]
+    elapsed = time.perf_counter() - start
+    return {key: value / len(usernames) for key, value in totals.items()}, elapsed / len(usernames), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark repository probing modes')
+    parser.add_argument('--profiles', type=int, default=5, help='Number of synthetic profiles')
+    parser.add_argument('--pinned', type=int, default=6, help='Pinned repositories per profile')
+    args = parser.parse_args()
+
+    usernames = [f"user{i}" for i in range(args.profiles)]
+    for i, username in enumerate(usernames):
+        pages = profile_fixture_set(username, args.pinned, seed=i)
+        FixtureHandler.routes.update({path: html.encode() for path, html in pages.items()})
+        FixtureHandler.routes.update(raw_files(pages))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ['GITHUB_BASE_URL'] = base
+    os.environ['GITHUB_RAW_BASE_URL'] = f"{base}/raw"
+    # Local server: don't let the production rate limits dominate the timing
+    for name in ('GITHUB', 'GITHUB_RAW'):
+        os.environ[f'OUTBOUND_{name}_RATE'] = '10000'
+        os.environ[f'OUTBOUND_{name}_BURST'] = '10000'
+
+    from backend.github_scraper import GithubScraper
+
+    print(f"{args.profiles} profiles, {args.pinned} pinned repos each")
+    print("=" * 70)
+    page_stats, page_time, page_results = measure(GithubScraper, usernames, 'page')
+    raw_stats, raw_time, raw_results = measure(GithubScraper, usernames, 'raw')
+    server.shutdown()
+
+    if page_results != raw_results:
+        print("❌ Probe mode disagreed with page mode on README size or license presence")
+        sys.exit(1)
+
+    print(f"{'mode':<8} {'requests':>10} {'KB/profile':>12} {'time/profile':>14}")
+    print(f"{'page':<8} {page_stats['requests']:>10.0f} {page_stats['bytes'] / 1024:>12.1f} {page_time * 1000:>12.1f}ms")
+    print(f"{'raw':<8} {raw_stats['requests']:>10.0f} {raw_stats['bytes'] / 1024:>12.1f} {raw_time * 1000:>12.1f}ms")
+    print(f"Bytes saved {100 * (1 - raw_stats['bytes'] / page_stats['bytes']):.0f}% (README sizes and license flags identical)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sampling profiler's overhead on a CPU-bound workload.
+
+Runs a fixed amount of request-like work (JSON encoding of the candidates
+payload plus heuristic scoring) with the sampler off and on at several
+intervals, alternating runs to cancel machine noise, while --idle-threads
+threads sit blocked like an idle worker pool. Reports the slowdown, the
+overhead the sampler measured itself, and the stacks it collected.
+
+Usage:
+    python3 benchmarks/bench_sampler_overhead.py [--rounds N] [--intervals 1,5,10,20]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.heuristic_rating import heuristic_ratings
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from backend.sampling_profiler import SamplingProfiler
+from bench_json_encoding import candidates_payload
+from synthetic_pdfs import make_pdf
+
+
+def workload(resumes, repeat):
+    for _ in range(repeat):
+        json.dumps(candidates_payload(resumes), sort_keys=True)
+        for resume in resumes:
+            heuristic_ratings({}, resume)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sampling profiler overhead')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20, help='Workload iterations per run')
+    parser.add_argument('--intervals', default='1,5,10,20', help='Sampling intervals in ms')
+    parser.add_argument('--idle-threads', type=int, default=8)
+    args = parser.parse_args()
+
+    resumes = [extract_text_from_pdf_bytes(make_pdf(pages=2, seed=i)) for i in range(10)]
+    stop = threading.Event()
+    for _ in range(args.idle_threads):
+        threading.Thread(target=stop.wait, daemon=True).start()
+    run = lambda: workload(resumes, args.repeat)
+    run()
+
+    print(f"{args.rounds} alternating runs of {args.repeat} workload iterations, {args.idle_threads} idle threads")
+    print("=" * 74)
+    print(f"{'interval':<10} {'off':>9} {'on':>9} {'slowdown':>9} {'measured':>9} {'samples':>8} {'stacks':>7}")
+    directory = tempfile.mkdtemp(prefix='bench_sampler_')
+    for interval in (float(value) for value in args.intervals.split(',')):
+        # max_overhead=1 disables the adaptive back-off so the raw cost of each interval shows
+        profiler = SamplingProfiler(interval_ms=interval, directory=directory, rotate_seconds=3600, max_overhead=1)
+        off, on = [], []
+        for _ in range(args.rounds):
+            off.append(timed(run))
+            with contextlib.redirect_stdout(io.StringIO()):
+                profiler.start()
+            on.append(timed(run))
+            stacks = len(profiler.current_window())
+            profiler.stop()
+        status = profiler.status()
+        slowdown = statistics.median(on) / statistics.median(off) - 1
+        print(f"{interval:>6.0f}ms {statistics.median(off):>8.3f}s {statistics.median(on):>8.3f}s "
+              f"{slowdown:>8.1%} {status['overhead']:>8.2%} {status['samples']:>8} {stacks:>7}")
+    stop.set()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark request throughput of the development server against the prefork runner.
+
+Starts run_server.py twice on a temporary database in replay mode: once with
+Flask's development server and once with --production. Each run is hammered
+by --concurrency client threads fetching /health and /api/teams for
+--duration seconds; reports requests per second, latency percentiles and
+errors. The prefork runner gains most on machines with several cores, since
+its workers do not share a GIL.
+
+Usage:
+    python3 benchmarks/bench_server_throughput.py [--duration S] [--concurrency N]
+        [--workers N] [--threads N] [--port PORT]
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+PATHS = ('/health', '/api/teams')
+
+
+def wait_until_ready(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def hammer(port, duration, concurrency):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(index):
+        local, failed, i = [], 0, index
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                conn.request('GET', PATHS[i % len(PATHS)])
+                response = conn.getresponse()
+                response.read()
+                conn.close()
+                if response.status != 200:
+                    failed += 1
+                    continue
+                local.append(time.perf_counter() - start)
+            except OSError:
+                failed += 1
+            i += 1
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, sum(errors)
+
+
+def run(label, extra_args, args, env):
+    process = subprocess.Popen([sys.executable, str(ROOT / 'run_server.py'), '--port', str(args.port)] + extra_args,
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_until_ready(args.port):
+            print(f"{label:<28} failed to start")
+            return
+        # Every worker imports and initializes the app; let them all finish before measuring
+        hammer(args.port, 2, args.concurrency)
+        latencies, errors = hammer(args.port, args.duration, args.concurrency)
+        latencies.sort()
+        print(f"{label:<28} {len(latencies) / args.duration:>8.0f} {statistics.median(latencies) * 1000:>7.1f}ms "
+              f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.1f}ms {errors:>7}")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dev server vs prefork runner throughput')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per server')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    env = dict(os.environ, REPLAY_MODE='replay',
+               DATABASE_PATH=str(Path(tempfile.mkdtemp(prefix='bench_server_')) / 'bench.db'))
+
+    print(f"{args.concurrency} clients x {args.duration:.0f}s on {', '.join(PATHS)} ({os.cpu_count()} CPUs)")
+    print("=" * 66)
+    print(f"{'server':<28} {'req/s':>8} {'p50':>9} {'p99':>9} {'errors':>7}")
+    run("dev server (threaded)", [], args, env)
+    run(f"prefork {args.workers}x{args.threads}",
+        ['--production', '--workers', str(args.workers), '--threads', str(args.threads)], args, env)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark worker cold start and report per-module import cost.
+
+1. Import-time report: runs `python -X importtime -c "import backend.api_server"`
+   and lists the most expensive top-level packages (summed self time) and
+   modules (cumulative time).
+2. Cold start: starts fresh interpreters that import the API, run create_app()
+   on an empty temporary database and serve a first /api/teams request through
+   the test client, for each RATING_SERVICE_INIT mode. RatingService builds
+   live Gemini models (a placeholder key is used when GEMINI_API_KEY is unset;
+   nothing is sent), so 'eager' pays for the SDK import as workers used to.
+   The median wall time from process start to that first response is checked
+   against --target.
+
+Exits with status 1 when the background mode misses the target.
+
+Usage:
+    python3 benchmarks/bench_startup.py [--runs N] [--target S] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+COLD_START_SCRIPT = r'''
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from backend.api_server import create_app
+imported = time.perf_counter()
+app = create_app({"DATABASE_PATH": sys.argv[2]})
+created = time.perf_counter()
+status = app.test_client().get("/api/teams").status_code
+served = time.perf_counter()
+print(json.dumps({"import": imported - started, "create_app": created - imported,
+                  "first_request": served - created, "status": status}))
+sys.stdout.flush()
+'''
+
+
+def import_report(top):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import backend.api_server'],
+                            cwd=ROOT, capture_output=True, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules.append((name, int(self_us), int(cumulative_us)))
+
+    packages = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split('.')[0]] += self_us
+    total = sum(packages.values())
+
+    print(f"Import of backend.api_server: {total / 1000:.0f}ms over {len(modules)} modules")
+    print("-" * 66)
+    print(f"{'package':<34} {'self total':>12} {'share':>7}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<34} {self_us / 1000:>10.1f}ms {self_us / total:>7.1%}")
+    print("-" * 66)
+    print(f"{'module':<34} {'cumulative':>12} {'self':>9}")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda module: -module[2])[:top]:
+        print(f"{name[:34]:<34} {cumulative_us / 1000:>10.1f}ms {self_us / 1000:>7.1f}ms")
+
+
+def cold_start(init_mode, runs):
+    timings = []
+    # Live mode so RatingService builds real Gemini models (no network call until a rating is requested)
+    env = dict(os.environ, REPLAY_MODE='off', GEMINI_API_KEY=os.getenv('GEMINI_API_KEY') or 'bench-placeholder-key',
+               RATING_SERVICE_INIT=init_mode)
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix='bench_startup_') as tmp:
+            result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT, str(ROOT), str(Path(tmp) / 'db.sqlite')],
+                                    cwd=ROOT, env=env, capture_output=True, text=True)
+        lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+        if result.returncode or not lines:
+            raise RuntimeError(f"cold start failed ({init_mode}): {result.stderr[-500:]}")
+        timings.append(json.loads(lines[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold start and import cost')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per mode')
+    parser.add_argument('--target', type=float, default=0.6, help='Target seconds to the first response')
+    parser.add_argument('--top', type=int, default=12, help='Rows in the import report')
+    args = parser.parse_args()
+
+    import_report(args.top)
+
+    print()
+    print(f"Cold start to first /api/teams response, median of {args.runs} (target {args.target:.2f}s)")
+    print("=" * 66)
+    print(f"{'RATING_SERVICE_INIT':<20} {'import':>9} {'create_app':>11} {'1st req':>9} {'total':>9}")
+    met = True
+    for init_mode in ('eager', 'background', 'lazy'):
+        timings = cold_start(init_mode, args.runs)
+        medians = {key: statistics.median(timing[key] for timing in timings)
+                   for key in ('import', 'create_app', 'first_request')}
+        total = statistics.median(sum(timing[key] for key in medians) for timing in timings)
+        verdict = ''
+        if init_mode == 'background':
+            met = total <= args.target
+            verdict = '  ✅ on target' if met else '  ❌ over target'
+        print(f"{init_mode:<20} {medians['import'] * 1000:>7.0f}ms {medians['create_app'] * 1000:>9.0f}ms "
+              f"{medians['first_request'] * 1000:>7.0f}ms {total * 1000:>7.0f}ms{verdict}")
+    sys.exit(0 if met else 1)
+
+
+if __name__ == '__main__':
+    main()
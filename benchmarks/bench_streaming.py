@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark streamed vs whole-response Gemini rating with the offline fake model.
+
+Rates the same synthetic candidate with RatingService.generate_ratings in both
+modes against a FakeGeminiModel whose output time is proportional to its
+length, and reports time-to-first-score and time-to-complete. A second run
+makes the fake answer with prose instead of JSON, to show how soon the
+streaming parser gives up compared to waiting for the full generation.
+
+Usage:
+    python3 benchmarks/bench_streaming.py [--runs N] [--call-latency S] [--per-1k-output-chars S]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ['REPLAY_MODE'] = 'replay'
+# Nothing recorded: the fake synthesises every answer
+os.environ['REPLAY_CASSETTE'] = str(Path(tempfile.gettempdir()) / 'bench_streaming_cassette.json')
+os.environ['OUTBOUND_GEMINI_RATE'] = '10000'
+os.environ['OUTBOUND_GEMINI_BURST'] = '10000'
+
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from backend.rating_service import RatingService
+from backend.replay import FakeGeminiModel, FakeResponse
+from synthetic_pdfs import make_pdf
+
+
+class ProseModel(FakeGeminiModel):
+    """Answers like a model that ignored the JSON instructions."""
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        text = "Sure! Here is my assessment of the candidate. " * 40
+        time.sleep(self.latency)
+        if stream:
+            return self._stream(text)
+        time.sleep(len(text) * self.per_1k_output_chars / 1000)
+        return FakeResponse(text)
+
+
+def make_candidate():
+    repos = [{"name": f"project-{j}", "description": f"A tool that does useful thing number {j}",
+              "primaryLanguage": "Python", "stars": j * 3} for j in range(6)]
+    github_data = {"username": "benchuser", "total_repos": len(repos),
+                   "total_stars": sum(repo["stars"] for repo in repos), "repositories": repos}
+    return github_data, extract_text_from_pdf_bytes(make_pdf(pages=2, seed=0))
+
+
+def measure(service, github_data, resume_text, stream):
+    """Seconds until the first rating and until generate_ratings returned."""
+    service._collect_github_data = lambda username: github_data
+    first = []
+    start = time.perf_counter()
+
+    def on_rating(name, rating):
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        ratings = service.generate_ratings("https://github.com/benchuser", resume_text,
+                                           on_rating=on_rating, stream=stream)
+    total = time.perf_counter() - start
+    return (first[0] if first else None), total, ratings["overall_rating"]["score"] > 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streamed Gemini rating against whole responses')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--call-latency', type=float, default=0.3, help='Fake time to first token (s)')
+    parser.add_argument('--per-1k-output-chars', type=float, default=1.0,
+                        help='Fake generation time per 1k output chars (s)')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = RatingService()
+    github_data, resume_text = make_candidate()
+    fake = dict(latency=args.call_latency, per_1k_prompt_chars=0.0,
+                per_1k_output_chars=args.per_1k_output_chars, seed=0)
+
+    print(f"{args.runs} runs, fake first-token latency {args.call_latency}s, "
+          f"{args.per_1k_output_chars}s per 1k output chars")
+    print("=" * 70)
+    print(f"{'mode':<22} {'first score':>12} {'complete':>10}  rated")
+    for label, model_class, stream in (("whole response", FakeGeminiModel, False),
+                                       ("streamed", FakeGeminiModel, True),
+                                       ("prose, whole response", ProseModel, False),
+                                       ("prose, streamed", ProseModel, True)):
+        service.model = model_class(**fake)
+        results = [measure(service, github_data, resume_text, stream) for _ in range(args.runs)]
+        firsts = [first for first, _, _ in results if first is not None]
+        first_text = f"{statistics.median(firsts) * 1000:>10.0f}ms" if firsts else f"{'-':>12}"
+        complete = statistics.median(total for _, total, _ in results)
+        rated = sum(1 for _, _, ok in results if ok)
+        print(f"{label:<22} {first_text} {complete * 1000:>8.0f}ms  {rated}/{args.runs}")
+
+
+if __name__ == '__main__':
+    main()
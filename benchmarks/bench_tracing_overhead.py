@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of tracing spans.
+
+Times entering and leaving a span outside a trace (the no-op path every
+request takes with tracing off or unsampled), inside a trace (a recorded
+span with attributes and an event), and exporting finished spans to an
+OTLP/JSON file. The per-request figure multiplies the recorded cost by the
+~20 spans of a traced /api/rate-profile request.
+
+Usage:
+    python3 benchmarks/bench_tracing_overhead.py [--iterations N]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.tracing import FileSpanExporter, KIND_SERVER, span, start_trace
+import backend.tracing as tracing
+
+SPANS_PER_REQUEST = 20
+
+
+def per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def noop_span():
+    with span('pdf.extract') as current:
+        current.set_attribute('pdf.pages', 2)
+
+
+def recorded_span():
+    with span('pdf.extract') as current:
+        current.set_attribute('pdf.pages', 2)
+        current.add_event('extracted')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tracing span overhead')
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench_tracing_')
+    # Long flush interval: spans are written by the explicit flush() below, not the background thread
+    tracing.exporter = FileSpanExporter(Path(directory) / 'spans.jsonl', flush_seconds=3600)
+
+    noop = per_call(noop_span, args.iterations)
+
+    root = start_trace('POST /api/rate-profile', KIND_SERVER)
+    token = tracing._current.set(root)
+    recorded = per_call(recorded_span, args.iterations)
+    tracing._current.reset(token)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        written = tracing.exporter.flush()
+    export = (time.perf_counter() - start) / max(written, 1)
+    size = tracing.exporter.path.stat().st_size / max(written, 1)
+
+    print(f"{args.iterations} spans per case, exported to {tracing.exporter.path}")
+    print("=" * 64)
+    print(f"{'no-op span (tracing off or unsampled)':<42} {noop * 1e6:>8.2f}us")
+    print(f"{'recorded span':<42} {recorded * 1e6:>8.2f}us")
+    print(f"{'export per span (OTLP JSON, flusher thread)':<42} {export * 1e6:>8.2f}us  {size:.0f} B")
+    print(f"{f'traced request ({SPANS_PER_REQUEST} spans)':<42} "
+          f"{(recorded + export) * SPANS_PER_REQUEST * 1000:>8.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
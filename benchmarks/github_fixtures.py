@@ -0,0 +1,119 @@
+"""
+Synthetic GitHub HTML fixtures for benchmarks.
+
+The pages mimic the structure GithubScraper reads (pinned-item boxes, profile
+name/bio, contribution include-fragment and calendar, README container and
+license link) and are padded with the kind of markup that makes real GitHub
+pages several hundred KB: navigation, embedded JSON payloads, inline SVG icons
+and long file listings.
+"""
+
+import json
+import random
+
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "C++", "Java"]
+
+
+def _chrome(rng, size_kb):
+    """Header/nav/footer filler plus embedded JSON roughly `size_kb` KB long."""
+    nav = ''.join(
+        f'<li class="HeaderMenu-item"><a class="HeaderMenu-link" href="/features/{i}">'
+        f'<svg aria-hidden="true" height="16" viewBox="0 0 16 16" width="16" class="octicon">'
+        f'<path d="M{i} 0h8v8H{i}z"></path></svg>Feature {i}</a></li>'
+        for i in range(60)
+    )
+    payload = json.dumps({
+        "props": {"items": [{"id": i, "token": "%032x" % rng.getrandbits(128), "flags": [True, False] * 4}
+                            for i in range(size_kb * 8)]}
+    })
+    return (f'<header class="Header"><nav><ul>{nav}</ul></nav></header>',
+            f'<script type="application/json" data-target="react-app.embeddedData">{payload}</script>'
+            f'<footer class="footer">{nav}</footer>')
+
+
+def profile_page(username, pinned=6, seed=0, size_kb=200):
+    """HTML of a profile page with `pinned` pinned repositories."""
+    rng = random.Random(seed)
+    header, footer = _chrome(rng, size_kb)
+    items = []
+    for i in range(pinned):
+        repo = f"project-{i}" if i % 3 else f"leetcode-solutions-{i}"
+        items.append(f'''
+<li class="mb-3 d-flex flex-content-stretch col-12 col-md-6 col-lg-6">
+  <div class="Box d-flex pinned-item-list-item p-3 width-full public source">
+    <div class="pinned-item-list-item-content">
+      <div class="d-flex width-full flex-items-center position-relative">
+        <a href="/{username}/{repo}" class="Link mr-1 text-bold wb-break-word" data-view-component="true">
+          <span class="repo">{repo}</span></a>
+      </div>
+      <p class="pinned-item-desc color-fg-muted text-small mt-2 mb-0">A {rng.choice(LANGUAGES)} project number {i}</p>
+      <p class="mb-0 f6 color-fg-muted">
+        <span class="d-inline-block mr-3"><span itemprop="programmingLanguage">{rng.choice(LANGUAGES)}</span></span>
+        <a href="/{username}/{repo}/stargazers" class="pinned-item-meta Link--muted">
+          <svg class="octicon octicon-star" height="16" width="16"><path d="M8 .25z"></path></svg>
+          {rng.choice(["3", "42", "1,204", "16.7k"])}</a>
+      </p>
+    </div>
+  </div>
+</li>''')
+    return f'''<!DOCTYPE html><html lang="en"><head><title>{username}</title></head><body>
+{header}
+<main>
+  <div class="js-profile-editable-area">
+    <h1 class="vcard-names"><span class="p-name vcard-fullname d-block overflow-hidden" itemprop="name">{username.title()} Example</span></h1>
+    <div class="p-note user-profile-bio mb-3 js-user-profile-bio f4"><div>Building things with code since {2010 + seed % 10}.</div></div>
+  </div>
+  <div class="js-pinned-items-reorder-container"><ol class="d-flex flex-wrap list-style-none gutter-condensed mb-2 js-pinned-items-reorder-list">
+  {''.join(items)}
+  </ol></div>
+  <include-fragment src="/users/{username}/contributions?to=2025-12-31" class="js-yearly-contributions"></include-fragment>
+</main>
+{footer}
+</body></html>'''
+
+
+def contributions_page(username, seed=0):
+    """HTML fragment of the contribution calendar."""
+    rng = random.Random(seed)
+    cells = ''.join(
+        f'<td tabindex="0" data-ix="{i}" class="ContributionCalendar-day-cell">'
+        f'<rect class="ContributionCalendar-day" data-date="2025-01-{i % 28 + 1:02d}" data-level="{rng.choice([0, 0, 1, 2, 3])}"></rect></td>'
+        for i in range(371)
+    )
+    total = rng.randint(50, 3000)
+    return f'''<div class="js-yearly-contributions">
+<h2 class="f4 text-normal mb-2">{total:,} contributions in the last year</h2>
+<table class="ContributionCalendar-grid js-calendar-graph-table"><tbody><tr>{cells}</tr></tbody></table>
+</div>'''
+
+
+def repo_page(username, repo, seed=0, size_kb=150, branch="main"):
+    """HTML of a repository page with a README and a LICENSE link on `branch`."""
+    rng = random.Random(seed)
+    header, footer = _chrome(rng, size_kb)
+    files = ''.join(
+        f'<tr class="react-directory-row"><td><a href="/{username}/{repo}/blob/{branch}/src/file_{i}.py">file_{i}.py</a></td>'
+        f'<td>commit message {i}</td></tr>'
+        for i in range(200)
+    ) + (f'<tr class="react-directory-row"><td><a href="/{username}/{repo}/blob/{branch}/README.md">README.md</a></td>'
+         f'<td>Add README</td></tr>')
+    readme = ''.join(f'<p>Section {i}: lorem ipsum dolor sit amet, usage notes and examples.</p>' for i in range(40))
+    return f'''<!DOCTYPE html><html lang="en"><head><title>{repo}</title></head><body>
+{header}
+<main>
+  <table>{files}</table>
+  <a href="/{username}/{repo}/blob/{branch}/LICENSE" class="Link--muted">MIT license</a>
+  <div id="readme" class="Box-body readme blob js-code-block-container p-5"><article class="markdown-body">{readme}</article></div>
+</main>
+{footer}
+</body></html>'''
+
+
+def profile_fixture_set(username="octocat", pinned=6, seed=0):
+    """Return {url_path: html} for one full profile scrape."""
+    pages = {f"/{username}": profile_page(username, pinned, seed),
+             f"/users/{username}/contributions": contributions_page(username, seed)}
+    for i in range(pinned):
+        repo = f"project-{i}" if i % 3 else f"leetcode-solutions-{i}"
+        pages[f"/{username}/{repo}"] = repo_page(username, repo, seed + i)
+    return pages
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Deterministic offline load test for POST /api/rate-profile.
+
+Builds a cassette from the synthetic GitHub fixtures, serves it with
+StubGithubServer, starts run_server.py against a throwaway database with
+REPLAY_MODE=replay (FakeGeminiModel with the given latency and failure rate),
+then fires concurrent rate-profile requests and reports throughput, latency
+percentiles and how many responses carried AI (not heuristic fallback) ratings.
+
+No network access or GEMINI_API_KEY is needed.
+
+Usage:
+    python3 benchmarks/loadtest_rate_profile.py [--requests N] [--concurrency N]
+        [--llm-latency S] [--llm-failure-rate P] [--github-latency S] [--real-limits]
+
+Set LOADTEST_SERVER_LOG=path to keep the server's output.
+"""
+
+import argparse
+import base64
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.replay import Cassette, StubGithubServer
+from github_fixtures import profile_fixture_set
+from synthetic_pdfs import make_pdf
+
+
+def build_cassette(path, usernames, pinned):
+    """Record the fixture pages (and raw README/LICENSE files) as if scraped from GitHub."""
+    cassette = Cassette(path)
+    readme = ''.join(f"Section {i}: usage notes and examples.\n" for i in range(40))
+    for i, username in enumerate(usernames):
+        for page_path, html in profile_fixture_set(username, pinned, seed=i).items():
+            cassette.add_http('GET', f"https://github.com{page_path}", 200, {'Content-Type': 'text/html'}, html)
+            parts = page_path.strip('/').split('/')
+            if len(parts) == 2 and parts[0] != 'users':
+                raw = f"https://raw.githubusercontent.com{page_path}/HEAD"
+                cassette.add_http('HEAD', f"{raw}/README.md", 200, {'Content-Length': str(len(readme))})
+                # Every other repository has no license, to exercise the 404 path
+                if i % 2 == 0:
+                    cassette.add_http('HEAD', f"{raw}/LICENSE", 200, {'Content-Length': '1071'})
+    cassette.save()
+    return cassette
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_health(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline load test for /api/rate-profile')
+    parser.add_argument('--requests', type=int, default=60, help='Total requests to send')
+    parser.add_argument('--concurrency', type=int, default=6, help='Concurrent clients')
+    parser.add_argument('--profiles', type=int, default=10, help='Distinct GitHub profiles')
+    parser.add_argument('--pinned', type=int, default=6, help='Pinned repositories per profile')
+    parser.add_argument('--resumes', type=int, default=10, help='Distinct resume PDFs')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Fake Gemini latency in seconds')
+    parser.add_argument('--llm-failure-rate', type=float, default=0.0, help='Fraction of fake Gemini calls that fail')
+    parser.add_argument('--github-latency', type=float, default=0.02, help='Stub GitHub latency per response')
+    parser.add_argument('--real-limits', action='store_true',
+                        help='Keep production outbound rate limits (default: lifted for the local stub)')
+    parser.add_argument('--keep-cassette', type=str, help='Also write the generated cassette here')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        usernames = [f"loaduser{i}" for i in range(args.profiles)]
+        cassette_path = Path(args.keep_cassette) if args.keep_cassette else workdir / 'cassette.json'
+        cassette = build_cassette(cassette_path, usernames, args.pinned)
+        stub = StubGithubServer(cassette, latency=args.github_latency).start()
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        env = dict(os.environ,
+                   REPLAY_MODE='replay', REPLAY_CASSETTE=str(cassette_path),
+                   GITHUB_BASE_URL=stub.base_url, GITHUB_RAW_BASE_URL=stub.raw_base_url,
+                   DATABASE_PATH=str(workdir / 'loadtest.db'),
+                   FAKE_GEMINI_LATENCY=str(args.llm_latency),
+                   FAKE_GEMINI_JITTER=str(args.llm_latency / 4),
+                   FAKE_GEMINI_FAILURE_RATE=str(args.llm_failure_rate),
+                   FAKE_GEMINI_SEED='0')
+        if not args.real_limits:
+            for name in ('GITHUB', 'GITHUB_RAW', 'GEMINI'):
+                env[f'OUTBOUND_{name}_RATE'] = '10000'
+                env[f'OUTBOUND_{name}_BURST'] = '10000'
+                env[f'OUTBOUND_{name}_CONCURRENCY'] = '64'
+        log_path = Path(os.getenv('LOADTEST_SERVER_LOG', workdir / 'server.log'))
+        with open(log_path, 'w') as log:
+            server = subprocess.Popen([sys.executable, str(PROJECT_ROOT / 'run_server.py'), '--host', '127.0.0.1',
+                                       '--port', str(port)], env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            wait_for_health(base_url, server)
+            resumes = [base64.b64encode(make_pdf(pages=2, seed=i)).decode() for i in range(args.resumes)]
+
+            def send(i):
+                payload = {"githubUsername": usernames[i % len(usernames)], "resumeBase64": resumes[i % len(resumes)]}
+                start = time.perf_counter()
+                response = requests.post(f"{base_url}/api/rate-profile", json=payload, timeout=120)
+                ratings = response.json().get("ratings") or {}
+                # Heuristic fallback ratings do not count as rated
+                return time.perf_counter() - start, response.status_code, bool(ratings) and "engine" not in ratings
+
+            print(f"{args.requests} requests, concurrency {args.concurrency}, "
+                  f"fake Gemini {args.llm_latency}s (failure rate {args.llm_failure_rate}), "
+                  f"stub GitHub {args.github_latency}s/response")
+            print("=" * 70)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                results = list(executor.map(send, range(args.requests)))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+            stub.stop()
+
+        latencies = [latency for latency, _, _ in results]
+        statuses = Counter(status for _, status, _ in results)
+        rated = sum(1 for _, _, has_ratings in results if has_ratings)
+        print(f"throughput   {len(results) / elapsed:8.2f} req/s  ({elapsed:.1f}s total)")
+        print(f"latency      p50 {statistics.median(latencies) * 1000:7.0f}ms  "
+              f"p95 {percentile(latencies, 95) * 1000:7.0f}ms  p99 {percentile(latencies, 99) * 1000:7.0f}ms")
+        print(f"status codes {dict(statuses)}")
+        print(f"AI ratings   {rated}/{len(results)}")
+
+
+if __name__ == '__main__':
+    main()
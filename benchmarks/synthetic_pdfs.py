@@ -0,0 +1,75 @@
+"""
+Synthetic resume-like PDFs for benchmarks.
+
+Builds minimal, valid PDF files by hand (one Helvetica text stream per page) so
+the benchmarks need nothing beyond the standard library and PyPDF2.
+"""
+
+import random
+
+WORDS = (
+    "python javascript react node docker kubernetes aws postgres mongodb flask "
+    "django api backend frontend machine learning data pipeline team lead built "
+    "designed deployed scaled optimized latency throughput hackathon project "
+    "university internship engineer developer research open source contributor"
+).split()
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages=2, lines_per_page=45, seed=0):
+    """Return the bytes of a PDF with `pages` pages of pseudo-random resume text."""
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)
+    pages_id = add(None)
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for _ in range(pages):
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for _ in range(lines_per_page):
+            line = ' '.join(rng.choice(WORDS) for _ in range(12))
+            commands.append(f"({_escape(line)}) Tj T*")
+        commands.append("ET")
+        stream = '\n'.join(commands).encode('latin-1')
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b' '.join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset)
+    return bytes(out)
+
+
+def make_corpus(page_counts=(1, 2, 3, 5, 10, 50, 200), copies=3):
+    """Return a list of (label, pdf_bytes) covering typical and pathological resume sizes."""
+    corpus = []
+    for pages in page_counts:
+        for copy in range(copies):
+            corpus.append((f"{pages}p#{copy}", make_pdf(pages=pages, seed=pages * 100 + copy)))
+    return corpus
@@ -45,63 +45,146 @@ document.getElementById('rating-form').addEventListener('submit', async function
     submitButton.textContent = 'Storing Data...';
     resultContainer.innerHTML = `<p class="text-yellow-400">Uploading resume and GitHub information...</p>`;
 
-    // Convert PDF to base64 to send as a string
-    const reader = new FileReader();
-    reader.readAsDataURL(resumeFile);
-    reader.onload = async () => {
-        const resumeBase64 = reader.result.split(',')[1]; // Get only the base64 part
-
-        // Get current user session to include user_id
-        const userSession = getLoggedInUser();
-        
-        const profileData = {
-            githubUsername,
-            resumeBase64, // Send resume as a base64 encoded string
-            user_id: userSession ? userSession.userId : null // Include logged-in user ID
-        };
+    // Stream the PDF as a multipart upload (no base64 encoding in the browser or server)
+    const userSession = getLoggedInUser();
+    const formData = new FormData();
+    formData.append('githubUsername', githubUsername);
+    formData.append('resume', resumeFile);
+    if (userSession) {
+        formData.append('user_id', userSession.userId); // Include logged-in user ID
+    }
 
-        try {
-            // Use our Python backend
-            const response = await fetch('http://localhost:5000/api/rate-profile', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(profileData),
-            });
+    const apiBase = 'http://localhost:5000';
+    const stageLabels = {
+        queued: 'Waiting for a free worker',
+        started: 'Starting',
+        pdf_extracted: 'Resume read',
+        github_scraped: 'GitHub profile analysed',
+        llm_started: 'Generating AI ratings',
+        scored: 'Ratings stored'
+    };
 
-            if (!response.ok) {
-                throw new Error('Server responded with an error.');
-            }
+    function showError(message) {
+        resultContainer.innerHTML = `<p class="text-red-500">Error: Could not store data. ${message}</p>`;
+        submitButton.disabled = false;
+        submitButton.textContent = 'Store My Data';
+    }
 
-            const result = await response.json();
-            
-            if (!result.success) {
-                throw new Error(result.message || 'Data storage failed');
-            }
+    try {
+        // Start the rating in the background, then follow its progress as server-sent events
+        const response = await fetch(`${apiBase}/api/rate-profile/jobs`, {
+            method: 'POST',
+            body: formData,
+        });
 
-            // Clear any existing ratings from localStorage since we're just storing data now
-            localStorage.removeItem('userRatings');
+        const job = await response.json();
+        if (!response.ok || !job.success) {
+            throw new Error(job.message || 'Server responded with an error.');
+        }
 
-            resultContainer.innerHTML = `
-                <div class="bg-gray-700 p-4 rounded-lg">
-                    <p class="text-green-400 mb-2"><strong>✅ Success!</strong> Your profile data has been saved.</p>
-                    <p class="text-gray-300 mb-2">You can update your profile or resume anytime by submitting again.</p>
-                    <a href="homepage.html" class="inline-block mt-4 text-blue-400 hover:text-blue-300">&larr; Go back to homepage</a>
-                </div>
-            `;
-            submitButton.textContent = 'Profile Saved!';
+        resultContainer.innerHTML = `
+            <div class="bg-gray-700 p-4 rounded-lg">
+                <ul id="rating-progress" class="text-gray-300 space-y-1"></ul>
+                <pre id="github-report" class="hidden mt-4 text-xs text-gray-400 whitespace-pre-wrap"></pre>
+            </div>
+        `;
+        const progressList = document.getElementById('rating-progress');
+        const githubReport = document.getElementById('github-report');
 
-        } catch (error) {
-            console.error('Failed to store data:', error);
-            resultContainer.innerHTML = `<p class="text-red-500">Error: Could not store data. ${error.message}</p>`;
-            submitButton.disabled = false;
-            submitButton.textContent = 'Store My Data';
+        const events = new EventSource(`${apiBase}${job.events_url}`);
+        Object.keys(stageLabels).forEach((stage) => {
+            events.addEventListener(stage, (message) => {
+                const data = JSON.parse(message.data);
+                const item = document.createElement('li');
+                item.textContent = `✅ ${stageLabels[stage]} (${(data.elapsed_ms / 1000).toFixed(1)}s)`;
+                progressList.appendChild(item);
+
+                // Partial result: show the GitHub report while the AI ratings are generated
+                if (stage === 'github_scraped' && data.github_analysis) {
+                    githubReport.textContent = data.github_analysis;
+                    githubReport.classList.remove('hidden');
+                }
+
+                if (stage === 'scored') {
+                    events.close();
+                    showFinalScores(data.result);
+                    // Clear any existing ratings from localStorage since we're just storing data now
+                    localStorage.removeItem('userRatings');
+                    resultContainer.insertAdjacentHTML('beforeend', `
+                        <div class="bg-gray-700 p-4 rounded-lg mt-4">
+                            <p class="text-green-400 mb-2"><strong>✅ Success!</strong> Your profile data has been saved.</p>
+                            <p class="text-gray-300 mb-2">You can update your profile or resume anytime by submitting again.</p>
+                            <a href="homepage.html" class="inline-block mt-4 text-blue-400 hover:text-blue-300">&larr; Go back to homepage</a>
+                        </div>
+                    `);
+                    submitButton.textContent = 'Profile Saved!';
+                }
+            });
+        });
+
+        // Each score arrives as soon as Gemini has written it
+        const ratingLabels = {
+            git_rating: 'GitHub',
+            resume_rating: 'Resume',
+            overall_rating: 'Overall'
+        };
+        // Local estimate, replaced by the AI scores as they arrive
+        events.addEventListener('provisional_scored', (message) => {
+            const data = JSON.parse(message.data);
+            const item = document.createElement('li');
+            const scores = Object.keys(ratingLabels)
+                .map((name) => `${ratingLabels[name]} ${data.ratings[name].score}`)
+                .join(', ');
+            item.textContent = `⏳ Provisional scores: ${scores} (${(data.elapsed_ms / 1000).toFixed(1)}s)`;
+            progressList.appendChild(item);
+        });
+
+        // Streamed scores are provisional until the whole Gemini answer has been validated and stored
+        const streamedItems = {};
+        events.addEventListener('rating_received', (message) => {
+            const data = JSON.parse(message.data);
+            const item = streamedItems[data.name] || document.createElement('li');
+            item.textContent = `⭐ ${ratingLabels[data.name] || data.name} score: ${data.rating.score} (provisional, ${(data.elapsed_ms / 1000).toFixed(1)}s)`;
+            item.dataset.score = data.rating.score;
+            streamedItems[data.name] = item;
+            progressList.appendChild(item);
+        });
+
+        // The stored scores are authoritative: strike out streamed scores they replaced
+        function showFinalScores(result) {
+            const scores = {
+                git_rating: result.scores.git_score,
+                resume_rating: result.scores.resume_score,
+                overall_rating: result.scores.overall_score
+            };
+            Object.entries(streamedItems).forEach(([name, item]) => {
+                if (String(scores[name]) !== item.dataset.score) {
+                    item.classList.add('line-through', 'text-gray-500');
+                }
+            });
+            const item = document.createElement('li');
+            const summary = Object.keys(ratingLabels)
+                .map((name) => `${ratingLabels[name]} ${scores[name]}`)
+                .join(', ');
+            const engine = result.ratings && result.ratings.engine === 'heuristic' ? ' (local estimate; AI rating failed)' : '';
+            item.textContent = `🏁 Stored scores: ${summary}${engine}`;
+            progressList.appendChild(item);
         }
-    };
 
-    reader.onerror = (error) => {
-        console.error('Error reading file:', error);
-        resultContainer.innerHTML = `<p class="text-red-500">Error: Could not read the resume file.</p>`;
-        submitButton.disabled = false;
-        submitButton.textContent = 'Store My Data';
-    };
-});
\ No newline at end of file
+        events.addEventListener('failed', (message) => {
+            events.close();
+            showError(JSON.parse(message.data).message || 'Rating failed');
+        });
+
+        // EventSource reconnects by itself (resuming after the last event); give up only if the job is gone
+        events.onerror = () => {
+            if (events.readyState === EventSource.CLOSED) {
+                showError('Lost connection to the server.');
+            }
+        };
+
+    } catch (error) {
+        console.error('Failed to store data:', error);
+        showError(error.message);
+    }
+});
@@ -8,47 +8,121 @@ import sys
 import os
 import sqlite3
 import json
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from google import genai
 
-# Add the parent directory to sys.path to import from 2.py
-sys.path.append('/home/rudra/Code/hackbite')
+# Import the shared backend modules from the project root
+PROJECT_ROOT = Path(__file__).parent.absolute()
+sys.path.insert(0, str(PROJECT_ROOT))
 
-# Import classes from 2.py
-sys.path.append('/home/rudra/Code/hackbite')
-import importlib.util
-spec = importlib.util.spec_from_file_location("github_scraper", "/home/rudra/Code/hackbite/2.py")
-github_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(github_module)
+from backend.database import DatabaseManager, GithubProfileManager
+from backend.github_scraper import GithubScraper, HighlightGenerator, parse_github_number
+from backend.model_routing import GEMINI_FAST_MODEL, route_ratings, routing_stats
+from backend.outbound import OutboundError, llm_call
+from backend.prompt_budget import fit_prompt_sections, prompt_stats, record_prompt_call, shorten_report_descriptions
+from backend.rating_service import parse_ratings_json
+from backend.replay import gemini_client
 
-GithubScraper = github_module.GithubScraper
-HighlightGenerator = github_module.HighlightGenerator
+
+class BulkCheckpoint:
+    """
+    Resumable progress for bulk re-rating, stored as a small JSON file.
+
+    `last_uid` is a watermark: every user_ratings row up to it has been written.
+    Rows finished out of order beyond the watermark are kept in `done`. Rows
+    that could not be scored are kept in `failed` and retried first by the next
+    run. The checkpoint is tied to a hash of the prompt, so editing prompt.txt
+    starts over.
+    """
+
+    def __init__(self, path, prompt_hash):
+        self.path = Path(path)
+        self.prompt_hash = prompt_hash
+        self.last_uid = 0
+        self.done = set()
+        self.failed = set()
+        self._submitted = []
+
+    def load(self):
+        """Load saved progress if it belongs to the same prompt; returns True if resumed"""
+        if not self.path.exists():
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('prompt_hash') != self.prompt_hash:
+            print(f"⚠️  Prompt changed since checkpoint {self.path}; starting from the beginning")
+            return False
+        self.last_uid = state.get('last_uid', 0)
+        self.done = set(state.get('done', []))
+        self.failed = set(state.get('failed', []))
+        return True
+
+    def save(self):
+        """Write the checkpoint atomically"""
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'prompt_hash': self.prompt_hash,
+                'last_uid': self.last_uid,
+                'done': sorted(self.done),
+                'failed': sorted(self.failed)
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def mark_submitted(self, uid):
+        self._submitted.append(uid)
+
+    def mark_written(self, uid, failed=False):
+        """Record a row as finished and advance the watermark over contiguous finished rows"""
+        if failed:
+            self.failed.add(uid)
+        else:
+            self.failed.discard(uid)
+        if uid <= self.last_uid:
+            # A retried failure: the watermark passed it in an earlier run
+            return
+        self.done.add(uid)
+        while self._submitted and self._submitted[0] in self.done:
+            self.last_uid = self._submitted.pop(0)
+            self.done.discard(self.last_uid)
 
 
 class RatingGenerator:
-    def __init__(self, db_path="/home/rudra/Code/hackbite/1/database/database.db"):
+    def __init__(self, db_path=str(PROJECT_ROOT / "database" / "database.db")):
         self.db_path = db_path
         # The client gets the API key from the environment variable `GEMINI_API_KEY`
+        # (REPLAY_MODE=replay answers offline from a cassette instead)
         try:
-            self.client = genai.Client()
+            self.client = gemini_client(genai.Client)
+            self.model_name = os.getenv('GEMINI_MODEL') or 'gemini-2.5-flash'
+            # Cheaper model tried first by rate_row; empty disables routing
+            self.fast_model_name = GEMINI_FAST_MODEL or None
         except Exception as e:
             print("❌ Error: GEMINI_API_KEY environment variable not set or invalid")
             print("Please set it with: export GEMINI_API_KEY='your_api_key_here'")
             print(f"Error details: {e}")
             sys.exit(1)
+        # Scraped GitHub profiles are stored as rows and rendered into the report on demand
+        profile_db = DatabaseManager(db_path)
+        if not profile_db.connect() or not profile_db.initialize_tables():
+            print(f"❌ Error: could not open database {db_path}")
+            sys.exit(1)
+        self.github_profiles = GithubProfileManager(profile_db)
+    
+    def get_github_report(self, github_link, stored_text=None):
+        """Highlights report from the stored GitHub profile, else legacy text from user_ratings"""
+        if github_link:
+            github_data = self.github_profiles.get(github_link)
+            if github_data:
+                return HighlightGenerator(github_data).generate_report()
+        return stored_text
     
     def convert_github_number(self, text):
         """Convert GitHub number format like '16.7k' to integer"""
-        try:
-            text = text.strip().replace(',', '')
-            if 'k' in text.lower():
-                return int(float(text.lower().replace('k', '')) * 1000)
-            elif 'm' in text.lower():
-                return int(float(text.lower().replace('m', '')) * 1000000)
-            else:
-                return int(text)
-        except:
-            return 0
+        return parse_github_number(text)
     
     def get_resume_data_from_db(self, user_id=None, github_username=None):
         """Get resume data from user_ratings table"""
@@ -59,28 +133,34 @@ class RatingGenerator:
             
             if user_id:
                 query = """
-                    SELECT resume_data, github_link, github_analysis 
-                    FROM user_ratings 
-                    WHERE user_id = ? 
-                    ORDER BY updated_at DESC 
+                    SELECT COALESCE(rb.extracted_text, ur.resume_data) AS resume_data,
+                           ur.github_link, ur.github_analysis
+                    FROM user_ratings ur
+                    LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
+                    WHERE ur.user_id = ? 
+                    ORDER BY ur.updated_at DESC 
                     LIMIT 1
                 """
                 cursor.execute(query, (user_id,))
             elif github_username:
                 query = """
-                    SELECT resume_data, github_link, github_analysis 
-                    FROM user_ratings 
-                    WHERE github_link = ? 
-                    ORDER BY updated_at DESC 
+                    SELECT COALESCE(rb.extracted_text, ur.resume_data) AS resume_data,
+                           ur.github_link, ur.github_analysis
+                    FROM user_ratings ur
+                    LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
+                    WHERE ur.github_link = ? 
+                    ORDER BY ur.updated_at DESC 
                     LIMIT 1
                 """
                 cursor.execute(query, (github_username,))
             else:
                 # Get the most recent entry
                 query = """
-                    SELECT resume_data, github_link, github_analysis 
-                    FROM user_ratings 
-                    ORDER BY updated_at DESC 
+                    SELECT COALESCE(rb.extracted_text, ur.resume_data) AS resume_data,
+                           ur.github_link, ur.github_analysis
+                    FROM user_ratings ur
+                    LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
+                    ORDER BY ur.updated_at DESC 
                     LIMIT 1
                 """
                 cursor.execute(query)
@@ -92,7 +172,7 @@ class RatingGenerator:
                 return {
                     'resume_data': result['resume_data'],
                     'github_link': result['github_link'], 
-                    'github_analysis': result['github_analysis']
+                    'github_analysis': self.get_github_report(result['github_link'], result['github_analysis'])
                 }
             else:
                 print("❌ No resume data found in database")
@@ -103,7 +183,7 @@ class RatingGenerator:
             return None
     
     def get_fresh_github_data(self, github_username):
-        """Get fresh GitHub data using the scraper from 2.py"""
+        """Scrape a GitHub profile, store it and return its highlights report"""
         try:
             # Extract username from URL if it's a full URL
             if github_username.startswith('https://github.com/'):
@@ -115,119 +195,12 @@ class RatingGenerator:
             
             print(f"🔄 Scraping fresh GitHub data for: {github_username}")
             
-            # Create a patched scraper that handles k/m notation
-            scraper = GithubScraper(github_username)
-            
-            # Patch the _extract_pinned_repos method to handle star conversion
-            original_extract = scraper._extract_pinned_repos
-            def patched_extract_pinned_repos(soup):
-                pinned_section = soup.find('div', class_='js-pinned-items-reorder-container')
-                if not pinned_section:
-                    return []
-
-                repos = []
-                pinned_items = pinned_section.find_all('div', class_='Box')
-                for item in pinned_items:
-                    repo_link = item.find('a', {'data-view-component': 'true'}, href=True)
-                    if not repo_link or not repo_link.find('span', class_='repo'):
-                        continue
-
-                    repo_url = f"https://github.com{repo_link['href']}"
-                    name = repo_link.find('span', class_='repo').get_text(strip=True)
-                    desc_tag = item.find('p', class_='pinned-item-desc')
-                    lang_tag = item.find('span', itemprop='programmingLanguage')
-                    star_tag = item.find('a', href=f"{repo_link['href']}/stargazers")
-
-                    # Use our number converter for stars
-                    stars = 0
-                    if star_tag:
-                        star_text = star_tag.get_text(strip=True)
-                        stars = self.convert_github_number(star_text)
-
-                    repos.append({
-                        "name": name,
-                        "url": repo_url,
-                        "description": desc_tag.get_text(strip=True) if desc_tag else "N/A",
-                        "primaryLanguage": lang_tag.get_text(strip=True) if lang_tag else "N/A",
-                        "stars": stars
-                    })
-                return repos
-            
-            # Patch the HighlightGenerator to handle missing variables
-            def patched_generate_report(self):
-                """Creates the full text report with error handling."""
-                profile_info = self.data.get('profileInfo', {})
-                username = profile_info.get('fullName') or self.data.get('username', 'N/A')
-                report_lines = []
-
-                report_lines.append("\n" + "="*50)
-                report_lines.append(f"      GITHUB PROFILE HIGHLIGHTS for {username}")
-                report_lines.append("="*50)
-
-                # Work Ethic & Consistency
-                contrib_stats = self.data.get('contributionStats', {})
-                contributions = contrib_stats.get('totalContributionsInLastYear') or contrib_stats.get('totalContributionDaysInLastYear', 0)
-                contrib_type = "Total Contributions" if 'totalContributionsInLastYear' in contrib_stats else "Active Days"
-                report_lines.append("\n**1. Work Ethic & Consistency:**")
-                report_lines.append(f"* **Activity (Last Year):** {contributions} ({contrib_type}).")
-
-                # Project Analysis
-                repos = self.data.get('analyzedRepositories', [])
-                report_lines.append("\n**2. Project Details (Pinned Repositories):**")
-
-                if not repos:
-                    report_lines.append("* No pinned repositories found.")
-                    total_stars = 0
-                    documented_repos_count = 0
-                    non_trivial_projects = []
-                else:
-                    total_stars = 0
-                    documented_repos_count = 0
-                    non_trivial_projects = []
-
-                    for repo in repos:
-                        total_stars += repo.get('stars', 0)
-                        if repo.get('readme', {}).get('exists'):
-                            documented_repos_count += 1
-                        if "solution" not in repo['name'].lower() and "leetcode" not in repo['name'].lower():
-                            non_trivial_projects.append(f"{repo['name']} ({repo.get('primaryLanguage', 'N/A')})")
-
-                        report_lines.append(f"* **{repo.get('name', 'N/A')}:**")
-                        report_lines.append(f"  - **Description:** {repo.get('description', 'N/A')}")
-                        report_lines.append(f"  - **Stars:** {repo.get('stars', 0)}")
-                        report_lines.append(f"  - **README:** {'Exists' if repo.get('readme', {}).get('exists') else 'MISSING'}")
-
-                # Key Takeaways for AI Prompt
-                report_lines.append("\n" + "="*50)
-                report_lines.append("      KEY DATA POINTS FOR SCORING")
-                report_lines.append("="*50)
-
-                report_lines.append(f"* **IMPACT (Community Validation):**")
-                report_lines.append(f"  - Total Stars on Pinned Repos: {total_stars}")
-
-                report_lines.append(f"\n* **COMPLEXITY (Project Types):**")
-                if non_trivial_projects:
-                    report_lines.append(f"  - Non-trivial projects identified: {', '.join(non_trivial_projects)}")
-                else:
-                    report_lines.append("  - Projects appear to be primarily foundational or solution-based.")
-
-                report_lines.append(f"\n* **DOCUMENTATION (Professionalism):**")
-                report_lines.append(f"  - README files exist for {documented_repos_count} out of {len(repos)} pinned repositories.")
-
-                report_lines.append("\n" + "="*50)
-
-                return "\n".join(report_lines)
-            
-            # Apply the patches
-            scraper._extract_pinned_repos = patched_extract_pinned_repos
-            
+            scraper = GithubScraper(github_username.strip('/'))
             github_data = scraper.scrape_profile()
             
             if github_data:
-                # Create reporter and patch its method
-                reporter = HighlightGenerator(github_data)
-                reporter.generate_report = patched_generate_report.__get__(reporter, HighlightGenerator)
-                return reporter.generate_report()
+                self.github_profiles.store(github_username, github_data)
+                return HighlightGenerator(github_data).generate_report()
             else:
                 print("❌ Could not scrape GitHub profile")
                 return None
@@ -251,11 +224,11 @@ class RatingGenerator:
             print(f"❌ Error reading prompt file: {e}")
             return None
     
-    def send_to_gemini(self, github_analysis, resume_data, prompt):
-        """Send data to Gemini API for rating"""
+    def send_to_gemini(self, github_analysis, resume_data, prompt, model_name=None):
+        """Send data to Gemini API for rating (GEMINI_MODEL unless `model_name` is given)"""
         try:
-            # Construct the complete prompt
-            complete_prompt = f"""
+            # Construct the complete prompt, trimmed to the prompt token budget
+            prompt_frame = """
 {prompt}
 
 === GITHUB ANALYSIS ===
@@ -266,15 +239,27 @@ class RatingGenerator:
 
 Please provide 3 specific ratings based on the above data.
 """
+            fitted = fit_prompt_sections(
+                prompt_frame.format(prompt=prompt, github_analysis='', resume_data=''),
+                shorten_report_descriptions(github_analysis), resume_data)
+            complete_prompt = prompt_frame.format(prompt=prompt, github_analysis=fitted['github_text'],
+                                                  resume_data=fitted['resume_text'])
             
             print("🚀 Sending request to Gemini API...")
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
+            started = time.perf_counter()
+            response = llm_call(
+                'gemini',
+                self.client.models.generate_content,
+                model=model_name or self.model_name,
                 contents=complete_prompt
             )
+            record_prompt_call('rating_generator', complete_prompt, time.perf_counter() - started, response)
             
             return response.text
                 
+        except OutboundError:
+            # Gemini is throttled or down: let bulk runs stop instead of failing every row
+            raise
         except Exception as e:
             print(f"❌ Gemini API error: {e}")
             return None
@@ -334,7 +319,11 @@ Please provide 3 specific ratings based on the above data.
         
         # 4. Send to Gemini API
         print("\n🤖 Step 4: Sending to Gemini API for rating...")
-        ratings = self.send_to_gemini(github_analysis, resume_data, prompt)
+        try:
+            ratings = self.send_to_gemini(github_analysis, resume_data, prompt)
+        except OutboundError as e:
+            print(f"❌ Gemini API unavailable: {e}")
+            ratings = None
         
         if ratings:
             print("\n" + "=" * 60)
@@ -347,6 +336,181 @@ Please provide 3 specific ratings based on the above data.
             print("❌ Failed to get ratings from Gemini API")
             return False
 
+    RATING_ROW_QUERY = """
+        SELECT ur.uid, ur.user_id, ur.github_link, ur.github_analysis,
+               COALESCE(rb.extracted_text, ur.resume_data) AS resume_data
+        FROM user_ratings ur
+        LEFT JOIN resume_blobs rb ON ur.resume_hash = rb.resume_hash
+    """
+
+    def _iter_rating_rows(self, conn, after_uid, page_size=200):
+        """Stream user_ratings rows in uid order, one short keyset-paginated query at a time"""
+        while True:
+            rows = conn.execute(self.RATING_ROW_QUERY + "WHERE ur.uid > ? ORDER BY ur.uid LIMIT ?",
+                                (after_uid, page_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            after_uid = rows[-1]['uid']
+
+    def _iter_rows_by_uid(self, conn, uids, page_size=200):
+        """user_ratings rows for the given sorted uids (rows deleted since are skipped)"""
+        for start in range(0, len(uids), page_size):
+            page = uids[start:start + page_size]
+            placeholders = ", ".join("?" * len(page))
+            rows = conn.execute(self.RATING_ROW_QUERY + f"WHERE ur.uid IN ({placeholders}) ORDER BY ur.uid",
+                                page).fetchall()
+            for row in rows:
+                yield dict(row)
+
+    def rate_row(self, row, prompt, use_fresh_github=False):
+        """Scrape (if needed) and score one user_ratings row; returns the ratings"""
+        github_analysis = self.get_github_report(row.get('github_link'), row.get('github_analysis'))
+        if (use_fresh_github or not github_analysis) and row.get('github_link'):
+            github_analysis = self.get_fresh_github_data(row['github_link']) or github_analysis
+        has_github = bool(github_analysis)
+        github_analysis = github_analysis or "No GitHub data available"
+        resume_data = row.get('resume_data') or ""
+
+        def score(model_name):
+            response_text = self.send_to_gemini(github_analysis, resume_data, prompt, model_name)
+            if not response_text:
+                raise RuntimeError("No response from Gemini API")
+            return parse_ratings_json(response_text)
+
+        skip_reasons = [] if has_github else [("sparse_github", "no GitHub data")]
+        ratings, _ = route_ratings(
+            f"{prompt}\n{github_analysis}\n{resume_data}",
+            (lambda: score(self.fast_model_name)) if self.fast_model_name else None,
+            lambda: score(self.model_name),
+            self.fast_model_name, self.model_name, skip_reasons=skip_reasons)
+        return ratings
+
+    def _write_batch(self, conn, batch, checkpoint):
+        """Write a batch of results in one transaction, then advance the checkpoint"""
+        with conn:
+            for uid, ratings in batch:
+                if ratings is None:
+                    continue
+                conn.execute("""
+                    UPDATE user_ratings
+                    SET git_score = ?, resume_score = ?, overall_score = ?, ai_ratings_json = ?
+                    WHERE uid = ?
+                """, (ratings['git_rating']['score'], ratings['resume_rating']['score'],
+                      ratings['overall_rating']['score'], json.dumps(ratings), uid))
+        for uid, ratings in batch:
+            checkpoint.mark_written(uid, failed=ratings is None)
+        checkpoint.save()
+
+    def bulk_rerate(self, prompt_file="prompt.txt", concurrency=4, batch_size=25,
+                    checkpoint_file=".rerate_checkpoint.json", use_fresh_github=False, limit=None):
+        """Re-score every user_ratings row with bounded concurrency, batched writes and resumable progress"""
+        print("=" * 60)
+        print("🎯 BULK RE-RATING STARTING")
+        print("=" * 60)
+
+        prompt = self.read_prompt_file(prompt_file)
+        if not prompt:
+            return False
+
+        checkpoint = BulkCheckpoint(checkpoint_file, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+        if checkpoint.load():
+            print(f"🔁 Resuming after uid {checkpoint.last_uid} ({len(checkpoint.done)} rows already done beyond it, "
+                  f"{len(checkpoint.failed)} failed rows to retry)")
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+
+        total = conn.execute("SELECT COUNT(*) FROM user_ratings WHERE uid > ?",
+                             (checkpoint.last_uid,)).fetchone()[0] - len(checkpoint.done) + len(checkpoint.failed)
+        if limit is not None:
+            total = min(total, limit)
+        print(f"📊 {total} rows to re-rate with concurrency={concurrency}, batch size={batch_size}")
+
+        # Rows that failed in earlier runs go first; new rows are read after the watermark
+        retries = self._iter_rows_by_uid(conn, sorted(checkpoint.failed))
+        rows = self._iter_rating_rows(conn, checkpoint.last_uid)
+        pending = {}
+        batch = []
+        submitted = processed = failures = 0
+        outage = None
+        start_time = time.monotonic()
+
+        def report():
+            elapsed = time.monotonic() - start_time
+            rate = processed / elapsed if elapsed > 0 else 0.0
+            eta = (total - processed) / rate if rate > 0 else float('inf')
+            eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta != float('inf') else '--:--:--'
+            print(f"⏱️  {processed}/{total} rows ({failures} failed) | {rate:.2f} rows/s | ETA {eta_text}")
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            while True:
+                # Keep a bounded window of in-flight rows
+                while len(pending) < concurrency * 2 and (limit is None or submitted < limit):
+                    row = next(retries, None)
+                    if row is None:
+                        row = next(rows, None)
+                        if row is None:
+                            break
+                        if row['uid'] in checkpoint.done:
+                            continue
+                        checkpoint.mark_submitted(row['uid'])
+                    pending[executor.submit(self.rate_row, row, prompt, use_fresh_github)] = row['uid']
+                    submitted += 1
+
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    uid = pending.pop(future)
+                    try:
+                        ratings = future.result()
+                    except OutboundError as e:
+                        # Not marked as written: the watermark stays before this row
+                        if outage is None:
+                            print(f"❌ Gemini unavailable, stopping (re-run to resume): {e}")
+                        outage = e
+                        continue
+                    except Exception as e:
+                        print(f"❌ uid {uid}: {e}")
+                        ratings = None
+                        failures += 1
+                    batch.append((uid, ratings))
+                    processed += 1
+                if outage is not None:
+                    # Rows still in flight are abandoned unwritten and retried by the next run
+                    break
+
+                if len(batch) >= batch_size:
+                    self._write_batch(conn, batch, checkpoint)
+                    batch = []
+                    report()
+        except KeyboardInterrupt:
+            print("\n⏸️  Interrupted; saving finished rows (re-run to resume)")
+            executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            if batch:
+                self._write_batch(conn, batch, checkpoint)
+            executor.shutdown(wait=False, cancel_futures=True)
+            conn.close()
+
+        report()
+        if checkpoint.failed:
+            print(f"⚠️  Failed uids: {sorted(checkpoint.failed)}")
+        stats = prompt_stats.summary()
+        if stats["calls"]:
+            print(f"🧮 {stats['calls']} Gemini calls: ~{stats['mean_prompt_tokens']:.0f} prompt tokens, "
+                  f"{stats['mean_latency']:.2f}s on average "
+                  f"(token/latency correlation {stats['token_latency_correlation']})")
+        routing = routing_stats.summary()
+        if routing["profiles"]:
+            print(f"🔀 Routing: {routing['decisions']} (escalation rate {routing['escalation_rate']}), "
+                  f"reasons {routing['reasons']}")
+        return failures == 0 and outage is None
+
 
 def main():
     """Main execution function"""
@@ -357,19 +521,35 @@ def main():
     parser.add_argument('--github', type=str, help='GitHub username to get data for')
     parser.add_argument('--prompt', type=str, default='prompt.txt', help='Prompt file path')
     parser.add_argument('--fresh-github', action='store_true', help='Fetch fresh GitHub data instead of using cached')
+    parser.add_argument('--db', type=str, help='Database path (default: database/database.db)')
+    parser.add_argument('--bulk', action='store_true', help='Re-rate every user_ratings row and write scores back')
+    parser.add_argument('--concurrency', type=int, default=4, help='Bulk mode: rows scored in parallel (default: 4)')
+    parser.add_argument('--batch-size', type=int, default=25, help='Bulk mode: rows per write transaction (default: 25)')
+    parser.add_argument('--checkpoint', type=str, default='.rerate_checkpoint.json', help='Bulk mode: progress file used to resume')
+    parser.add_argument('--limit', type=int, help='Bulk mode: stop after this many rows')
     
     args = parser.parse_args()
     
     # Create rating generator
-    generator = RatingGenerator()
+    generator = RatingGenerator(args.db) if args.db else RatingGenerator()
     
-    # Generate ratings
-    success = generator.generate_ratings(
-        user_id=args.user_id,
-        github_username=args.github,
-        prompt_file=args.prompt,
-        use_fresh_github=args.fresh_github
-    )
+    if args.bulk:
+        success = generator.bulk_rerate(
+            prompt_file=args.prompt,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            checkpoint_file=args.checkpoint,
+            use_fresh_github=args.fresh_github,
+            limit=args.limit
+        )
+    else:
+        # Generate ratings
+        success = generator.generate_ratings(
+            user_id=args.user_id,
+            github_username=args.github,
+            prompt_file=args.prompt,
+            use_fresh_github=args.fresh_github
+        )
     
     if success:
         print("\n✅ Rating generation completed successfully!")
@@ -379,4 +559,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
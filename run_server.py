@@ -4,7 +4,12 @@ HackBite Backend Server
 Self-contained backend API server for hackathon team formation
 
 Usage:
-    python3 run_server.py [--port PORT] [--host HOST]
+    python3 run_server.py [--port PORT] [--host HOST] [--debug]
+    python3 run_server.py --production [--workers N] [--threads N] [--max-requests N]
+
+--production serves with the prefork multi-process runner (backend/prefork.py)
+instead of Flask's development server. Send SIGHUP to the master for a
+graceful reload and SIGTERM to stop.
 
 Default: http://localhost:5000
 """
@@ -20,20 +25,39 @@ backend_dir = current_dir / "backend"
 sys.path.insert(0, str(current_dir))
 sys.path.insert(0, str(backend_dir))
 
-# Import our backend modules
-try:
-    from api_server import app, initialize_app
-except ImportError as e:
-    print(f"❌ Failed to import backend modules: {e}")
-    print("💡 Make sure you're running from the correct directory and have installed requirements:")
-    print("   pip install -r requirements.txt")
-    sys.exit(1)
+
+def load_app():
+    """Create and start the Flask application (once per process; per worker in production)."""
+    try:
+        from backend.api_server import create_app
+    except ImportError as e:
+        print(f"❌ Failed to import backend modules: {e}")
+        print("💡 Make sure you're running from the correct directory and have installed requirements:")
+        print("   pip install -r requirements.txt")
+        sys.exit(1)
+
+    try:
+        return create_app()
+    except RuntimeError:
+        print("❌ Failed to initialize application. Exiting...")
+        sys.exit(1)
+
+
+def shutdown_app(app):
+    from backend.services import shutdown_app as shutdown_services
+    shutdown_services(app)
 
 def main():
     parser = argparse.ArgumentParser(description='HackBite Backend API Server')
     parser.add_argument('--port', type=int, default=5000, help='Port to run server on (default: 5000)')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Host to bind to (default: 0.0.0.0)')
     parser.add_argument('--debug', action='store_true', help='Run in debug mode')
+    parser.add_argument('--production', action='store_true',
+                        help='Serve with the prefork multi-process runner instead of the development server')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, default=None, help='Threads per worker (default: SERVER_THREADS)')
+    parser.add_argument('--max-requests', type=int, default=None,
+                        help='Recycle a worker after this many requests, 0 to disable (default: SERVER_MAX_REQUESTS)')
     
     args = parser.parse_args()
     
@@ -42,11 +66,22 @@ def main():
     print(f"🌐 Server will be available at: http://localhost:{args.port}")
     print("🔗 Frontend create team page: frontend/hackathonpage/createateam.html")
     print("=" * 60)
-    
+
+    if args.production:
+        # Imported from the backend directory so the master never loads the app;
+        # each worker runs load_app() after the fork
+        from prefork import PreforkServer
+        server = PreforkServer(load_app, host=args.host, port=args.port, workers=args.workers,
+                               threads=args.threads, max_requests=args.max_requests,
+                               on_worker_exit=shutdown_app)
+        try:
+            sys.exit(server.run())
+        except Exception as e:
+            print(f"❌ Server error: {e}")
+            sys.exit(1)
+
     # Initialize the Flask application
-    if not initialize_app():
-        print("❌ Failed to initialize application. Exiting...")
-        sys.exit(1)
+    app = load_app()
     
     print("✅ Backend server initialized with team management support")
     print("📋 Available team endpoints:")
@@ -0,0 +1,7 @@
+-- Link user_ratings rows to deduplicated resume_blobs
+-- (applied automatically by DatabaseManager.apply_migrations)
+
+ALTER TABLE user_ratings ADD COLUMN resume_hash TEXT;
+
+-- Index used by the resume_blobs garbage collector
+CREATE INDEX IF NOT EXISTS idx_user_ratings_resume_hash ON user_ratings(resume_hash);
@@ -174,6 +174,179 @@ CREATE TABLE IF NOT EXISTS system_settings (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Resume/GitHub ratings per user (resume_hash is added by add_resume_hash.sql)
+CREATE TABLE IF NOT EXISTS user_ratings (
+    uid INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    resume_data TEXT,  -- Extracted resume text (NULL when stored in resume_blobs)
+    github_link TEXT,  -- GitHub username or profile link
+    git_score INTEGER DEFAULT 0,
+    resume_score INTEGER DEFAULT 0,
+    overall_score INTEGER DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    github_analysis TEXT,
+    ai_ratings_json TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_ratings_user_id ON user_ratings(user_id);
+
+-- Deduplicated resume uploads keyed by SHA-256 of the PDF bytes;
+-- user_ratings.resume_hash references a row here
+CREATE TABLE IF NOT EXISTS resume_blobs (
+    resume_hash TEXT PRIMARY KEY,
+    extracted_text TEXT NOT NULL,
+    byte_size INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Scraped GitHub profiles (one row per username, lowercased) and their pinned
+-- repositories; the text report is rendered from these on demand
+CREATE TABLE IF NOT EXISTS github_profiles (
+    username TEXT PRIMARY KEY,
+    full_name TEXT,
+    bio TEXT,
+    contributions INTEGER DEFAULT 0,
+    contribution_type VARCHAR(20) DEFAULT 'contributions' CHECK (contribution_type IN ('contributions', 'active_days')),
+    total_stars INTEGER DEFAULT 0,
+    scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS github_repos (
+    repo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    position INTEGER NOT NULL,  -- Order among the pinned repositories
+    name TEXT NOT NULL,
+    url TEXT,
+    description TEXT,
+    primary_language TEXT,
+    stars INTEGER DEFAULT 0,
+    readme_exists BOOLEAN DEFAULT 0,
+    readme_length INTEGER DEFAULT 0,
+    has_license BOOLEAN DEFAULT 0,
+    FOREIGN KEY (username) REFERENCES github_profiles(username) ON DELETE CASCADE,
+    UNIQUE(username, name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_github_profiles_contributions ON github_profiles(contributions);
+CREATE INDEX IF NOT EXISTS idx_github_profiles_total_stars ON github_profiles(total_stars);
+CREATE INDEX IF NOT EXISTS idx_github_repos_username ON github_repos(username, position);
+CREATE INDEX IF NOT EXISTS idx_github_repos_language ON github_repos(primary_language, stars);
+
+-- Background rating jobs (/api/rate-profile/jobs) and their progress events;
+-- stored here so every prefork worker can stream any job (backend/rating_jobs.py)
+CREATE TABLE IF NOT EXISTS rating_jobs (
+    job_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,  -- Unix time
+    finished_at REAL           -- Set by the final event (scored or failed)
+);
+
+CREATE TABLE IF NOT EXISTS rating_job_events (
+    job_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    event_json TEXT NOT NULL,
+    PRIMARY KEY (job_id, event_id)
+);
+
+-- Change counters for HTTP caching: every write to a watched table bumps its
+-- version, and ETags of the responses built from it are derived from these
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS users_version_insert AFTER INSERT ON users
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('users', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_version_update AFTER UPDATE ON users
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('users', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_version_delete AFTER DELETE ON users
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('users', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS teams_version_insert AFTER INSERT ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS teams_version_update AFTER UPDATE ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS teams_version_delete AFTER DELETE ON teams
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('teams', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_members_version_insert AFTER INSERT ON team_members
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_members', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_members_version_update AFTER UPDATE ON team_members
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_members', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_members_version_delete AFTER DELETE ON team_members
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('team_members', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS hackathons_version_insert AFTER INSERT ON hackathons
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('hackathons', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS hackathons_version_update AFTER UPDATE ON hackathons
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('hackathons', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS hackathons_version_delete AFTER DELETE ON hackathons
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('hackathons', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS skill_categories_version_insert AFTER INSERT ON skill_categories
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('skill_categories', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS skill_categories_version_update AFTER UPDATE ON skill_categories
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('skill_categories', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS skill_categories_version_delete AFTER DELETE ON skill_categories
+BEGIN
+    INSERT INTO table_versions (table_name, version) VALUES ('skill_categories', 1)
+    ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+END;
+
 -- Insert default skill categories
 INSERT OR IGNORE INTO skill_categories (category_name, description, icon, color_code) VALUES
 ('Frontend Development', 'UI/UX and client-side technologies', 'monitor', '#3B82F6'),
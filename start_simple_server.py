@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Simple server start script without AI dependencies
+
+Runs Flask's development server with the debugger; for production use
+`python3 run_server.py --production`.
 """
 import sys
 import os
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# Synthetic PDFs and GitHub pages shared with the benchmarks
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from backend import outbound
+from backend.api_server import create_app
+from backend.services import shutdown_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An app with its own throwaway database and no Gemini rating service."""
+    flask_app = create_app({
+        'TESTING': True,
+        'DATABASE_PATH': str(tmp_path / 'test.db'),
+        'ENABLE_RATING_SERVICE': False,
+    })
+    yield flask_app
+    shutdown_app(flask_app)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """A fresh 'gemini' destination that retries without sleeping."""
+    destination = outbound.Destination('gemini', max_concurrency=1, max_retries=2, backoff_base=0.0,
+                                       failure_threshold=3, acquire_timeout=0.5)
+    monkeypatch.setitem(outbound._destinations, 'gemini', destination)
+    return destination
+
+
+def scraped_profile(username='octocat', contributions=120, repos=None):
+    """GithubScraper.scrape_profile() output for a small profile."""
+    if repos is None:
+        repos = [{"name": "hello-world", "url": f"https://github.com/{username}/hello-world",
+                  "description": "A first repository", "primaryLanguage": "Python", "stars": 12,
+                  "readme": {"exists": True, "contentLength": 1500}, "qualityFlags": {"hasLicense": True}}]
+    return {
+        "profileInfo": {"username": username, "fullName": "The Octocat", "bio": "Testing"},
+        "contributionStats": {"totalContributionDaysInLastYear": contributions},
+        "analyzedRepositories": repos,
+    }
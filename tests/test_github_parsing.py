@@ -0,0 +1,76 @@
+import pytest
+
+from backend.github_scraper import GithubScraper
+from github_fixtures import repo_page
+
+REPO_URL = "https://github.com/octocat/hello-world"
+
+
+class PageScraper(GithubScraper):
+    """Parses a fixed page instead of fetching it; `raw_files` maps raw file names to sizes."""
+
+    def __init__(self, html, partial_parsing=True, repo_probe='page', raw_files=None):
+        super().__init__("octocat", partial_parsing=partial_parsing, repo_probe=repo_probe)
+        self.html = html
+        self.raw_files = {"README.md": 2400, "LICENSE": 1071} if raw_files is None else raw_files
+
+    def _get_soup(self, url, elements=None):
+        return self._parse(self.html, elements)
+
+    def _probe_file(self, repo_path, filenames):
+        return next((self.raw_files[name] for name in filenames if name in self.raw_files), 0)
+
+
+def page_with_license_file(filename):
+    html = repo_page("octocat", "hello-world")
+    if filename is None:
+        return html.replace('<a href="/octocat/hello-world/blob/main/LICENSE" class="Link--muted">MIT license</a>', '')
+    return html.replace('/blob/main/LICENSE"', f'/blob/main/{filename}"')
+
+
+def page_with_files(readme, license):
+    html = page_with_license_file(license)
+    return html.replace('/blob/main/README.md">README.md<', f'/blob/main/{readme}">{readme}<')
+
+
+@pytest.mark.parametrize("filename, licensed", [
+    ("LICENSE", True),
+    ("COPYING", True),
+    ("COPYING.md", True),
+    ("LICENCE", True),
+    (None, False),
+])
+def test_partial_and_full_parse_agree_on_repo_pages(filename, licensed):
+    html = page_with_license_file(filename)
+
+    full = PageScraper(html, partial_parsing=False)._scrape_repo_page(REPO_URL)
+    partial = PageScraper(html, partial_parsing=True)._scrape_repo_page(REPO_URL)
+
+    assert partial == full
+    assert full["qualityFlags"]["hasLicense"] is licensed
+    assert full["readme"]["exists"]
+
+
+@pytest.mark.parametrize("readme, license", [
+    ("Readme.md", "LICENSE-MIT"),
+    ("README.markdown", "LICENCE"),
+    ("readme.rst", "LICENSE-APACHE"),
+])
+def test_unprobed_file_names_fall_back_to_the_repo_page(readme, license):
+    raw_files = {readme: 3100, license: 1071}
+    scraper = PageScraper(page_with_files(readme, license), repo_probe='raw', raw_files=raw_files)
+
+    details = scraper._scrape_repo_details(REPO_URL)
+
+    assert details["readme"] == {"exists": True, "contentLength": 3100}
+    assert details["qualityFlags"]["hasLicense"]
+
+
+def test_probe_and_page_report_the_same_readme_size():
+    html = repo_page("octocat", "hello-world")
+
+    probed = PageScraper(html, repo_probe='raw')._scrape_repo_details(REPO_URL)
+    paged = PageScraper(html, repo_probe='page')._scrape_repo_details(REPO_URL)
+
+    assert probed == paged
+    assert probed["readme"]["contentLength"] == 2400
@@ -0,0 +1,41 @@
+from backend.heuristic_rating import github_metrics, heuristic_ratings
+
+from conftest import scraped_profile
+
+# What GithubScraper records when the contribution calendar cannot be scraped
+UNLOADED = "Could not load"
+
+
+def test_unloaded_contributions_count_as_zero():
+    metrics = github_metrics(scraped_profile(contributions=UNLOADED))
+
+    assert metrics["contributions"] == 0
+    assert metrics["total_stars"] == 12
+
+
+def test_heuristic_ratings_with_unloaded_contributions():
+    ratings = heuristic_ratings(scraped_profile(contributions=UNLOADED), "Skills: Python, Docker")
+
+    assert ratings["engine"] == "heuristic"
+    assert ratings["git_rating"]["score"] < heuristic_ratings(scraped_profile(), "")["git_rating"]["score"]
+
+
+def test_store_github_profile_with_unloaded_contributions(app):
+    with app.app_context():
+        manager = app.extensions['hackbite'].github_profile_manager
+        manager.store('octocat', scraped_profile(contributions=UNLOADED))
+        stored = manager.get('octocat')
+
+    assert stored["contributionStats"] == {"totalContributionDaysInLastYear": 0}
+    assert stored["analyzedRepositories"][0]["readme"] == {"exists": True, "contentLength": 1500}
+
+
+def test_rate_profile_with_unloaded_contributions(client, monkeypatch):
+    profile = scraped_profile(contributions=UNLOADED)
+    monkeypatch.setattr('backend.api_server.analyze_github_profile', lambda username: (profile, "report"))
+
+    response = client.post('/api/rate-profile', json={"githubUsername": "octocat",
+                                                      "resumeBase64": "not a pdf"})
+
+    assert response.status_code == 200
+    assert response.json["ratings"]["engine"] == "heuristic"
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.metrics import render_metrics
+
+
+def sample(text, line_prefix):
+    """Value of the exposition line starting with `line_prefix` (labels included), or None."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+def worker_snapshot(pid, requests, in_flight, breaker_open):
+    labels = [["method", "GET"], ["route", "/test/workers"], ["status", "200"]]
+    return {
+        "pid": pid,
+        "values": [["http_requests_total", labels, requests], ["http_requests_in_flight", [], in_flight]],
+        "histograms": [["http_request_duration_seconds", labels[:2], [requests] + [0] * 12 + [0.01 * requests]]],
+        "families": {"outbound_breaker_open": [[[["destination", "github"]], breaker_open]]},
+    }
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('METRICS_MULTIPROC_DIR', str(tmp_path))
+    return tmp_path
+
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_scrape_merges_every_worker(multiprocess_dir):
+    route = 'http_requests_total{method="GET",route="/test/workers",status="200"}'
+    live, dead = os.getppid(), exited_pid()
+    (multiprocess_dir / f"{live}.json").write_text(json.dumps(worker_snapshot(live, 5, 2, 1)))
+    (multiprocess_dir / f"{dead}.json").write_text(json.dumps(worker_snapshot(dead, 3, 7, 0)))
+
+    text = render_metrics()
+
+    # Counters and histograms add up across live and exited workers
+    assert sample(text, route) == 8
+    assert sample(text, 'http_request_duration_seconds_count{method="GET",route="/test/workers"}') == 8
+    # Gauges only count live workers; the breaker reports open if any worker's is
+    assert sample(text, 'http_requests_in_flight') == 2
+    assert sample(text, 'outbound_breaker_open{destination="github"}') == 1
+    # The exited worker was folded into retired.json, and is not counted twice
+    assert not (multiprocess_dir / f"{dead}.json").exists()
+    assert (multiprocess_dir / "retired.json").exists()
+    assert (multiprocess_dir / f"{os.getpid()}.json").exists()
+    assert sample(render_metrics(), route) == 8
+
+
+def test_single_process_without_directory(monkeypatch):
+    monkeypatch.delenv('METRICS_MULTIPROC_DIR', raising=False)
+    assert 'http_requests_in_flight' in render_metrics()
+
+
+def test_outbound_status_names_the_answering_worker(client, monkeypatch):
+    assert client.get('/api/outbound-status').json["scope"] == "process"
+
+    monkeypatch.setenv('METRICS_MULTIPROC_DIR', '/nonexistent')
+    status = client.get('/api/outbound-status').json
+
+    assert status["pid"] == os.getpid()
+    assert status["scope"] == "worker"
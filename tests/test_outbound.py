@@ -0,0 +1,133 @@
+import json
+import threading
+
+import pytest
+
+from backend import outbound
+from backend.incremental_json import MalformedStreamError
+from backend.outbound import RetryableError, llm_stream
+from backend.rating_service import RatingService
+from backend.replay import FakeResponse, ResourceExhausted, synthetic_ratings
+
+
+class BreakingModel:
+    """Streams `text` in two halves; the first `breaks` streams fail after the first half."""
+
+    def __init__(self, text, breaks=1, error=ResourceExhausted):
+        self.text = text
+        self.breaks = breaks
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        return self._stream(self.calls <= self.breaks)
+
+    def _stream(self, broken):
+        half = len(self.text) // 2
+        yield FakeResponse(self.text[:half])
+        if broken:
+            raise self.error("connection reset mid-stream")
+        yield FakeResponse(self.text[half:])
+
+
+def test_stream_broken_mid_response_is_retried_and_counted(gemini):
+    model = BreakingModel(synthetic_ratings('prompt'))
+    service = RatingService.__new__(RatingService)
+    received = []
+
+    ratings = service._generate_streaming(model, 'prompt', lambda key, rating: received.append(key))
+
+    assert ratings == json.loads(synthetic_ratings('prompt'))
+    assert model.calls == 2
+    status = gemini.status()
+    assert (status['successes'], status['retries']) == (1, 1)
+    # The retry re-reads git_rating but does not emit it twice
+    assert received == ['git_rating', 'resume_rating', 'overall_rating']
+
+
+def test_stream_that_keeps_breaking_raises_outbound_error(gemini):
+    model = BreakingModel(synthetic_ratings('prompt'), breaks=10)
+    with pytest.raises(RetryableError):
+        llm_stream('gemini', model.generate_content, list, 'prompt')
+    assert model.calls == 3
+    assert gemini.status()['failures'] == 1
+
+
+def test_malformed_stream_is_not_an_outage(gemini):
+    model = BreakingModel('not json at all', breaks=0)
+    service = RatingService.__new__(RatingService)
+    with pytest.raises(MalformedStreamError):
+        service._generate_streaming(model, 'prompt')
+    assert gemini.status()['failures'] == 0
+    assert gemini.breaker.state == gemini.breaker.CLOSED
+
+
+def test_stream_holds_concurrency_slot_until_read(gemini):
+    reading, release = threading.Event(), threading.Event()
+
+    def consume(chunks):
+        reading.set()
+        release.wait(5)
+        return list(chunks)
+
+    reader = threading.Thread(target=llm_stream, args=('gemini', BreakingModel('{}', breaks=0).generate_content,
+                                                       consume, 'prompt'))
+    reader.start()
+    try:
+        assert reading.wait(5)
+        assert gemini.status()['in_flight'] == 1
+        with pytest.raises(outbound.OutboundBusyError):
+            llm_stream('gemini', BreakingModel('{}', breaks=0).generate_content, list, 'prompt')
+    finally:
+        release.set()
+        reader.join()
+
+
+def flaky(failures):
+    """A call that raises RetryableError `failures` times, then succeeds."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise RetryableError("HTTP 503")
+        return 'ok'
+    return fn, calls
+
+
+def test_retried_call_counts_one_breaker_failure(gemini):
+    fn, calls = flaky(10)
+    with pytest.raises(RetryableError):
+        gemini.call(fn)
+    assert len(calls) == 3
+    # One failed call (three attempts) is not three consecutive failures
+    assert gemini.breaker.state == gemini.breaker.CLOSED
+
+    for _ in range(2):
+        with pytest.raises(RetryableError):
+            gemini.call(fn)
+    assert gemini.breaker.state == gemini.breaker.OPEN
+
+
+def test_call_recovering_within_retries_leaves_breaker_closed(gemini):
+    for _ in range(5):
+        fn, calls = flaky(2)
+        assert gemini.call(fn) == 'ok'
+    assert gemini.breaker.state == gemini.breaker.CLOSED
+    assert gemini.status()['failures'] == 0
+
+
+def test_retries_stop_once_breaker_opens(gemini):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        # Meanwhile other callers exhaust their retries
+        for _ in range(gemini.breaker.failure_threshold):
+            gemini.breaker.record_failure()
+        raise RetryableError("HTTP 503")
+
+    with pytest.raises(RetryableError):
+        gemini.call(fn)
+    assert len(calls) == 1
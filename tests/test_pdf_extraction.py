@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from backend.pdf_extraction import ExtractionPool, PDFExtractionError, extract_pdf_text, extract_text_from_pdf_bytes
+from synthetic_pdfs import make_pdf
+
+
+@pytest.fixture
+def pool():
+    extraction_pool = ExtractionPool(2)
+    yield extraction_pool
+    extraction_pool.shutdown()
+
+
+def run_in_thread(fn):
+    result = {}
+
+    def target():
+        try:
+            result['value'] = fn()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, result
+
+
+def test_extract_pdf_text_matches_inline_extraction():
+    pdf_bytes = make_pdf(pages=2, seed=5)
+    assert extract_pdf_text(pdf_bytes) == extract_text_from_pdf_bytes(pdf_bytes)
+
+
+def test_timeout_counts_execution_not_queueing():
+    single = ExtractionPool(1)
+    try:
+        single.run(time.sleep, (0,), timeout=30)  # start the worker process
+        first, first_result = run_in_thread(lambda: single.run(time.sleep, (0.6,), timeout=1))
+        time.sleep(0.05)
+        # Waits ~0.6s for the busy worker, then runs well within its own 1s
+        second, second_result = run_in_thread(lambda: single.run(time.sleep, (0.6,), timeout=1))
+        first.join()
+        second.join()
+    finally:
+        single.shutdown()
+    assert first_result == {'value': None}
+    assert second_result == {'value': None}
+
+
+def test_timeout_kills_only_the_stuck_worker(pool):
+    pool.run(time.sleep, (0,), timeout=30)
+    healthy, healthy_result = run_in_thread(lambda: pool.run(time.sleep, (1.0,), timeout=30))
+    time.sleep(0.05)
+
+    with pytest.raises(PDFExtractionError, match='timed out'):
+        pool.run(time.sleep, (30,), timeout=0.3)
+
+    healthy.join()
+    assert healthy_result == {'value': None}
+    # The killed worker is replaced on demand
+    assert pool.run(sum, ([1, 2, 3],), timeout=30) == 6
+
+
+def test_job_errors_become_extraction_errors(pool):
+    with pytest.raises(PDFExtractionError):
+        pool.run(extract_text_from_pdf_bytes, (b'not a pdf',), timeout=30)
+    assert pool.run(sum, ([1],), timeout=30) == 1
+
+
+def test_shutdown_app_stops_the_pool(app):
+    from backend import pdf_extraction
+    from backend.services import shutdown_app
+
+    extract_pdf_text(make_pdf(pages=1, seed=1))
+    assert pdf_extraction._pool is not None
+    shutdown_app(app)
+    assert pdf_extraction._pool is None
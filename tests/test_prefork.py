@@ -0,0 +1,45 @@
+import socket
+import threading
+import time
+
+from backend.prefork import PooledWSGIServer
+
+
+def test_busy_worker_stops_accepting_until_a_thread_is_free():
+    release = threading.Event()
+
+    def app(environ, start_response):
+        release.wait(10)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(16)
+    host, port = listener.getsockname()
+    server = PooledWSGIServer(host, port, app, listener.fileno(), threads=1)
+    listener.close()
+    serving = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    serving.start()
+
+    clients = []
+    try:
+        for _ in range(2):
+            client = socket.create_connection((host, port), timeout=10)
+            client.sendall(b"GET / HTTP/1.0\r\nHost: test\r\n\r\n")
+            clients.append(client)
+        time.sleep(0.5)
+        # The second connection waits in the listen backlog, free for another worker to take
+        assert server.handled == 1
+
+        release.set()
+        for client in clients:
+            assert client.recv(1024).startswith(b"HTTP/1.0 200")
+        assert server.handled == 2
+    finally:
+        release.set()
+        for client in clients:
+            client.close()
+        server.shutdown()
+        server.pool.shutdown(wait=True)
+        server.server_close()
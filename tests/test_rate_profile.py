@@ -0,0 +1,83 @@
+import base64
+import json
+
+from backend.api_server import run_rating_job
+from backend.database import ResumeBlobManager
+from backend.pdf_extraction import extract_text_from_pdf_bytes
+from backend.rating_service import RatingService
+from backend.replay import FakeResponse, synthetic_ratings
+from synthetic_pdfs import make_pdf
+
+from conftest import scraped_profile
+
+
+def test_rate_profile_stores_extracted_resume_text(app, client, monkeypatch):
+    monkeypatch.setattr('backend.api_server.analyze_github_profile',
+                        lambda username: (scraped_profile(username), "report"))
+    pdf_bytes = make_pdf(pages=1, seed=3)
+
+    response = client.post('/api/rate-profile', json={
+        "githubUsername": "octocat",
+        "resumeBase64": base64.b64encode(pdf_bytes).decode('ascii'),
+    })
+
+    assert response.status_code == 200
+    assert response.json["success"]
+    resume_hash = ResumeBlobManager.hash_pdf(pdf_bytes)
+    with app.app_context():
+        services = app.extensions['hackbite']
+        stored_text = services.resume_blob_manager.get_text(resume_hash)
+        row = services.db_manager.connection.execute(
+            "SELECT resume_hash, resume_data FROM user_ratings WHERE uid = ?", (response.json["rating_id"],)
+        ).fetchone()
+    assert stored_text == extract_text_from_pdf_bytes(pdf_bytes)
+    assert "FAILED" not in stored_text
+    assert row["resume_hash"] == resume_hash
+    assert row["resume_data"] is None
+
+
+class RecordingJob:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, stage, **data):
+        self.events.append((stage, data))
+
+    def stage(self, name):
+        return [data for stage, data in self.events if stage == name]
+
+
+class CutOffModel:
+    """Streams the ratings up to the end of git_rating, then the connection drops."""
+    model_name = 'cut-off'
+
+    def generate_content(self, prompt, stream=False):
+        text = synthetic_ratings(prompt)
+        yield FakeResponse(text[:text.index('"resume_rating"')])
+        raise ConnectionResetError("connection reset by peer")
+
+
+def test_job_replaces_streamed_ratings_when_the_stream_breaks(app, gemini, monkeypatch):
+    service = RatingService.__new__(RatingService)
+    service.model, service.model_name = CutOffModel(), 'cut-off'
+    service.fast_model, service.fast_model_name = None, None
+    service.prompt_template = "Rate this profile"
+    monkeypatch.setattr('backend.api_server.rating_service', service)
+    monkeypatch.setattr('backend.api_server.analyze_github_profile',
+                        lambda username: (scraped_profile(username), "report"))
+    job = RecordingJob()
+
+    run_rating_job(job, app, "octocat", None, None, make_pdf(pages=1, seed=4))
+
+    streamed = job.stage('rating_received')
+    assert [(data['name'], data['provisional']) for data in streamed] == [('git_rating', True)]
+    result = job.stage('scored')[0]['result']
+    assert result['ratings']['engine'] == 'heuristic'
+    assert result['scores']['git_score'] != streamed[0]['rating']['score']
+    with app.app_context():
+        row = app.extensions['hackbite'].db_manager.connection.execute(
+            "SELECT git_score, ai_ratings_json FROM user_ratings WHERE uid = ?", (result['rating_id'],)
+        ).fetchone()
+    assert row['git_score'] == result['scores']['git_score']
+    assert json.loads(row['ai_ratings_json']) == result['ratings']
+    assert gemini.status()['failures'] == 1
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from backend.database import DatabaseManager
+from backend.outbound import CircuitOpenError
+from rating_generator import RatingGenerator
+
+RATINGS = {key: {"score": 500, "reasoning": ["ok"]} for key in ('git_rating', 'resume_rating', 'overall_rating')}
+
+
+class ScriptedGenerator(RatingGenerator):
+    """RatingGenerator whose rate_row raises `errors[uid]` (once) instead of calling Gemini."""
+
+    def __init__(self, db_path, errors=None):
+        self.db_path = db_path
+        self.errors = dict(errors or {})
+        self.rated = []
+
+    def rate_row(self, row, prompt, use_fresh_github=False):
+        self.rated.append(row['uid'])
+        error = self.errors.pop(row['uid'], None)
+        if error:
+            raise error
+        return RATINGS
+
+
+@pytest.fixture
+def rerate(tmp_path):
+    db_path = str(tmp_path / 'ratings.db')
+    db = DatabaseManager(db_path)
+    assert db.connect() and db.initialize_tables()
+    with db.connection:
+        db.connection.execute("""INSERT INTO users (user_id, name, email, password_hash, profile_logo)
+                                 VALUES (1, 'Ada', 'ada@example.com', 'x', 'default')""")
+        db.connection.executemany("INSERT INTO user_ratings (uid, user_id, resume_data) VALUES (?, 1, 'resume')",
+                                  [(uid,) for uid in range(1, 6)])
+    db.close()
+    prompt_file = tmp_path / 'prompt.txt'
+    prompt_file.write_text("Rate this profile")
+    checkpoint_file = tmp_path / 'checkpoint.json'
+
+    def run(errors=None):
+        generator = ScriptedGenerator(db_path, errors)
+        generator.bulk_rerate(str(prompt_file), concurrency=1, batch_size=2, checkpoint_file=str(checkpoint_file))
+        return generator.rated
+
+    def scored():
+        with sqlite3.connect(db_path) as conn:
+            return [uid for uid, in conn.execute("SELECT uid FROM user_ratings WHERE git_score = 500 ORDER BY uid")]
+
+    run.scored = scored
+    run.checkpoint_file = checkpoint_file
+    return run
+
+
+def test_resume_retries_a_failed_row(rerate):
+    assert rerate({2: RuntimeError("unparseable answer")}) == [1, 2, 3, 4, 5]
+    assert rerate.scored() == [1, 3, 4, 5]
+
+    assert rerate() == [2]
+    assert rerate.scored() == [1, 2, 3, 4, 5]
+    assert '"failed": []' in rerate.checkpoint_file.read_text()
+
+
+def test_outage_stops_the_run_before_the_watermark_passes(rerate):
+    rerate({3: CircuitOpenError("gemini: circuit open, failing fast")})
+    assert 3 not in rerate.scored()
+
+    resumed = rerate()
+    assert resumed[0] == 3
+    assert rerate.scored() == [1, 2, 3, 4, 5]
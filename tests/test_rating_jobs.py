@@ -0,0 +1,80 @@
+import io
+import json
+import threading
+
+import pytest
+
+from backend.api_server import create_app
+from backend.services import shutdown_app
+from synthetic_pdfs import make_pdf
+
+from conftest import scraped_profile
+
+
+@pytest.fixture
+def second_worker(app):
+    """Another app on the same database, like a second prefork worker with its own job registry."""
+    worker = create_app({
+        'TESTING': True,
+        'DATABASE_PATH': app.config['DATABASE_PATH'],
+        'ENABLE_RATING_SERVICE': False,
+    })
+    yield worker
+    shutdown_app(worker)
+
+
+def submit_job(client):
+    response = client.post('/api/rate-profile/jobs', content_type='multipart/form-data', data={
+        "githubUsername": "octocat",
+        "resume": (io.BytesIO(make_pdf(pages=1, seed=5)), "resume.pdf"),
+    })
+    assert response.status_code == 202
+    return response.json
+
+
+def stream_stages(client, events_url):
+    response = client.get(events_url)
+    assert response.status_code == 200
+    body = b"".join(response.response).decode()
+    return [json.loads(line[len("data: "):])["stage"] for line in body.splitlines() if line.startswith("data: ")]
+
+
+@pytest.mark.parametrize("reader", ["submitting", "other"])
+def test_job_events_stream_from_either_worker(app, second_worker, monkeypatch, reader):
+    # The job waits until the reader is streaming, so events arrive while it follows the log
+    release = threading.Event()
+
+    def analyze(username):
+        release.wait(10)
+        return scraped_profile(username), "report"
+
+    monkeypatch.setattr('backend.api_server.analyze_github_profile', analyze)
+    job = submit_job(app.test_client())
+    reading_app = app if reader == "submitting" else second_worker
+    threading.Timer(0.3, release.set).start()
+
+    stages = stream_stages(reading_app.test_client(), job["events_url"])
+
+    assert stages[0] == "queued"
+    assert stages[-1] == "scored"
+    assert "provisional_scored" in stages
+    snapshot = second_worker.test_client().get(f"/api/rate-profile/jobs/{job['job_id']}").json
+    assert snapshot["done"]
+    assert [event["stage"] for event in snapshot["events"]] == stages
+
+
+def test_reconnect_resumes_after_last_event_id(app, second_worker, monkeypatch):
+    monkeypatch.setattr('backend.api_server.analyze_github_profile',
+                        lambda username: (scraped_profile(username), "report"))
+    job = submit_job(app.test_client())
+    stages = stream_stages(second_worker.test_client(), job["events_url"])
+
+    response = app.test_client().get(job["events_url"], headers={"Last-Event-ID": "2"})
+    body = b"".join(response.response).decode()
+
+    assert [line for line in body.splitlines() if line.startswith("event: ")] == \
+        [f"event: {stage}" for stage in stages[2:]]
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/rate-profile/jobs/nope/events').status_code == 404
@@ -0,0 +1,56 @@
+import json
+import threading
+
+from backend.replay import Cassette, HttpRecorder
+
+
+class Response:
+    status_code = 200
+    headers = {'Content-Type': 'text/html'}
+
+    def __init__(self, text):
+        self.text = text
+
+
+def test_recorder_saves_in_batches_and_on_flush(tmp_path):
+    path = tmp_path / 'cassette.json'
+    cassette = Cassette(path)
+    recorder = HttpRecorder(cassette)
+
+    for i in range(49):
+        recorder('GET', f"https://github.com/user{i}", Response(f"page {i}"))
+    assert not path.exists()
+
+    recorder('GET', 'https://github.com/user49', Response('page 49'))
+    assert len(json.loads(path.read_text())['http']) == 50
+
+    recorder('GET', 'https://github.com/user50', Response('page 50'))
+    cassette.flush()
+    assert len(Cassette.load(path).http) == 51
+
+
+def test_concurrent_saves_leave_a_complete_cassette(tmp_path):
+    path = tmp_path / 'cassette.json'
+    cassettes = [Cassette(path) for _ in range(4)]
+    for n, cassette in enumerate(cassettes):
+        for i in range(200):
+            cassette.add_llm(f"prompt {n} {i}", 'x' * 500)
+
+    errors = []
+
+    def save_repeatedly(cassette):
+        try:
+            for _ in range(10):
+                cassette.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_repeatedly, args=(cassette,)) for cassette in cassettes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(Cassette.load(path).llm) == 200
+    assert list(tmp_path.iterdir()) == [path]
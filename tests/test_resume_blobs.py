@@ -0,0 +1,53 @@
+def _blob_hashes(services):
+    return {row[0] for row in services.db_manager.connection.execute("SELECT resume_hash FROM resume_blobs")}
+
+
+def _store_blob(services, resume_hash, age_seconds):
+    services.resume_blob_manager.store(resume_hash, f"text of {resume_hash}", 100)
+    services.db_manager.connection.execute(
+        "UPDATE resume_blobs SET created_at = datetime('now', ?) WHERE resume_hash = ?",
+        (f"-{age_seconds} seconds", resume_hash))
+    services.db_manager.connection.commit()
+
+
+def test_garbage_collect_keeps_recent_and_referenced_blobs(app):
+    with app.app_context():
+        services = app.extensions['hackbite']
+        _store_blob(services, 'old-orphan', 7200)
+        _store_blob(services, 'old-referenced', 7200)
+        # Stored by a rating that has not written its user_ratings row yet
+        _store_blob(services, 'in-progress', 5)
+        services.db_manager.connection.execute(
+            "INSERT INTO users (name, email, password_hash) VALUES ('A', 'a@example.com', 'x')")
+        services.db_manager.connection.execute(
+            "INSERT INTO user_ratings (user_id, resume_hash) VALUES (1, 'old-referenced')")
+        services.db_manager.connection.commit()
+
+        assert services.resume_blob_manager.garbage_collect(min_age_seconds=3600) == 1
+        assert _blob_hashes(services) == {'old-referenced', 'in-progress'}
+
+
+def test_startup_does_not_collect_blobs(app):
+    from backend.api_server import create_app
+    from backend.services import shutdown_app
+
+    with app.app_context():
+        _store_blob(app.extensions['hackbite'], 'orphan', 7200)
+
+    second = create_app({'TESTING': True, 'DATABASE_PATH': app.config['DATABASE_PATH'],
+                         'ENABLE_RATING_SERVICE': False})
+    try:
+        with second.app_context():
+            assert _blob_hashes(second.extensions['hackbite']) == {'orphan'}
+    finally:
+        shutdown_app(second)
+
+
+def test_collect_route_requires_admin(app, client):
+    app.config['ADMIN_SECRET'] = 'secret'
+    with app.app_context():
+        _store_blob(app.extensions['hackbite'], 'orphan', 7200)
+
+    assert client.post('/api/admin/resume-blobs/collect').status_code == 403
+    response = client.post('/api/admin/resume-blobs/collect', headers={'X-Admin-Secret': 'secret'})
+    assert response.json == {"success": True, "removed": 1}